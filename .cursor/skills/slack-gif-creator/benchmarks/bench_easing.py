@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Easing benchmarks - Lookup tables against the exact easing functions.
+
+    python benchmarks/bench_easing.py
+    python benchmarks/bench_easing.py --resolution 1024 --baseline benchmarks/easing.json
+
+For each curve, evaluates --count progress values three ways and reports
+the fastest of --repeat runs:
+
+    scalar_s      exact scalar function, one call per value (for scale)
+    array_s       exact array form, one call for all values
+    lut_array_s   lookup table, one call for all values
+    lut_error     largest difference between the table and the exact curve
+
+Comparison works as in bench_templates.py.
+"""
+
+import argparse
+import sys
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+SKILL_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(SKILL_DIR))
+
+from benchmarks.harness import (best_of, compare, format_comparison, has_regressions, load_results,
+                                parse_thresholds, print_results, save_results)
+from core.easing import (ARRAY_EASING_FUNCTIONS, DEFAULT_LUT_RESOLUTION, EASING_FUNCTIONS,
+                         lut_easing)
+
+
+CURVES = ['bounce_in', 'bounce_out', 'bounce', 'elastic_in', 'elastic_out', 'elastic',
+          'back_in_out', 'ease_in_out']
+
+METRICS = ['scalar_s', 'array_s', 'lut_array_s', 'lut_error']
+
+SEED = 42
+
+
+def run_case(name: str, count: int = 100_000, resolution: int = DEFAULT_LUT_RESOLUTION,
+             repeat: int = 5) -> dict:
+    """
+    Time one curve exactly and from a lookup table.
+
+    Args:
+        name: Easing name
+        count: Progress values to evaluate
+        resolution: Lookup table samples
+        repeat: Runs per measurement; the fastest is kept
+
+    Returns:
+        Dictionary with the METRICS
+    """
+    t = np.random.default_rng(SEED).random(count)
+    values = t.tolist()
+    exact, exact_array = EASING_FUNCTIONS[name], ARRAY_EASING_FUNCTIONS[name]
+    table_array = lut_easing(name, resolution)
+
+    scalar_s, _ = best_of(lambda: [exact(v) for v in values], repeat)
+    array_s, expected = best_of(lambda: exact_array(t), repeat)
+    lut_array_s, answered = best_of(lambda: table_array(t), repeat)
+
+    # Error over a dense even grid as well as the random values
+    grid = np.linspace(0.0, 1.0, 1_000_001)
+    lut_error = max(float(np.max(np.abs(answered - expected))),
+                    float(np.max(np.abs(table_array(grid) - exact_array(grid)))))
+
+    return {
+        'scalar_s': scalar_s,
+        'array_s': array_s,
+        'lut_array_s': lut_array_s,
+        'lut_error': lut_error,
+    }
+
+
+def run_suite(curves: Optional[list[str]] = None, count: int = 100_000,
+              resolution: int = DEFAULT_LUT_RESOLUTION, repeat: int = 5) -> dict:
+    """
+    Benchmark several curves.
+
+    Args:
+        curves: Easing names (default: CURVES)
+        count: Progress values per measurement
+        resolution: Lookup table samples
+        repeat: Runs per measurement
+
+    Returns:
+        {case: metrics}
+    """
+    results = {}
+    for name in curves or CURVES:
+        if name not in EASING_FUNCTIONS:
+            raise ValueError(f"Unknown easing: {name}")
+        results[f'{name}/lut{resolution}'] = run_case(name, count, resolution, repeat)
+    return results
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Benchmark easing lookup tables against the exact curves.')
+    parser.add_argument('-c', '--curves', help='Comma-separated easing names (default: the expensive ones)')
+    parser.add_argument('-n', '--count', type=int, default=100_000, help='Values per measurement')
+    parser.add_argument('--resolution', type=int, default=DEFAULT_LUT_RESOLUTION, help='Lookup table samples')
+    parser.add_argument('-r', '--repeat', type=int, default=5, help='Runs per measurement')
+    parser.add_argument('-o', '--output', help='Save this run as JSON')
+    parser.add_argument('--save-baseline', metavar='PATH', help='Save this run as the new baseline')
+    parser.add_argument('--baseline', metavar='PATH', help='Compare against this baseline')
+    parser.add_argument('--threshold', action='append', default=[], metavar='METRIC=REL[:ABS]',
+                        help='Regression threshold override, e.g. lut_array_s=0.1')
+    parser.add_argument('--show-all', action='store_true', help='List unchanged metrics in the comparison')
+    args = parser.parse_args(argv)
+
+    thresholds = parse_thresholds(args.threshold)
+    baseline = load_results(args.baseline) if args.baseline else None
+
+    results = run_suite(args.curves.split(',') if args.curves else None, args.count,
+                        args.resolution, args.repeat)
+    print_results(results, METRICS)
+    for path in (args.output, args.save_baseline):
+        if path:
+            save_results(path, results, {'count': args.count, 'resolution': args.resolution,
+                                         'repeat': args.repeat})
+
+    if baseline is None:
+        return 0
+
+    rows = compare(baseline['results'], results, thresholds)
+    print(f"\nCompared with {args.baseline} ({baseline.get('created', 'unknown date')}):")
+    print(format_comparison(rows, show_all=args.show_all))
+    return 1 if has_regressions(rows) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Quantizer benchmarks - OKLab k-means against PIL's median cut, and dither modes.
+
+    python benchmarks/bench_quantize.py
+    python benchmarks/bench_quantize.py --colors 16,32,64 --baseline benchmarks/quantize.json
+    python benchmarks/bench_quantize.py --sources fade_gradient,sprite_gradient --dither all
+
+Each source animation (template frames at emoji size, plus synthetic
+gradients that show banding and dither noise) is encoded with each
+quantizer at each color count, and with each --dither mode. Both
+quantizers get the same dither, so rows compare palettes alone; the
+default is 'none', since dither noise lowers delta_e and raises
+output_bytes on its own. For each case we record:
+
+    encode_s      fastest in-memory GIF encode (GIFBuilder.save), quantization included
+                  (the OKLab palette fit is part of it)
+    output_bytes  size of the encoded GIF
+    delta_e       mean OKLab distance (x100) between the source frames and the
+                  decoded GIF; about 1 is a just-visible difference
+
+Compare rows at equal delta_e to see how many colors each quantizer needs
+for the same look, and output_bytes across dither modes to see what the
+dither noise costs. Comparison works as in bench_templates.py.
+"""
+
+import argparse
+import contextlib
+import io
+import sys
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+from PIL import Image, ImageSequence
+
+SKILL_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(SKILL_DIR))
+
+from benchmarks.harness import (best_of, compare, format_comparison, has_regressions, load_results,
+                                parse_thresholds, print_results, save_results)
+from benchmarks.bench_templates import CASES, SEED
+from core.gif_builder import DITHER_MODES, QUANTIZERS, GIFBuilder
+from core.quantize import mean_delta_e
+
+
+SOURCES = ['gradient', 'fade_gradient', 'sprite_gradient', 'kaleidoscope', 'explode', 'zoom']
+
+SIZE = 128
+NUM_FRAMES = 16
+FPS = 15
+
+METRICS = ['encode_s', 'output_bytes', 'delta_e']
+
+
+def source_frames(name: str) -> list[np.ndarray]:
+    """
+    Frames to quantize: a template's output at emoji size, or a synthetic gradient.
+
+    Args:
+        name: Template name (a key of bench_templates.CASES), 'gradient'
+              (color ramps sliding diagonally), 'fade_gradient' (a gradient
+              background fading in) or 'sprite_gradient' (a square moving
+              over a still gradient background)
+
+    Returns:
+        List of (SIZE, SIZE, 3) uint8 RGB frames
+    """
+    if name == 'gradient':
+        # Smooth color ramps sliding diagonally - the worst case for banding
+        y, x = np.mgrid[0:SIZE, 0:SIZE]
+        return [np.stack([x * 255 // (SIZE - 1), y * 255 // (SIZE - 1),
+                          (x + y + i * 16) % 256], axis=-1).astype(np.uint8)
+                for i in range(NUM_FRAMES)]
+
+    if name in ('fade_gradient', 'sprite_gradient'):
+        from core.frame_composer import create_gradient_background
+
+        background = np.array(create_gradient_background(SIZE, SIZE, (255, 120, 40), (40, 20, 120)))
+        frames = []
+        for i in range(NUM_FRAMES):
+            if name == 'fade_gradient':
+                frames.append((background * (0.3 + 0.7 * i / (NUM_FRAMES - 1))).astype(np.uint8))
+            else:
+                frame = background.copy()
+                x = i * (SIZE - SIZE // 8) // (NUM_FRAMES - 1)
+                frame[SIZE * 3 // 8:SIZE * 5 // 8, x:x + SIZE // 8] = (255, 255, 255)
+                frames.append(frame)
+        return frames
+
+    from core.template_registry import get_template
+    from core.typography import BUNDLED_FONT, set_font_override
+
+    if name not in CASES:
+        raise ValueError(f"Unknown source {name!r}. Use gradient or one of {', '.join(CASES)}")
+    set_font_override(BUNDLED_FONT)
+    with contextlib.redirect_stdout(io.StringIO()):
+        frames = get_template(name)(**CASES[name](SIZE, NUM_FRAMES))
+    return [np.array(frame.convert('RGB')) if isinstance(frame, Image.Image) else frame
+            for frame in frames]
+
+
+def run_case(frames: list[np.ndarray], quantizer: str, num_colors: int, repeat: int = 3,
+             dither: Optional[str] = None) -> dict:
+    """
+    Encode frames with one quantizer, color count and dither mode.
+
+    Args:
+        frames: Source frames
+        quantizer: One of gif_builder.QUANTIZERS
+        num_colors: Palette size
+        repeat: Timed runs; the fastest is kept
+        dither: One of gif_builder.DITHER_MODES (None = the quantizer's own default)
+
+    Returns:
+        Dictionary with the METRICS
+    """
+    def encode():
+        builder = GIFBuilder(width=SIZE, height=SIZE, fps=FPS)
+        builder.add_frames(frames)
+        return builder.to_bytes(num_colors=num_colors, remove_duplicates=False, quantizer=quantizer,
+                                dither=dither)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        encode_s, data = best_of(encode, repeat)
+
+    # Pillow merges identical consecutive frames into one longer frame
+    decoded = []
+    for frame in ImageSequence.Iterator(Image.open(io.BytesIO(data))):
+        repeats = max(1, round(frame.info.get('duration', 1000 / FPS) * FPS / 1000))
+        decoded += [np.array(frame.convert('RGB'))] * repeats
+    errors = [mean_delta_e(source, output) for source, output in zip(frames, decoded)]
+
+    return {
+        'encode_s': encode_s,
+        'output_bytes': len(data),
+        'delta_e': float(np.mean(errors)),
+    }
+
+
+def run_suite(sources: Optional[list[str]] = None, colors: Optional[list[int]] = None,
+              repeat: int = 3, progress=sys.stderr, dithers: Optional[list[str]] = None) -> dict:
+    """
+    Benchmark every quantizer on every source at every color count.
+
+    Args:
+        sources: Source names (default: SOURCES)
+        colors: Palette sizes (default: 16, 32, 48, 64)
+        repeat: Timed runs per case
+        progress: Stream for per-source progress lines (None for silence)
+        dithers: Dither modes, each used with both quantizers (default: 'none')
+
+    Returns:
+        {'source/quantizer/colors/dither': metrics}
+    """
+    results = {}
+    for source in sources or SOURCES:
+        if progress:
+            print(f"  {source}...", file=progress)
+        frames = source_frames(source)
+        for quantizer in QUANTIZERS:
+            for num_colors in colors or [16, 32, 48, 64]:
+                for dither in dithers or ['none']:
+                    case = f'{source}/{quantizer}/{num_colors}/{dither}'
+                    results[case] = run_case(frames, quantizer, num_colors, repeat, dither)
+    return results
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Benchmark the OKLab quantizer against median cut.')
+    parser.add_argument('-s', '--sources', help=f"Comma-separated sources (default: {','.join(SOURCES)})")
+    parser.add_argument('-c', '--colors', default='16,32,48,64', help='Comma-separated palette sizes')
+    parser.add_argument('-d', '--dither', default='none',
+                        help="Comma-separated dither modes used with both quantizers, or 'all'")
+    parser.add_argument('-r', '--repeat', type=int, default=3, help='Runs per measurement')
+    parser.add_argument('-o', '--output', help='Save this run as JSON')
+    parser.add_argument('--save-baseline', metavar='PATH', help='Save this run as the new baseline')
+    parser.add_argument('--baseline', metavar='PATH', help='Compare against this baseline')
+    parser.add_argument('--threshold', action='append', default=[], metavar='METRIC=REL[:ABS]',
+                        help='Regression threshold override, e.g. delta_e=0.1')
+    parser.add_argument('--show-all', action='store_true', help='List unchanged metrics in the comparison')
+    args = parser.parse_args(argv)
+
+    thresholds = parse_thresholds(args.threshold)
+    baseline = load_results(args.baseline) if args.baseline else None
+    colors = [int(c) for c in args.colors.split(',')]
+    dithers = list(DITHER_MODES) if args.dither == 'all' else args.dither.split(',')
+
+    results = run_suite(args.sources.split(',') if args.sources else None, colors, args.repeat,
+                        dithers=dithers)
+    print_results(results, METRICS)
+    for path in (args.output, args.save_baseline):
+        if path:
+            save_results(path, results, {'colors': colors, 'dithers': dithers, 'repeat': args.repeat,
+                                         'seed': SEED})
+
+    if baseline is None:
+        return 0
+
+    rows = compare(baseline['results'], results, thresholds)
+    print(f"\nCompared with {args.baseline} ({baseline.get('created', 'unknown date')}):")
+    print(format_comparison(rows, show_all=args.show_all))
+    return 1 if has_regressions(rows) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Render server load test - Throughput and latency of `cli.py serve` on one box.
+
+    python benchmarks/bench_server.py --start --workers 4 -c 16 -n 400
+    python benchmarks/bench_server.py --url http://127.0.0.1:8765 -c 32 -n 1000
+
+Sends POST /render requests from -c concurrent keep-alive clients, cycling
+through --distinct different jobs (fewer distinct jobs = more requests
+coalesced onto identical in-flight renders). 503 responses are counted as
+rejected, not retried. Reports throughput and latency percentiles, plus the
+server's coalesced/rejected counters.
+"""
+
+import argparse
+import http.client
+import json
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional
+from urllib.parse import urlsplit
+
+SKILL_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(SKILL_DIR))
+
+from benchmarks.harness import (compare, format_comparison, has_regressions, load_results,
+                                parse_thresholds, print_results, save_results)
+
+
+METRICS = ['throughput_rps', 'p50_s', 'p95_s', 'p99_s', 'ok', 'rejected', 'errors', 'coalesced']
+
+
+def make_job(index: int, size: int = 128) -> dict:
+    """A small emoji-size job; index picks the frame count so jobs differ."""
+    return {
+        'template': 'pulse',
+        'params': {'object_type': 'circle', 'object_data': {'radius': size // 5, 'color': [255, 80, 80]},
+                   'num_frames': 8 + index, 'center_pos': [size // 2, size // 2],
+                   'frame_width': size, 'frame_height': size},
+        'fps': 12,
+        'num_colors': 48,
+    }
+
+
+def _get_json(host: str, port: int, path: str) -> dict:
+    connection = http.client.HTTPConnection(host, port, timeout=30)
+    try:
+        connection.request('GET', path)
+        return json.loads(connection.getresponse().read())
+    finally:
+        connection.close()
+
+
+def _client(host: str, port: int, bodies: list[bytes]) -> list[tuple[int, float]]:
+    """Send requests one after another on one keep-alive connection."""
+    connection = http.client.HTTPConnection(host, port, timeout=120)
+    timings = []
+    try:
+        for body in bodies:
+            start = time.perf_counter()
+            connection.request('POST', '/render', body=body,
+                               headers={'Content-Type': 'application/json'})
+            response = connection.getresponse()
+            response.read()
+            timings.append((response.status, time.perf_counter() - start))
+    finally:
+        connection.close()
+    return timings
+
+
+def _percentile(values: list[float], fraction: float) -> float:
+    if not values:
+        return float('nan')
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def run_load(host: str, port: int, requests: int = 200, concurrency: int = 8,
+             distinct: int = 4) -> dict:
+    """
+    Load a running render server.
+
+    Args:
+        host, port: Server address
+        requests: Total requests
+        concurrency: Concurrent client connections
+        distinct: Number of different jobs to cycle through
+
+    Returns:
+        Metrics: throughput_rps, p50_s/p95_s/p99_s (successful requests),
+        ok, rejected, errors, coalesced
+    """
+    bodies = [json.dumps(make_job(i % distinct)).encode('utf-8') for i in range(requests)]
+    per_client = [bodies[i::concurrency] for i in range(concurrency)]
+    before = _get_json(host, port, '/health')
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        timings = [t for chunk in pool.map(lambda b: _client(host, port, b), per_client) for t in chunk]
+    elapsed = time.perf_counter() - start
+
+    after = _get_json(host, port, '/health')
+    latencies = [seconds for status, seconds in timings if status == 200]
+    return {
+        'throughput_rps': len(latencies) / elapsed,
+        'p50_s': _percentile(latencies, 0.50),
+        'p95_s': _percentile(latencies, 0.95),
+        'p99_s': _percentile(latencies, 0.99),
+        'ok': len(latencies),
+        'rejected': sum(1 for status, _ in timings if status == 503),
+        'errors': sum(1 for status, _ in timings if status not in (200, 503)),
+        'coalesced': after['coalesced'] - before['coalesced'],
+    }
+
+
+def start_server(workers: Optional[int], max_queue: int) -> tuple[subprocess.Popen, int]:
+    """Start `cli.py serve` on a free port and wait until it is listening."""
+    command = [sys.executable, str(SKILL_DIR / 'cli.py'), 'serve', '--port', '0',
+               '--max-queue', str(max_queue)]
+    if workers:
+        command += ['--workers', str(workers)]
+    process = subprocess.Popen(command, stderr=subprocess.PIPE, text=True)
+    line = process.stderr.readline()
+    if not line.startswith('Serving on'):
+        process.kill()
+        raise RuntimeError(f"Server didn't start: {line}{process.stderr.read()}")
+    port = int(line.split()[2].rsplit(':', 1)[1])
+    return process, port
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Load-test the local render server.')
+    parser.add_argument('--url', default='http://127.0.0.1:8765', help='Server to load')
+    parser.add_argument('--start', action='store_true', help='Start a server for the test')
+    parser.add_argument('-w', '--workers', type=int, help='Workers for --start (default: CPU count)')
+    parser.add_argument('--max-queue', type=int, default=64, help='Queue limit for --start')
+    parser.add_argument('-n', '--requests', type=int, default=200)
+    parser.add_argument('-c', '--concurrency', type=int, default=8)
+    parser.add_argument('--distinct', type=int, default=4, help='Different jobs to cycle through')
+    parser.add_argument('-o', '--output', help='Save this run as JSON')
+    parser.add_argument('--save-baseline', metavar='PATH', help='Save this run as the new baseline')
+    parser.add_argument('--baseline', metavar='PATH', help='Compare against this baseline')
+    parser.add_argument('--threshold', action='append', default=[], metavar='METRIC=REL[:ABS]',
+                        help='Regression threshold override, e.g. p95_s=0.1')
+    args = parser.parse_args(argv)
+
+    process = None
+    if args.start:
+        process, port = start_server(args.workers, args.max_queue)
+        host = '127.0.0.1'
+    else:
+        address = urlsplit(args.url)
+        host, port = address.hostname, address.port or 80
+
+    try:
+        # One warm-up request so the first measurement isn't an outlier
+        _client(host, port, [json.dumps(make_job(0)).encode('utf-8')])
+        case = f'render/c{args.concurrency}/d{args.distinct}'
+        results = {case: run_load(host, port, args.requests, args.concurrency, args.distinct)}
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait(timeout=30)
+
+    print_results(results, METRICS)
+    settings = {'requests': args.requests, 'concurrency': args.concurrency,
+                'distinct': args.distinct, 'workers': args.workers, 'max_queue': args.max_queue}
+    for path in (args.output, args.save_baseline):
+        if path:
+            save_results(path, results, settings)
+
+    if not args.baseline:
+        return 0
+    baseline = load_results(args.baseline)
+    rows = compare(baseline['results'], results, parse_thresholds(args.threshold))
+    print(f"\nCompared with {args.baseline} ({baseline.get('created', 'unknown date')}):")
+    print(format_comparison(rows))
+    return 1 if has_regressions(rows) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
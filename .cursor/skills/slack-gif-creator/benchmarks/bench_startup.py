@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Start-up benchmarks - Cold-import and first-job time in fresh interpreters.
+
+    python benchmarks/bench_startup.py --save-baseline benchmarks/startup.json
+    python benchmarks/bench_startup.py --baseline benchmarks/startup.json
+
+Every measurement starts a new Python process, so nothing is cached in
+sys.modules. Interpreter start-up itself isn't counted:
+
+    import:<module>   import_s     time to import the module
+    first_job:<size>  import_s     time to import what one job needs
+                      first_job_s  import + render + encode of one small bounce
+                                   GIF (what a short-lived worker pays per job)
+
+The fastest of --repeat runs is kept. Comparison works as in
+bench_templates.py.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Optional
+
+SKILL_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(SKILL_DIR))
+
+from benchmarks.harness import (compare, format_comparison, has_regressions, load_results,
+                                parse_thresholds, print_results, save_results)
+
+
+MODULES = [
+    'core',
+    'core.gif_builder',
+    'core.validators',
+    'core.render_cache',
+    'core.template_registry',
+    'templates.bounce',
+    'templates.explode',
+    'templates.kaleidoscope',
+    'templates.zoom',
+]
+
+# size name -> (frame size, frames)
+FIRST_JOB_SIZES = {
+    'emoji': (128, 12),
+    'message': (480, 20),
+}
+
+METRICS = ['import_s', 'first_job_s']
+
+_IMPORT_SCRIPT = """
+import sys, time
+sys.path.insert(0, {skill_dir!r})
+start = time.perf_counter()
+import {module}
+print('{{"import_s": %r}}' % (time.perf_counter() - start))
+"""
+
+_FIRST_JOB_SCRIPT = """
+import contextlib, io, json, sys, time
+sys.path.insert(0, {skill_dir!r})
+start = time.perf_counter()
+from core.template_registry import get_template
+from core.gif_builder import GIFBuilder
+create = get_template('bounce')
+imported = time.perf_counter()
+with contextlib.redirect_stdout(io.StringIO()):
+    frames = create(object_type='emoji', object_data={{'emoji': '🎉', 'size': {size} // 3}},
+                    num_frames={frames}, bounce_height={size} // 3, ground_y={size} * 3 // 4,
+                    start_x={size} // 2, frame_width={size}, frame_height={size})
+    builder = GIFBuilder(width={size}, height={size}, fps=15)
+    builder.add_frames(frames)
+    builder.to_bytes(num_colors=48)
+print(json.dumps({{'import_s': imported - start, 'first_job_s': time.perf_counter() - start}}))
+"""
+
+
+def _run_fresh(script: str) -> dict:
+    """Run a script in a new interpreter and parse the JSON it prints last."""
+    env = dict(os.environ, SLACK_GIF_FONT='bundled')
+    completed = subprocess.run([sys.executable, '-c', script], capture_output=True,
+                               text=True, env=env, check=False)
+    if completed.returncode != 0:
+        raise RuntimeError(f"Benchmark process failed:\n{completed.stderr}")
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def _fastest(script: str, repeat: int) -> dict:
+    """Keep the fastest value of each metric over several fresh runs."""
+    best = {}
+    for _ in range(max(1, repeat)):
+        for metric, value in _run_fresh(script).items():
+            best[metric] = min(value, best.get(metric, float('inf')))
+    return best
+
+
+def measure_import(module: str, repeat: int = 5) -> dict:
+    """
+    Measure the cold-import time of one module.
+
+    Args:
+        module: Dotted module name (e.g. 'core.gif_builder')
+        repeat: Fresh interpreters to try; the fastest is kept
+
+    Returns:
+        Dictionary with import_s
+    """
+    return _fastest(_IMPORT_SCRIPT.format(skill_dir=str(SKILL_DIR), module=module), repeat)
+
+
+def measure_first_job(size_name: str = 'emoji', repeat: int = 5) -> dict:
+    """
+    Measure a cold worker's first job: imports, then render and encode a bounce GIF.
+
+    Args:
+        size_name: 'emoji' or 'message'
+        repeat: Fresh interpreters to try; the fastest is kept
+
+    Returns:
+        Dictionary with import_s and first_job_s
+    """
+    size, frames = FIRST_JOB_SIZES[size_name]
+    script = _FIRST_JOB_SCRIPT.format(skill_dir=str(SKILL_DIR), size=size, frames=frames)
+    return _fastest(script, repeat)
+
+
+def run_suite(modules: Optional[list[str]] = None, repeat: int = 5, progress=sys.stderr) -> dict:
+    """
+    Measure cold imports and first jobs.
+
+    Args:
+        modules: Modules to import (default: MODULES)
+        repeat: Fresh interpreters per measurement
+        progress: Stream for progress lines (None for silence)
+
+    Returns:
+        {case: metrics}
+    """
+    results = {}
+    for module in modules or MODULES:
+        results[f'import:{module}'] = measure_import(module, repeat)
+    for size_name in FIRST_JOB_SIZES:
+        results[f'first_job:{size_name}'] = measure_first_job(size_name, repeat)
+
+    if progress:
+        for case, metrics in results.items():
+            print(f"  {case}: " + ', '.join(f"{k} {v * 1000:.1f}ms" for k, v in metrics.items()),
+                  file=progress)
+    return results
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Benchmark cold-import and first-job time.')
+    parser.add_argument('-m', '--modules', help='Comma-separated modules to import (default: a standard set)')
+    parser.add_argument('-r', '--repeat', type=int, default=5, help='Fresh interpreters per measurement')
+    parser.add_argument('-o', '--output', help='Save this run as JSON')
+    parser.add_argument('--save-baseline', metavar='PATH', help='Save this run as the new baseline')
+    parser.add_argument('--baseline', metavar='PATH', help='Compare against this baseline')
+    parser.add_argument('--threshold', action='append', default=[], metavar='METRIC=REL[:ABS]',
+                        help='Regression threshold override, e.g. import_s=0.1')
+    parser.add_argument('--show-all', action='store_true', help='List unchanged metrics in the comparison')
+    args = parser.parse_args(argv)
+
+    thresholds = parse_thresholds(args.threshold)
+    baseline = load_results(args.baseline) if args.baseline else None
+
+    results = run_suite(args.modules.split(',') if args.modules else None, repeat=args.repeat)
+    print_results(results, METRICS)
+    for path in (args.output, args.save_baseline):
+        if path:
+            save_results(path, results, {'repeat': args.repeat})
+
+    if baseline is None:
+        return 0
+
+    rows = compare(baseline['results'], results, thresholds)
+    print(f"\nCompared with {args.baseline} ({baseline.get('created', 'unknown date')}):")
+    print(format_comparison(rows, show_all=args.show_all))
+    return 1 if has_regressions(rows) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+Template benchmarks - Render and encode every template at Slack's sizes.
+
+    python benchmarks/bench_templates.py --save-baseline benchmarks/baseline.json
+    python benchmarks/bench_templates.py --baseline benchmarks/baseline.json
+
+Each template runs at emoji size (128x128) and message size (480x480) with
+a standard frame count. For each case we record:
+
+    render_s        fastest template render (create_*_animation)
+    encode_s        fastest in-memory GIF encode (GIFBuilder.save)
+    peak_memory_mb  peak Python/NumPy allocations during render + encode (tracemalloc)
+    peak_rss_mb     growth of the process's peak RSS, including Pillow's image buffers
+    output_bytes    size of the encoded GIF
+    frames          frames in the encoded GIF
+
+Every case runs in a fresh process so memory peaks and caches don't leak
+between cases. Text and emoji are drawn with Pillow's bundled font (no
+system fonts, no network), and randomized templates get a fixed seed, so
+output_bytes is exactly reproducible on a given Pillow version.
+
+With --baseline the run is compared against a saved run; the exit status is
+1 if any metric regressed past its threshold (see --threshold).
+"""
+
+import argparse
+import contextlib
+import io
+import multiprocessing
+import sys
+import tracemalloc
+from pathlib import Path
+from typing import Optional
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks.harness import (DEFAULT_THRESHOLDS, best_of, compare, format_comparison,
+                                has_regressions, load_results, parse_thresholds,
+                                print_results, save_results)
+
+
+# size name -> (frame size, frame count, GIFBuilder.save() options). Duplicate
+# removal is off so encode_s always covers every frame the template rendered.
+SIZES = {
+    'emoji': (128, 16, {'num_colors': 48, 'optimize_for_emoji': True, 'remove_duplicates': False}),
+    'message': (480, 30, {'num_colors': 128, 'remove_duplicates': False}),
+}
+
+FPS = 15
+SEED = 42
+
+METRICS = ['render_s', 'encode_s', 'peak_memory_mb', 'peak_rss_mb', 'output_bytes', 'frames']
+
+
+def _emoji(size: int, emoji: str = '🎉') -> dict:
+    return {'emoji': emoji, 'size': size * 3 // 8}
+
+
+def _centered(size: int) -> dict:
+    return {'center_pos': (size // 2, size // 2), 'frame_width': size, 'frame_height': size}
+
+
+# template name -> params for (frame size, frame count); one case per template module
+CASES = {
+    'bounce': lambda s, n: {
+        'object_type': 'circle', 'object_data': {'radius': s // 10, 'color': (255, 100, 100)},
+        'num_frames': n, 'bounce_height': s * 5 // 16, 'ground_y': s * 3 // 4, 'start_x': s // 2,
+        'frame_width': s, 'frame_height': s},
+    'explode': lambda s, n: {
+        'object_data': _emoji(s, '💣'), 'num_frames': n, 'seed': SEED, **_centered(s)},
+    'fade': lambda s, n: {
+        'object_data': _emoji(s, '👋'), 'num_frames': n, 'fade_type': 'in_out', **_centered(s)},
+    'flip': lambda s, n: {
+        'object1_data': _emoji(s, '😊'), 'object2_data': _emoji(s, '😂'), 'num_frames': n,
+        **_centered(s)},
+    'kaleidoscope': lambda s, n: {'num_frames': n, 'width': s, 'height': s},
+    'morph': lambda s, n: {
+        'object1_data': _emoji(s, '😊'), 'object2_data': _emoji(s, '😎'), 'num_frames': n,
+        **_centered(s)},
+    'move': lambda s, n: {
+        'object_data': _emoji(s, '🚀'), 'start_pos': (s // 10, s // 2),
+        'end_pos': (s * 9 // 10, s // 2), 'num_frames': n, 'motion_type': 'arc',
+        'frame_width': s, 'frame_height': s},
+    'pulse': lambda s, n: {
+        'object_data': _emoji(s, '❤️'), 'num_frames': n, 'pulse_type': 'heartbeat',
+        **_centered(s)},
+    'shake': lambda s, n: {
+        'object_data': _emoji(s, '😱'), 'num_frames': n, 'shake_intensity': max(2, s // 32),
+        'center_x': s // 2, 'center_y': s // 2, 'frame_width': s, 'frame_height': s},
+    'slide': lambda s, n: {
+        'object_data': _emoji(s, '👉'), 'num_frames': n, 'overshoot': True,
+        'frame_width': s, 'frame_height': s},
+    'spin': lambda s, n: {
+        'object_data': _emoji(s, '🌀'), 'num_frames': n, **_centered(s)},
+    'wiggle': lambda s, n: {
+        'object_data': _emoji(s, '🙃'), 'num_frames': n, **_centered(s)},
+    'zoom': lambda s, n: {
+        'object_data': _emoji(s, '🔍'), 'num_frames': n, 'zoom_type': 'punch', **_centered(s)},
+}
+
+
+def run_case(template: str, size_name: str, repeat: int = 3,
+             num_frames: Optional[int] = None, bundled_font: bool = True) -> dict:
+    """
+    Benchmark one template at one size.
+
+    The first render + encode runs under tracemalloc to measure memory (and
+    warms imports and font caches); the timed runs come after it.
+
+    Args:
+        template: Template name (a key of CASES)
+        size_name: 'emoji' or 'message'
+        repeat: Timed runs; the fastest is kept
+        num_frames: Override the size's standard frame count
+        bundled_font: Draw text with Pillow's bundled font instead of system fonts
+
+    Returns:
+        Dictionary with the METRICS
+    """
+    import resource
+
+    from core.gif_builder import GIFBuilder
+    from core.template_registry import get_template
+    from core.typography import BUNDLED_FONT, set_font_override
+
+    if bundled_font:
+        set_font_override(BUNDLED_FONT)
+
+    size, default_frames, save_options = SIZES[size_name]
+    params = CASES[template](size, num_frames or default_frames)
+    create_fn = get_template(template)
+
+    def render():
+        return create_fn(**params)
+
+    def encode(frames):
+        builder = GIFBuilder(width=size, height=size, fps=FPS)
+        builder.add_frames(frames)
+        buffer = io.BytesIO()
+        info = builder.save(buffer, **save_options)
+        return buffer.getbuffer().nbytes, info['frame_count']
+
+    # Templates and GIFBuilder print progress; keep the report readable
+    with contextlib.redirect_stdout(io.StringIO()):
+        rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        tracemalloc.start()
+        frames = render()
+        output_bytes, frame_count = encode(frames)
+        _, peak_memory = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+        render_s, frames = best_of(render, repeat)
+        encode_s, _ = best_of(lambda: encode(frames), repeat)
+
+    # ru_maxrss is in KB on Linux, bytes on macOS
+    rss_unit = 1 if sys.platform == 'darwin' else 1024
+    return {
+        'render_s': render_s,
+        'encode_s': encode_s,
+        'peak_memory_mb': peak_memory / (1024 * 1024),
+        'peak_rss_mb': (rss_after - rss_before) * rss_unit / (1024 * 1024),
+        'output_bytes': output_bytes,
+        'frames': frame_count,
+    }
+
+
+def _run_case_args(args: tuple) -> dict:
+    return run_case(*args)
+
+
+def run_suite(templates: Optional[list[str]] = None, sizes: Optional[list[str]] = None,
+              repeat: int = 3, num_frames: Optional[int] = None, bundled_font: bool = True,
+              isolate: bool = True, progress=sys.stderr) -> dict:
+    """
+    Benchmark templates at each size.
+
+    Args:
+        templates: Template names (default: all CASES)
+        sizes: Size names (default: all SIZES)
+        repeat: Timed runs per case
+        num_frames: Override the standard frame counts
+        bundled_font: Draw text with Pillow's bundled font
+        isolate: Run each case in a fresh process (accurate peak RSS)
+        progress: Stream for per-case progress lines (None for silence)
+
+    Returns:
+        {'template/size': metrics}
+    """
+    templates = templates or list(CASES)
+    sizes = sizes or list(SIZES)
+    for name in templates:
+        if name not in CASES:
+            raise ValueError(f"No benchmark case for template {name!r}. Available: {', '.join(CASES)}")
+    for name in sizes:
+        if name not in SIZES:
+            raise ValueError(f"Unknown size {name!r}. Use {' or '.join(SIZES)}")
+
+    jobs = [(template, size_name, repeat, num_frames, bundled_font)
+            for template in templates for size_name in sizes]
+
+    results = {}
+
+    def record(job, metrics):
+        case = f'{job[0]}/{job[1]}'
+        results[case] = metrics
+        if progress:
+            print(f"  {case}: render {metrics['render_s'] * 1000:.1f}ms, "
+                  f"encode {metrics['encode_s'] * 1000:.1f}ms", file=progress)
+
+    if isolate:
+        context = multiprocessing.get_context('spawn')
+        with context.Pool(processes=1, maxtasksperchild=1) as pool:
+            measurements = pool.imap(_run_case_args, jobs)
+            for job, metrics in zip(jobs, measurements):
+                record(job, metrics)
+    else:
+        for job in jobs:
+            record(job, run_case(*job))
+    return results
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Benchmark every template at emoji and message size.')
+    parser.add_argument('-t', '--templates', help=f"Comma-separated templates (default: all of {', '.join(CASES)})")
+    parser.add_argument('-s', '--sizes', help=f"Comma-separated sizes (default: {','.join(SIZES)})")
+    parser.add_argument('-r', '--repeat', type=int, default=3, help='Timed runs per case (fastest is kept)')
+    parser.add_argument('--frames', type=int, help='Override the standard frame counts')
+    parser.add_argument('-o', '--output', help='Save this run as JSON')
+    parser.add_argument('--save-baseline', metavar='PATH', help='Save this run as the new baseline')
+    parser.add_argument('--baseline', metavar='PATH', help='Compare against this baseline')
+    parser.add_argument('--threshold', action='append', default=[], metavar='METRIC=REL[:ABS]',
+                        help='Regression threshold override, e.g. render_s=0.1 or output_bytes=0:0 '
+                             f"(defaults: {', '.join(f'{m}={r}:{a}' for m, (r, a) in DEFAULT_THRESHOLDS.items())})")
+    parser.add_argument('--show-all', action='store_true', help='List unchanged metrics in the comparison')
+    parser.add_argument('--system-fonts', action='store_true',
+                        help="Use the system fonts (numbers won't match other machines)")
+    parser.add_argument('--no-isolate', action='store_true',
+                        help='Run every case in this process (faster; peak_rss_mb is unreliable)')
+    args = parser.parse_args(argv)
+
+    thresholds = parse_thresholds(args.threshold)
+    baseline = load_results(args.baseline) if args.baseline else None
+
+    settings = {
+        'repeat': args.repeat,
+        'frames': args.frames,
+        'font': 'system' if args.system_fonts else 'bundled',
+        'fps': FPS,
+    }
+    results = run_suite(
+        templates=args.templates.split(',') if args.templates else None,
+        sizes=args.sizes.split(',') if args.sizes else None,
+        repeat=args.repeat,
+        num_frames=args.frames,
+        bundled_font=not args.system_fonts,
+        isolate=not args.no_isolate,
+    )
+
+    print_results(results, METRICS)
+    for path in (args.output, args.save_baseline):
+        if path:
+            save_results(path, results, settings)
+
+    if baseline is None:
+        return 0
+
+    if baseline.get('settings', {}).get('font') != settings['font']:
+        print("\nWarning: baseline was measured with a different font setting", file=sys.stderr)
+    rows = compare(baseline['results'], results, thresholds)
+    print(f"\nCompared with {args.baseline} ({baseline.get('created', 'unknown date')}):")
+    print(format_comparison(rows, show_all=args.show_all))
+    return 1 if has_regressions(rows) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Text benchmarks - Glyph atlas drawing against PIL's FreeType drawing.
+
+    python benchmarks/bench_text.py
+    python benchmarks/bench_text.py --sizes 32,60 --baseline benchmarks/text.json
+
+For each font size and text, draws an animated caption (per-letter wave
+with a typewriter reveal, 2 px outline) for --frames frames two ways and
+reports the fastest of --repeat runs:
+
+    pil_s         typography.draw_text_with_outline(), one call per letter
+                  (what per-letter motion costs without an atlas)
+    atlas_s       glyph_atlas.draw_atlas_text() with per-letter offsets
+    build_s       rasterizing the atlas
+    load_s        loading the atlas from the disk cache
+
+Text is drawn with the bundled font so results are comparable between
+machines. Comparison works as in bench_templates.py.
+"""
+
+import argparse
+import sys
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+from PIL import Image
+
+SKILL_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(SKILL_DIR))
+
+from benchmarks.harness import (best_of, compare, format_comparison, has_regressions, load_results,
+                                parse_thresholds, print_results, save_results)
+from core import glyph_atlas
+from core.glyph_atlas import GlyphAtlas, char_offsets, draw_atlas_text, typewriter_count
+from core.typography import BUNDLED_FONT, draw_text_with_outline, get_font, set_font_override
+
+
+TEXTS = {
+    'short': 'BONK!',
+    'caption': 'Deploy finished, zero errors',
+}
+
+SIZE = 480
+
+METRICS = ['pil_s', 'atlas_s', 'build_s', 'load_s']
+
+
+def run_case(text: str, font_size: int, num_frames: int = 24, repeat: int = 3) -> dict:
+    """
+    Time one text at one font size.
+
+    Args:
+        text: Text to animate
+        font_size: Font size in pixels
+        num_frames: Frames per animation
+        repeat: Runs per measurement; the fastest is kept
+
+    Returns:
+        Dictionary with the METRICS
+    """
+    progress = [i / max(1, num_frames - 1) for i in range(num_frames)]
+    offsets = [char_offsets(len(text), t, 'wave', font_size / 5) for t in progress]
+    counts = [typewriter_count(len(text), t) for t in progress]
+
+    def atlas_frames():
+        for frame_offsets, count in zip(offsets, counts):
+            frame = np.zeros((SIZE, SIZE, 3), dtype=np.uint8)
+            draw_atlas_text(frame, text, (SIZE // 2, SIZE // 2), font_size, outline_color=(0, 0, 0),
+                            outline_width=2, centered=True, offsets=frame_offsets, visible=count)
+
+    def pil_frames():
+        font = get_font(font_size, bold=True)
+        for frame_offsets, count in zip(offsets, counts):
+            frame = Image.new('RGB', (SIZE, SIZE))
+            x = 0.0
+            for char, (dx, dy) in zip(text[:count], frame_offsets):
+                draw_text_with_outline(frame, char, (int(x + dx), int(SIZE // 2 + dy)), font_size,
+                                       outline_width=2)
+                x += font.getlength(char)
+
+    font = get_font(font_size, bold=True)
+    build_s, atlas = best_of(lambda: GlyphAtlas.build(font), repeat)
+    data = atlas.to_bytes()
+    load_s, _ = best_of(lambda: GlyphAtlas.from_bytes(data, font), repeat)
+    atlas_frames()  # Build the in-memory atlas outside the timing
+    atlas_s, _ = best_of(atlas_frames, repeat)
+    pil_s, _ = best_of(pil_frames, repeat)
+
+    return {
+        'pil_s': pil_s,
+        'atlas_s': atlas_s,
+        'build_s': build_s,
+        'load_s': load_s,
+    }
+
+
+def run_suite(sizes: Optional[list[int]] = None, num_frames: int = 24, repeat: int = 3) -> dict:
+    """
+    Benchmark every text at every font size.
+
+    Args:
+        sizes: Font sizes (default: 32, 60)
+        num_frames: Frames per animation
+        repeat: Runs per measurement
+
+    Returns:
+        {'text/size': metrics}
+    """
+    set_font_override(BUNDLED_FONT)
+    glyph_atlas.set_atlas_dir(None)  # load_s is timed from bytes; leave the disk cache alone
+    results = {}
+    for name, text in TEXTS.items():
+        for font_size in sizes or [32, 60]:
+            results[f'{name}/{font_size}'] = run_case(text, font_size, num_frames, repeat)
+    return results
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Benchmark glyph atlas text against PIL text drawing.')
+    parser.add_argument('-s', '--sizes', default='32,60', help='Comma-separated font sizes')
+    parser.add_argument('-n', '--frames', type=int, default=24, help='Frames per animation')
+    parser.add_argument('-r', '--repeat', type=int, default=3, help='Runs per measurement')
+    parser.add_argument('-o', '--output', help='Save this run as JSON')
+    parser.add_argument('--save-baseline', metavar='PATH', help='Save this run as the new baseline')
+    parser.add_argument('--baseline', metavar='PATH', help='Compare against this baseline')
+    parser.add_argument('--threshold', action='append', default=[], metavar='METRIC=REL[:ABS]',
+                        help='Regression threshold override, e.g. atlas_s=0.1')
+    parser.add_argument('--show-all', action='store_true', help='List unchanged metrics in the comparison')
+    args = parser.parse_args(argv)
+
+    thresholds = parse_thresholds(args.threshold)
+    baseline = load_results(args.baseline) if args.baseline else None
+    sizes = [int(size) for size in args.sizes.split(',')]
+
+    results = run_suite(sizes, args.frames, args.repeat)
+    print_results(results, METRICS)
+    for path in (args.output, args.save_baseline):
+        if path:
+            save_results(path, results, {'sizes': sizes, 'frames': args.frames, 'repeat': args.repeat,
+                                         'font': BUNDLED_FONT})
+
+    if baseline is None:
+        return 0
+
+    rows = compare(baseline['results'], results, thresholds)
+    print(f"\nCompared with {args.baseline} ({baseline.get('created', 'unknown date')}):")
+    print(format_comparison(rows, show_all=args.show_all))
+    return 1 if has_regressions(rows) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Benchmark Harness - Timing, JSON baselines and regression checks.
+
+Shared by the benchmark scripts in this directory. Results are plain dicts
+of {case: {metric: value}}; a baseline is a saved results file plus the
+environment it was measured in. compare() checks a new run against a
+baseline metric by metric, with a relative threshold and an absolute floor
+so tiny timings don't flag noise as regressions.
+"""
+
+import json
+import os
+import platform
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Optional
+
+
+BASELINE_FORMAT_VERSION = 1
+
+# metric -> (allowed relative increase, increase always ignored below this)
+DEFAULT_THRESHOLDS = {
+    'render_s': (0.25, 0.005),
+    'encode_s': (0.25, 0.005),
+    'peak_memory_mb': (0.20, 1.0),
+    'peak_rss_mb': (0.20, 2.0),
+    'output_bytes': (0.01, 0),
+    'import_s': (0.25, 0.01),
+    'first_job_s': (0.25, 0.02),
+    'p50_s': (0.25, 0.005),
+    'p95_s': (0.25, 0.01),
+    'scalar_s': (0.25, 0.002),
+    'array_s': (0.25, 0.001),
+    'lut_array_s': (0.25, 0.001),
+    'lut_error': (0.01, 1e-6),
+    'delta_e': (0.05, 0.01),
+    'pil_s': (0.25, 0.005),
+    'atlas_s': (0.25, 0.002),
+    'build_s': (0.25, 0.002),
+    'load_s': (0.25, 0.001),
+}
+
+
+def best_of(fn: Callable, repeat: int = 3) -> tuple[float, object]:
+    """
+    Time a function, keeping the fastest of several runs.
+
+    Args:
+        fn: Function to call with no arguments
+        repeat: Number of runs
+
+    Returns:
+        Tuple of (fastest time in seconds, result of the last run)
+    """
+    best = float('inf')
+    result = None
+    for _ in range(max(1, repeat)):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def environment_info() -> dict:
+    """Describe the machine and library versions a run was measured with."""
+    import numpy as np
+    import PIL
+
+    return {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'pillow': PIL.__version__,
+        'numpy': np.__version__,
+    }
+
+
+def save_results(path: str | Path, results: dict, settings: Optional[dict] = None):
+    """
+    Save benchmark results (e.g. as a new baseline).
+
+    Args:
+        path: JSON file to write
+        results: {case: {metric: value}}
+        settings: How the run was configured (repeat count, font, ...)
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    document = {
+        'format_version': BASELINE_FORMAT_VERSION,
+        'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'environment': environment_info(),
+        'settings': settings or {},
+        'results': results,
+    }
+    path.write_text(json.dumps(document, indent=2, sort_keys=True) + '\n', encoding='utf-8')
+
+
+def load_results(path: str | Path) -> dict:
+    """
+    Load a results file written by save_results().
+
+    Args:
+        path: JSON file
+
+    Returns:
+        The saved document (environment, settings, results, ...)
+    """
+    with open(path, encoding='utf-8') as f:
+        document = json.load(f)
+    if document.get('format_version') != BASELINE_FORMAT_VERSION:
+        raise ValueError(f"{path}: unsupported baseline format {document.get('format_version')!r}")
+    return document
+
+
+def parse_thresholds(specs: list[str]) -> dict:
+    """
+    Parse threshold overrides like 'render_s=0.1' or 'output_bytes=0.05:100'.
+
+    Args:
+        specs: 'metric=relative' or 'metric=relative:absolute_floor' strings
+
+    Returns:
+        DEFAULT_THRESHOLDS with the overrides applied
+    """
+    thresholds = dict(DEFAULT_THRESHOLDS)
+    for spec in specs:
+        metric, sep, value = spec.partition('=')
+        if not sep:
+            raise ValueError(f"Threshold must look like metric=0.1, got {spec!r}")
+        relative, _, floor = value.partition(':')
+        default_floor = thresholds.get(metric, (0, 0))[1]
+        try:
+            thresholds[metric] = (float(relative), float(floor) if floor else default_floor)
+        except ValueError:
+            raise ValueError(f"Invalid threshold value in {spec!r}") from None
+    return thresholds
+
+
+def compare(baseline: dict, current: dict, thresholds: Optional[dict] = None) -> list[dict]:
+    """
+    Compare a run against a baseline.
+
+    A metric regresses when it grew by more than its relative threshold AND
+    by more than its absolute floor; it improved when it shrank by as much.
+    Metrics without a threshold are not compared.
+
+    Args:
+        baseline: {case: {metric: value}} from the baseline
+        current: {case: {metric: value}} from this run
+        thresholds: metric -> (relative, absolute floor); default DEFAULT_THRESHOLDS
+
+    Returns:
+        One row per (case, metric) with case, metric, baseline, current,
+        change (relative, None if the baseline is 0) and status:
+        'regression', 'improvement', 'ok', 'new' (case not in baseline) or
+        'missing' (case not in this run)
+    """
+    thresholds = thresholds or DEFAULT_THRESHOLDS
+    rows = []
+
+    for case in sorted(set(baseline) | set(current)):
+        if case not in current:
+            rows.append({'case': case, 'metric': None, 'baseline': None, 'current': None,
+                         'change': None, 'status': 'missing'})
+            continue
+        if case not in baseline:
+            rows.append({'case': case, 'metric': None, 'baseline': None, 'current': None,
+                         'change': None, 'status': 'new'})
+            continue
+
+        for metric, (relative, floor) in thresholds.items():
+            old, new = baseline[case].get(metric), current[case].get(metric)
+            if old is None or new is None:
+                continue
+            delta = new - old
+            change = delta / old if old else None
+            exceeds = abs(delta) > floor and (old == 0 or abs(delta) > relative * old)
+            if exceeds and delta > 0:
+                status = 'regression'
+            elif exceeds:
+                status = 'improvement'
+            else:
+                status = 'ok'
+            rows.append({'case': case, 'metric': metric, 'baseline': old, 'current': new,
+                         'change': change, 'status': status})
+
+    return rows
+
+
+def format_comparison(rows: list[dict], show_all: bool = False) -> str:
+    """
+    Format comparison rows as a text table.
+
+    Args:
+        rows: Rows from compare()
+        show_all: Include unchanged ('ok') metrics
+
+    Returns:
+        Table text, ending in a one-line summary
+    """
+    lines = []
+    for row in rows:
+        if row['status'] == 'ok' and not show_all:
+            continue
+        if row['metric'] is None:
+            lines.append(f"  {row['status'].upper():<12} {row['case']}")
+            continue
+        change = f"{row['change']:+.1%}" if row['change'] is not None else 'n/a'
+        lines.append(f"  {row['status'].upper():<12} {row['case']:<28} {row['metric']:<15} "
+                     f"{row['baseline']:>12.4g} -> {row['current']:<12.4g} ({change})")
+
+    counts = {}
+    for row in rows:
+        counts[row['status']] = counts.get(row['status'], 0) + 1
+    summary = ', '.join(f"{n} {status}" for status, n in sorted(counts.items()))
+    lines.append(f"{len(rows)} comparisons: {summary}")
+    return '\n'.join(lines)
+
+
+def has_regressions(rows: list[dict]) -> bool:
+    """True if any row from compare() is a regression."""
+    return any(row['status'] == 'regression' for row in rows)
+
+
+def print_results(results: dict, metrics: list[str], out=sys.stdout):
+    """Print {case: {metric: value}} as an aligned table."""
+    width = max([28, *(len(case) + 2 for case in results)])
+    out.write(f"{'case':<{width}}" + ''.join(f"{metric:>16}" for metric in metrics) + '\n')
+    for case, values in results.items():
+        cells = ''.join(f"{values.get(metric, float('nan')):>16.4g}" for metric in metrics)
+        out.write(f"{case:<{width}}{cells}\n")
@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+"""
+Slack GIF Creator command line.
+
+    python cli.py batch jobs.jsonl --workers 4 -o results.jsonl
+    python cli.py validate emoji/ --index .validate-index.json -f csv
+    python cli.py serve --port 8765 --workers 4
+
+batch renders every job in a JSONL manifest on a pool of worker processes.
+Each worker imports the templates and loads fonts once, then renders job
+after job, so a large batch doesn't pay interpreter start-up and font
+loading per GIF. One JSON result line is streamed per job as it finishes.
+
+validate checks every GIF in directories or glob patterns against Slack's
+limits concurrently and writes JSON or CSV results (see core/bulk_validate.py).
+
+serve runs a local HTTP render server with a warm worker pool (see
+core/render_server.py).
+
+Manifest lines look like:
+
+    {"id": "party", "template": "bounce", "params": {"object_type": "emoji",
+     "object_data": {"emoji": "🎉", "size": 80}}, "output": "out/party.gif",
+     "fps": 20, "num_colors": 64, "max_size_kb": 64}
+
+Fields: template (required, see core/template_registry.py), output
+(required), params, id, seed, width/height (default: frame size), fps,
+num_colors, quantizer ('median_cut' or 'oklab'), dither, temporal_stable,
+optimize_for_emoji, remove_duplicates, and max_size_kb - a size budget;
+over-budget GIFs are re-encoded with fewer colors until they fit.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Optional
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from core.jobs import encode_within_budget, job_cache_key, job_call
+from core.template_registry import list_templates
+
+
+# Worker-side state, set once per process by _init_worker
+_cache = None
+
+
+def _init_worker(template_names: list[str], cache_dir: Optional[str], cache_max_bytes: int):
+    """Process pool initializer: import templates and warm font caches."""
+    global _cache
+    import core
+
+    core.preload(template_names)
+
+    if cache_dir:
+        from core.render_cache import RenderCache
+        _cache = RenderCache(cache_dir, max_bytes=cache_max_bytes)
+
+
+def run_job(job: dict) -> dict:
+    """
+    Render one manifest job. Never raises - failures are reported in the result.
+
+    Args:
+        job: Parsed manifest line
+
+    Returns:
+        Result record (id, status, output, size_kb, timings, ...)
+    """
+    start = time.perf_counter()
+    result = {
+        'id': job.get('id'),
+        'template': job.get('template'),
+        'output': job.get('output'),
+        'worker': os.getpid(),
+    }
+
+    try:
+        if 'template' not in job or 'output' not in job:
+            raise ValueError("Job needs 'template' and 'output'")
+
+        create_fn, params = job_call(job)
+        output = Path(job['output'])
+        output.parent.mkdir(parents=True, exist_ok=True)
+        max_size_kb = job.get('max_size_kb')
+
+        key = None
+        if _cache is not None:
+            key = job_cache_key(job, params)
+            cached = _cache.get(key)
+            if cached is not None:
+                data, info = cached
+                output.write_bytes(data)
+                result.update(info)
+                result.update({'status': 'ok', 'cached': True,
+                               'timings': {'total_s': time.perf_counter() - start}})
+                return result
+
+        # Template and GIFBuilder progress output would corrupt the JSONL stream
+        with contextlib.redirect_stdout(io.StringIO()):
+            render_start = time.perf_counter()
+            frames = create_fn(**params)
+            render_s = time.perf_counter() - render_start
+
+            encode_start = time.perf_counter()
+            info, attempts = encode_within_budget(frames, output, job)
+            encode_s = time.perf_counter() - encode_start
+
+        info.pop('path', None)
+        within_budget = max_size_kb is None or info['size_kb'] <= max_size_kb
+        result.update(info)
+        result.update({
+            'status': 'ok' if within_budget else 'over_budget',
+            'cached': False,
+            'attempts': attempts,
+            'timings': {
+                'render_s': render_s,
+                'encode_s': encode_s,
+                'total_s': time.perf_counter() - start,
+            },
+        })
+
+        if key is not None and within_budget:
+            _cache.put(key, output.read_bytes(), info)
+
+    except Exception as e:
+        result.update({
+            'status': 'error',
+            'error': f'{type(e).__name__}: {e}',
+            'traceback': traceback.format_exc(),
+            'timings': {'total_s': time.perf_counter() - start},
+        })
+
+    return result
+
+
+def read_manifest(manifest_path: str | Path) -> tuple[list[dict], list[dict]]:
+    """
+    Read a JSONL job manifest.
+
+    Args:
+        manifest_path: Path to the manifest ('-' for stdin)
+
+    Returns:
+        Tuple of (jobs, error results for lines that couldn't be parsed)
+    """
+    stream = sys.stdin if str(manifest_path) == '-' else open(manifest_path, encoding='utf-8')
+    jobs, errors = [], []
+    with stream:
+        for line_number, line in enumerate(stream, 1):
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            try:
+                job = json.loads(line)
+                if not isinstance(job, dict):
+                    raise ValueError('job must be a JSON object')
+            except ValueError as e:
+                errors.append({'id': f'line {line_number}', 'status': 'error',
+                               'error': f'Invalid manifest line: {e}'})
+                continue
+            job.setdefault('id', f'line {line_number}')
+            jobs.append(job)
+    return jobs, errors
+
+
+def run_batch(jobs: list[dict], workers: Optional[int] = None, out=sys.stdout,
+              cache_dir: Optional[str] = None,
+              cache_max_bytes: int = 512 * 1024 * 1024) -> list[dict]:
+    """
+    Render jobs on a process pool, streaming one JSON result line per job.
+
+    Args:
+        jobs: Manifest jobs
+        workers: Worker processes (None = CPU count, 1 = render in this process)
+        out: Text stream for JSONL results
+        cache_dir: Optional render cache directory shared by all workers
+        cache_max_bytes: Render cache size limit
+
+    Returns:
+        List of result records in completion order
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, min(workers, len(jobs)))
+    template_names = sorted({job.get('template') for job in jobs if job.get('template')})
+    init_args = (template_names, cache_dir, cache_max_bytes)
+
+    def emit(result):
+        out.write(json.dumps(result) + '\n')
+        out.flush()
+        results.append(result)
+
+    results = []
+    if workers == 1:
+        _init_worker(*init_args)
+        for job in jobs:
+            emit(run_job(job))
+        return results
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=init_args) as pool:
+        futures = {pool.submit(run_job, job): job for job in jobs}
+        for future in as_completed(futures):
+            try:
+                emit(future.result())
+            except Exception as e:
+                # The worker process died (e.g. killed for memory)
+                job = futures[future]
+                emit({'id': job.get('id'), 'template': job.get('template'),
+                      'output': job.get('output'), 'status': 'error',
+                      'error': f'{type(e).__name__}: {e}'})
+    return results
+
+
+def _batch_command(args) -> int:
+    jobs, errors = read_manifest(args.manifest)
+    out = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+
+    start = time.perf_counter()
+    try:
+        for error in errors:
+            out.write(json.dumps(error) + '\n')
+        results = errors + run_batch(jobs, workers=args.workers, out=out,
+                                     cache_dir=args.cache_dir,
+                                     cache_max_bytes=args.cache_max_mb * 1024 * 1024)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    counts = {}
+    for result in results:
+        counts[result['status']] = counts.get(result['status'], 0) + 1
+    summary = ', '.join(f'{n} {status}' for status, n in sorted(counts.items()))
+    print(f"{len(results)} jobs in {time.perf_counter() - start:.1f}s: {summary}", file=sys.stderr)
+
+    return 0 if counts.get('error', 0) == 0 else 1
+
+
+def _validate_command(args) -> int:
+    from core.bulk_validate import find_gifs, validate_many, write_results
+
+    paths = find_gifs(args.targets)
+    start = time.perf_counter()
+    records = validate_many(paths, is_emoji=not args.message, workers=args.workers,
+                            use_processes=args.processes, index_path=args.index)
+
+    out = open(args.output, 'w', encoding='utf-8', newline='') if args.output else sys.stdout
+    try:
+        write_results(records, out, format=args.format)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    failed = sum(1 for record in records if not record['passes'])
+    cached = sum(1 for record in records if record['cached'])
+    print(f"{len(records)} GIFs in {time.perf_counter() - start:.1f}s: "
+          f"{len(records) - failed} pass, {failed} fail ({cached} unchanged since last run)",
+          file=sys.stderr)
+
+    return 0 if failed == 0 else 1
+
+
+def _serve_command(args) -> int:
+    import asyncio
+    from core.render_server import serve
+
+    def ready(server):
+        print(f"Serving on http://{server.host}:{server.port} ({server.workers} workers, "
+              f"queue {server.max_queue})", file=sys.stderr)
+
+    asyncio.run(serve(args.host, args.port, workers=args.workers, max_queue=args.max_queue,
+                      cache_dir=args.cache_dir, cache_max_bytes=args.cache_max_mb * 1024 * 1024,
+                      ready=ready))
+    return 0
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog='slack-gif-creator',
+                                     description='Create animated GIFs for Slack.')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    batch = subparsers.add_parser('batch', help='Render a JSONL manifest of jobs',
+                                  description='Render a JSONL manifest of jobs. Templates: '
+                                              + ', '.join(list_templates()))
+    batch.add_argument('manifest', help="JSONL job manifest ('-' for stdin)")
+    batch.add_argument('-w', '--workers', type=int, default=None,
+                       help='Worker processes (default: CPU count)')
+    batch.add_argument('-o', '--output', help='Write JSONL results here (default: stdout)')
+    batch.add_argument('--cache-dir', help='Reuse renders from this render cache directory')
+    batch.add_argument('--cache-max-mb', type=int, default=512, help='Render cache size limit')
+    batch.set_defaults(func=_batch_command)
+
+    validate = subparsers.add_parser('validate', help='Validate GIFs against Slack limits',
+                                     description='Validate every GIF in directories or glob patterns.')
+    validate.add_argument('targets', nargs='+', help="Directories, glob patterns ('emoji/**/*.gif') or files")
+    validate.add_argument('--message', action='store_true',
+                          help='Validate as message GIFs (default: emoji)')
+    validate.add_argument('-w', '--workers', type=int, default=None,
+                          help='Pool size (default: CPU count)')
+    validate.add_argument('--processes', action='store_true',
+                          help='Use worker processes instead of threads')
+    validate.add_argument('--index', help='Index file for incremental runs (skips unchanged files)')
+    validate.add_argument('-f', '--format', choices=['json', 'jsonl', 'csv'], default='json')
+    validate.add_argument('-o', '--output', help='Write results here (default: stdout)')
+    validate.set_defaults(func=_validate_command)
+
+    serve = subparsers.add_parser('serve', help='Run a local HTTP render server',
+                                  description='Render jobs over HTTP on a warm worker pool '
+                                              '(see core/render_server.py).')
+    serve.add_argument('--host', default='127.0.0.1', help='Interface to bind (default: localhost)')
+    serve.add_argument('--port', type=int, default=8765)
+    serve.add_argument('-w', '--workers', type=int, default=None,
+                       help='Worker processes (default: CPU count)')
+    serve.add_argument('--max-queue', type=int, default=64,
+                       help='Jobs that may wait for a worker before requests get 503')
+    serve.add_argument('--cache-dir', help='Reuse renders from this render cache directory')
+    serve.add_argument('--cache-max-mb', type=int, default=512, help='Render cache size limit')
+    serve.set_defaults(func=_serve_command)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Slack GIF Creator core toolkit.
+
+Importing the package is nearly free: submodules, and the names below, are
+imported the first time they are used, and heavy dependencies are deferred
+further (imageio until a GIF is saved, numpy and PIL until a module that
+draws or encodes is loaded). Short-lived workers only pay for what a job
+touches.
+
+    import core
+    builder = core.GIFBuilder(128, 128, fps=12)   # imports core.gif_builder here
+
+Long-lived workers can pay the whole cost up front with preload().
+"""
+
+import importlib
+import time
+from typing import Optional
+
+
+__version__ = '1.0.0'
+
+# Public name -> submodule that defines it
+_LAZY_ATTRIBUTES = {
+    'GIFBuilder': 'gif_builder',
+    'GIFSizeLimitExceeded': 'gif_builder',
+    'SUPPORTED_FORMATS': 'gif_builder',
+    'validate_gif': 'validators',
+    'is_slack_ready': 'validators',
+    'get_optimization_suggestions': 'validators',
+    'SLACK_EMOJI_LIMIT_KB': 'validators',
+    'SLACK_MESSAGE_LIMIT_KB': 'validators',
+    'inspect_gif': 'gif_inspector',
+    'parse_gif': 'gif_inspector',
+    'validate_many': 'bulk_validate',
+    'get_template': 'template_registry',
+    'list_templates': 'template_registry',
+    'RenderCache': 'render_cache',
+    'make_cache_key': 'render_cache',
+    'render_cached': 'render_cache',
+    'render_frames': 'parallel_render',
+    'get_rng': 'rng',
+    'interpolate': 'easing',
+    'get_easing': 'easing',
+    'get_font': 'typography',
+    'set_font_override': 'typography',
+}
+
+_SUBMODULES = {
+    'bulk_validate', 'color_palettes', 'dither', 'easing', 'frame_composer', 'gif_builder',
+    'gif_inspector', 'glyph_atlas', 'jobs', 'palette_render', 'parallel_render', 'paths', 'quantize',
+    'render_cache', 'render_server', 'rng', 'scene', 'template_registry', 'text_layout', 'timeline',
+    'typography', 'validators', 'visual_effects',
+}
+
+__all__ = ['__version__', 'preload', *_LAZY_ATTRIBUTES]
+
+
+def __getattr__(name: str):
+    if name in _LAZY_ATTRIBUTES:
+        module = importlib.import_module(f'{__name__}.{_LAZY_ATTRIBUTES[name]}')
+        value = getattr(module, name)
+    elif name in _SUBMODULES:
+        value = importlib.import_module(f'{__name__}.{name}')
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    # Cache so later lookups skip __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES) | _SUBMODULES)
+
+
+def preload(templates: Optional[list[str]] = None, fonts: bool = True,
+            video: bool = False) -> dict:
+    """
+    Import everything a render needs and warm the font caches.
+
+    Call once at start-up in long-lived workers (batch pools, servers) so the
+    first job isn't slower than the rest.
+
+    Args:
+        templates: Template names to import (None = all registered templates)
+        fonts: Load the typography scale and common emoji sizes
+        video: Also load imageio's ffmpeg plugin (for MP4/WebM output)
+
+    Returns:
+        Seconds spent per step: modules, templates, fonts
+    """
+    timings = {}
+
+    start = time.perf_counter()
+    importlib.import_module('imageio.v3')
+    importlib.import_module('imageio.plugins.pillow')
+    importlib.import_module('PIL.GifImagePlugin')
+    if video:
+        importlib.import_module('imageio.plugins.ffmpeg')
+    for module in ('gif_builder', 'frame_composer', 'easing', 'visual_effects', 'color_palettes'):
+        importlib.import_module(f'{__name__}.{module}')
+    timings['modules'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    from core.template_registry import get_template, list_templates
+    for name in templates if templates is not None else list_templates():
+        try:
+            get_template(name)
+        except ValueError:
+            pass  # Unknown names are reported when a job uses them
+    timings['templates'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    if fonts:
+        from core.frame_composer import get_emoji_font
+        from core.typography import TYPOGRAPHY_SCALE, get_font
+        for size in TYPOGRAPHY_SCALE.values():
+            get_font(size, bold=True)
+            get_font(size, bold=False)
+        for size in (40, 60, 80, 100):
+            get_emoji_font(size)
+    timings['fonts'] = time.perf_counter() - start
+
+    return timings
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Bulk Validate - Validate whole directories of GIFs concurrently.
+
+Finds GIFs in directories or glob patterns, validates them on a thread or
+process pool and returns one flat record per file, ready to write as JSON or
+CSV. An optional on-disk index remembers each file's mtime and size, so a
+re-run only validates files that changed since the last one.
+"""
+
+import csv
+import glob
+import json
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional, TextIO
+
+from core.validators import validate_gif
+
+
+# Columns for CSV output, in order
+RECORD_FIELDS = [
+    'file', 'passes', 'size_kb', 'limit_kb', 'size_passes', 'width', 'height',
+    'dimensions_pass', 'frame_count', 'duration_seconds', 'fps', 'error', 'cached',
+]
+
+
+def find_gifs(targets: list[str | Path]) -> list[Path]:
+    """
+    Expand directories (recursively) and glob patterns into GIF paths.
+
+    Args:
+        targets: Directories, glob patterns (e.g. 'emoji/**/*.gif') or files
+
+    Returns:
+        Sorted, de-duplicated list of paths
+    """
+    found = set()
+    for target in targets:
+        target = str(target)
+        if any(char in target for char in '*?['):
+            found.update(Path(p) for p in glob.glob(target, recursive=True) if os.path.isfile(p))
+        elif os.path.isdir(target):
+            found.update(p for p in Path(target).rglob('*') if p.suffix.lower() == '.gif' and p.is_file())
+        else:
+            found.add(Path(target))
+    return sorted(found)
+
+
+def validate_file(gif_path: str | Path, is_emoji: bool = True) -> dict:
+    """
+    Validate one GIF quietly and flatten the result into a single record.
+
+    Args:
+        gif_path: Path to GIF file
+        is_emoji: True for emoji GIF, False for message GIF
+
+    Returns:
+        Record with the RECORD_FIELDS keys
+    """
+    record = dict.fromkeys(RECORD_FIELDS)
+    record.update({'file': str(gif_path), 'passes': False, 'cached': False})
+
+    try:
+        passes, results = validate_gif(gif_path, is_emoji, verbose=False)
+    except Exception as e:
+        record['error'] = f'{type(e).__name__}: {e}'
+        return record
+
+    if 'error' in results:
+        record['error'] = results['error']
+        return record
+
+    size, dimensions = results['size'], results['dimensions']
+    record.update({
+        'passes': passes,
+        'size_kb': round(size['size_kb'], 2),
+        'limit_kb': size['limit_kb'],
+        'size_passes': size['passes'],
+        'width': dimensions['width'],
+        'height': dimensions['height'],
+        'dimensions_pass': dimensions['passes'],
+        'frame_count': results['frame_count'],
+        'duration_seconds': results['duration_seconds'],
+        'fps': results['fps'],
+    })
+    return record
+
+
+def _validate_chunk(paths: list[str], is_emoji: bool) -> list[dict]:
+    """Validate several files in one worker call (keeps process pool overhead low)."""
+    return [validate_file(path, is_emoji) for path in paths]
+
+
+def load_index(index_path: str | Path) -> dict:
+    """Load a validation index ({} if missing or unreadable)."""
+    try:
+        with open(index_path, encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def save_index(index_path: str | Path, index: dict):
+    """Write a validation index atomically."""
+    index_path = Path(index_path)
+    index_path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=index_path.parent, prefix='.tmp-')
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        json.dump(index, f)
+    os.replace(tmp_path, index_path)
+
+
+def validate_many(paths: list[str | Path], is_emoji: bool = True, workers: Optional[int] = None,
+                  use_processes: bool = False, index_path: str | Path | None = None) -> list[dict]:
+    """
+    Validate many GIFs concurrently.
+
+    Args:
+        paths: GIF paths (see find_gifs())
+        is_emoji: True for emoji GIFs, False for message GIFs
+        workers: Pool size (None = CPU count, 1 = validate in this thread)
+        use_processes: Use a process pool instead of threads
+        index_path: Index file for incremental runs; files whose mtime and
+                    size match the index reuse their previous record
+
+    Returns:
+        One record per path, in input order ('cached' is True for reused records)
+    """
+    paths = [str(path) for path in paths]
+    index = load_index(index_path) if index_path else {}
+    mode = 'emoji' if is_emoji else 'message'
+
+    # Index entries are keyed by absolute path, so the same file reached
+    # through different relative paths is validated once
+    keys = {path: os.path.abspath(path) for path in paths}
+    records: dict[str, dict] = {}
+    stats: dict[str, tuple[int, int]] = {}
+    todo = []
+    for key in dict.fromkeys(keys.values()):
+        try:
+            st = os.stat(key)
+            stats[key] = (st.st_mtime_ns, st.st_size)
+        except OSError:
+            stats[key] = None
+
+        entry = index.get(key)
+        if entry and stats[key] and entry.get('mode') == mode \
+                and (entry['mtime_ns'], entry['size']) == stats[key] and entry['record']['frame_count']:
+            records[key] = dict(entry['record'], cached=True)
+        else:
+            todo.append(key)
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, min(workers, len(todo)))
+
+    if workers == 1:
+        fresh = _validate_chunk(todo, is_emoji)
+    else:
+        # A few chunks per worker: balances load without per-file overhead
+        chunk_size = max(1, len(todo) // (workers * 4))
+        chunks = [todo[i:i + chunk_size] for i in range(0, len(todo), chunk_size)]
+        executor = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+        with executor(max_workers=workers) as pool:
+            fresh = [record for chunk in pool.map(_validate_chunk, chunks, [is_emoji] * len(chunks))
+                     for record in chunk]
+
+    for key, record in zip(todo, fresh):
+        records[key] = record
+        # A readable GIF has frames; don't remember anything else as valid
+        if stats[key] and not record['error'] and record['frame_count']:
+            mtime_ns, size = stats[key]
+            index[key] = {'mtime_ns': mtime_ns, 'size': size, 'mode': mode, 'record': record}
+        else:
+            index.pop(key, None)
+
+    if index_path:
+        # Forget deleted files (and keys from before paths were made absolute)
+        index = {key: entry for key, entry in index.items()
+                 if key in stats or (os.path.isabs(key) and os.path.isfile(key))}
+        save_index(index_path, index)
+
+    return [dict(records[keys[path]], file=path) for path in paths]
+
+
+def write_results(records: list[dict], out: TextIO, format: str = 'json'):
+    """
+    Write validation records.
+
+    Args:
+        records: Records from validate_many()
+        out: Text stream
+        format: 'json' (one array), 'jsonl' (one record per line) or 'csv'
+    """
+    if format == 'json':
+        json.dump(records, out, indent=2)
+        out.write('\n')
+    elif format == 'jsonl':
+        for record in records:
+            out.write(json.dumps(record) + '\n')
+    elif format == 'csv':
+        writer = csv.DictWriter(out, fieldnames=RECORD_FIELDS, extrasaction='ignore')
+        writer.writeheader()
+        writer.writerows(records)
+    else:
+        raise ValueError(f"Unknown format: {format}. Use 'json', 'jsonl' or 'csv'")
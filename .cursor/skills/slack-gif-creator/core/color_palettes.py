@@ -4,11 +4,19 @@ Color Palettes - Professional, harmonious color schemes for GIFs.
 
 Using consistent, well-designed color palettes makes GIFs look professional
 and polished instead of random and amateurish.
+
+The color helpers also come in array forms (lighten_color_array, ...) that
+work on many colors at once - an (N, 3) array of particle colors, or a
+whole (H, W, 3) image / PIL image - with the same results as the
+one-color functions.
 """
 
 from typing import Optional
 import colorsys
 
+import numpy as np
+from PIL import Image
+
 
 # Professional color palettes - hand-picked for GIF compression and visual appeal
 
@@ -299,4 +307,236 @@ def get_emoji_palette(name: str = 'simple') -> list[tuple[int, int, int]]:
     Returns:
         List of RGB colors (6-8 colors)
     """
-    return EMOJI_PALETTES.get(name, EMOJI_PALETTES['simple'])
\ No newline at end of file
+    return EMOJI_PALETTES.get(name, EMOJI_PALETTES['simple'])
+
+# Array forms: colors are (..., 3) arrays of 0-255 RGB - a list of colors,
+# an (H, W, 3) image, or a PIL image (returned as a PIL image). Results
+# match the one-color functions above exactly.
+
+def _color_array(colors) -> np.ndarray:
+    if isinstance(colors, Image.Image):
+        colors = colors.convert('RGB')
+    colors = np.asarray(colors, dtype=np.float64)
+    if colors.shape[-1:] != (3,):
+        raise ValueError(f"Colors must have shape (..., 3), got {colors.shape}")
+    return colors
+
+
+def _color_result(values: np.ndarray, like):
+    """Truncate to 0-255 uint8 like int(); back to a PIL image if that came in."""
+    values = np.clip(np.trunc(values), 0, 255).astype(np.uint8)
+    return Image.fromarray(values, 'RGB') if isinstance(like, Image.Image) else values
+
+
+def rgb_to_hsv_array(colors) -> np.ndarray:
+    """
+    Convert RGB colors to HSV (same as colorsys.rgb_to_hsv per color).
+
+    Args:
+        colors: (..., 3) RGB 0-255 array or PIL image
+
+    Returns:
+        (..., 3) float array of hue, saturation, value, each 0-1
+    """
+    rgb = _color_array(colors) / 255.0
+    r, g, b = rgb[..., 0], rgb[..., 1], rgb[..., 2]
+    maxc, minc = rgb.max(axis=-1), rgb.min(axis=-1)
+    rangec = maxc - minc
+    gray = rangec == 0
+    safe_range = np.where(gray, 1.0, rangec)
+
+    s = np.where(gray, 0.0, rangec / np.where(maxc == 0, 1.0, maxc))
+    rc, gc, bc = (maxc - r) / safe_range, (maxc - g) / safe_range, (maxc - b) / safe_range
+    h = np.where(r == maxc, bc - gc, np.where(g == maxc, 2.0 + rc - bc, 4.0 + gc - rc))
+    h = np.where(gray, 0.0, (h / 6.0) % 1.0)
+    return np.stack([h, s, maxc], axis=-1)
+
+
+def hsv_to_rgb_array(hsv: np.ndarray) -> np.ndarray:
+    """
+    Convert HSV colors to RGB (same as colorsys.hsv_to_rgb per color).
+
+    Args:
+        hsv: (..., 3) array of hue, saturation, value, each 0-1
+
+    Returns:
+        (..., 3) float array of RGB 0-255 (not rounded)
+    """
+    hsv = np.asarray(hsv, dtype=np.float64)
+    h, s, v = hsv[..., 0], hsv[..., 1], hsv[..., 2]
+    i = np.floor(h * 6.0)
+    f = h * 6.0 - i
+    p, q, t = v * (1.0 - s), v * (1.0 - s * f), v * (1.0 - s * (1.0 - f))
+    sector = (i.astype(np.int64) % 6)[..., None]
+
+    choices = [np.stack(channels, axis=-1) for channels in
+               ((v, t, p), (q, v, p), (p, v, t), (p, q, v), (t, p, v), (v, p, q))]
+    rgb = np.select([sector == k for k in range(6)], choices)
+    rgb = np.where((s == 0.0)[..., None], v[..., None], rgb)
+    return rgb * 255.0
+
+
+def rgb_to_hsl_array(colors) -> np.ndarray:
+    """
+    Convert RGB colors to HSL (colorsys.rgb_to_hls per color, in h, s, l order).
+
+    Args:
+        colors: (..., 3) RGB 0-255 array or PIL image
+
+    Returns:
+        (..., 3) float array of hue, saturation, lightness, each 0-1
+    """
+    rgb = _color_array(colors) / 255.0
+    r, g, b = rgb[..., 0], rgb[..., 1], rgb[..., 2]
+    maxc, minc = rgb.max(axis=-1), rgb.min(axis=-1)
+    sumc, rangec = maxc + minc, maxc - minc
+    lightness = sumc / 2.0
+    gray = rangec == 0
+    safe_range = np.where(gray, 1.0, rangec)
+
+    denominator = np.where(lightness <= 0.5, sumc, 2.0 - sumc)
+    s = np.where(gray, 0.0, rangec / np.where(denominator == 0, 1.0, denominator))
+    rc, gc, bc = (maxc - r) / safe_range, (maxc - g) / safe_range, (maxc - b) / safe_range
+    h = np.where(r == maxc, bc - gc, np.where(g == maxc, 2.0 + rc - bc, 4.0 + gc - rc))
+    h = np.where(gray, 0.0, (h / 6.0) % 1.0)
+    return np.stack([h, s, lightness], axis=-1)
+
+
+def hsl_to_rgb_array(hsl: np.ndarray) -> np.ndarray:
+    """
+    Convert HSL colors to RGB (colorsys.hls_to_rgb per color, in h, s, l order).
+
+    Args:
+        hsl: (..., 3) array of hue, saturation, lightness, each 0-1
+
+    Returns:
+        (..., 3) float array of RGB 0-255 (not rounded)
+    """
+    hsl = np.asarray(hsl, dtype=np.float64)
+    h, s, lightness = hsl[..., 0], hsl[..., 1], hsl[..., 2]
+    m2 = np.where(lightness <= 0.5, lightness * (1.0 + s), lightness + s - lightness * s)
+    m1 = 2.0 * lightness - m2
+
+    def channel(hue):
+        hue = hue % 1.0
+        return np.select([hue < 1 / 6, hue < 0.5, hue < 2 / 3],
+                         [m1 + (m2 - m1) * hue * 6.0, m2, m1 + (m2 - m1) * (2 / 3 - hue) * 6.0], m1)
+
+    rgb = np.stack([channel(h + 1 / 3), channel(h), channel(h - 1 / 3)], axis=-1)
+    rgb = np.where((s == 0.0)[..., None], lightness[..., None], rgb)
+    return rgb * 255.0
+
+
+def rotate_hue(colors, degrees: float | np.ndarray):
+    """
+    Rotate the hue of many colors (or every pixel of an image).
+
+    Args:
+        colors: (..., 3) RGB 0-255 array or PIL image
+        degrees: Rotation, or an array broadcasting against the colors'
+                 leading dimensions (e.g. one angle per color)
+
+    Returns:
+        uint8 array (or PIL image) of rotated colors
+    """
+    hsv = rgb_to_hsv_array(colors)
+    hsv[..., 0] = (hsv[..., 0] + np.asarray(degrees, dtype=np.float64) / 360.0) % 1.0
+    return _color_result(hsv_to_rgb_array(hsv), colors)
+
+
+def complementary_color_array(colors):
+    """Array form of get_complementary_color()."""
+    return rotate_hue(colors, 180.0)
+
+
+def lighten_color_array(colors, amount: float | np.ndarray = 0.3):
+    """
+    Array form of lighten_color().
+
+    Args:
+        colors: (..., 3) RGB 0-255 array or PIL image
+        amount: Amount to lighten (0.0-1.0), or an array of amounts per color
+
+    Returns:
+        uint8 array (or PIL image) of lightened colors
+    """
+    rgb = _color_array(colors)
+    amount = np.asarray(amount, dtype=np.float64)[..., None] if np.ndim(amount) else amount
+    return _color_result(rgb + (255 - rgb) * amount, colors)
+
+
+def darken_color_array(colors, amount: float | np.ndarray = 0.3):
+    """
+    Array form of darken_color().
+
+    Args:
+        colors: (..., 3) RGB 0-255 array or PIL image
+        amount: Amount to darken (0.0-1.0), or an array of amounts per color
+
+    Returns:
+        uint8 array (or PIL image) of darkened colors
+    """
+    rgb = _color_array(colors)
+    amount = np.asarray(amount, dtype=np.float64)[..., None] if np.ndim(amount) else amount
+    return _color_result(rgb * (1 - amount), colors)
+
+
+def blend_colors_array(colors1, colors2, ratio: float | np.ndarray = 0.5):
+    """
+    Array form of blend_colors().
+
+    Args:
+        colors1: (..., 3) RGB 0-255 array or PIL image (or one color)
+        colors2: Colors to blend towards, broadcasting against colors1
+        ratio: 0.0 = all colors1, 1.0 = all colors2; or an array of ratios
+               per color (e.g. per frame or per particle)
+
+    Returns:
+        uint8 array (or PIL image) of blended colors
+    """
+    rgb1, rgb2 = _color_array(colors1), _color_array(colors2)
+    ratio = np.asarray(ratio, dtype=np.float64)[..., None] if np.ndim(ratio) else ratio
+    like = colors1 if isinstance(colors1, Image.Image) else colors2
+    return _color_result(rgb1 * (1 - ratio) + rgb2 * ratio, like)
+
+
+def gradient_colors_array(start_color: tuple[int, int, int], end_color: tuple[int, int, int],
+                          steps: int) -> np.ndarray:
+    """
+    Array form of create_gradient_colors().
+
+    Returns:
+        (steps, 3) uint8 array
+    """
+    ratios = np.arange(steps) / (steps - 1) if steps > 1 else np.zeros(steps)
+    return blend_colors_array(start_color, end_color, ratios)
+
+
+def blend_colors_fixed(colors1, colors2, weight: int | np.ndarray = 128) -> np.ndarray:
+    """
+    Blend uint8 colors with integer fixed-point math.
+
+    Computes (c1 * (256 - w) + c2 * w + 128) >> 8 in integers: no floats,
+    and rounded rather than truncated, so results can differ by 1 from
+    blend_colors(). Use it for whole frames or alpha masks where speed
+    matters more than matching the float blend.
+
+    Args:
+        colors1: (..., 3) uint8 array
+        colors2: uint8 colors broadcasting against colors1
+        weight: 0 (all colors1) to 256 (all colors2); an int or an array
+                broadcasting against the colors' leading dimensions (e.g. an
+                (H, W) mask scaled to 0-256)
+
+    Returns:
+        uint8 array of blended colors
+    """
+    c1 = np.asarray(colors1, dtype=np.uint16)
+    c2 = np.asarray(colors2, dtype=np.uint16)
+    weight = np.asarray(weight, dtype=np.uint16)
+    if weight.ndim:
+        weight = weight[..., None]
+    if np.any(weight > 256):
+        raise ValueError("weight must be between 0 and 256")
+    # Max 255 * 256 + 128 fits in uint16 (65408)
+    return ((c1 * (256 - weight) + c2 * weight + 128) >> 8).astype(np.uint8)
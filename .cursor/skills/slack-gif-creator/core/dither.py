@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Ordered Dithering - Threshold-matrix dithering in one vectorized step.
+
+Floyd-Steinberg error diffusion (PIL's dither=1) walks the image pixel by
+pixel, and a tiny change anywhere in a frame reshuffles the noise
+everywhere after it - consecutive frames of a gradient differ all over,
+which defeats LZW compression and duplicate-frame removal. Ordered
+dithering adds a fixed, tiled threshold pattern to every pixel before
+mapping it to the palette: it is one array operation, and a pixel that
+doesn't change between frames gets the same palette entry every frame.
+
+    matrix = threshold_matrix('bayer')                     # 8x8, values in [-0.5, 0.5)
+    noisy = apply_threshold(frame, matrix, spread=palette_spread(palette), palette=palette)
+    # then map noisy to the palette with any nearest-color mapper
+
+'bayer' is the classic recursive 8x8 pattern (visible cross-hatch, best
+compression). 'blue_noise' is a 64x64 pattern without low-frequency
+structure: it looks like fine grain instead of a grid.
+"""
+
+import math
+from functools import lru_cache
+from typing import Optional
+
+import numpy as np
+
+
+ORDERED_DITHERS = ('bayer', 'blue_noise')
+
+BAYER_SIZE = 8
+BLUE_NOISE_SIZE = 64
+
+# When the pattern moves between frames, its offset steps through the tile's
+# cells by about this fraction of their number: every offset is visited
+# once per cycle, and consecutive frames land far apart
+_GOLDEN_FRACTION = 0.6180339887
+
+
+@lru_cache(maxsize=8)
+def bayer_matrix(size: int = BAYER_SIZE) -> np.ndarray:
+    """
+    Bayer threshold matrix.
+
+    Args:
+        size: Side length, a power of 2
+
+    Returns:
+        Read-only (size, size) float32 array of thresholds in [-0.5, 0.5)
+    """
+    if size < 1 or size & (size - 1):
+        raise ValueError(f"Bayer matrix size must be a power of 2, got {size}")
+    matrix = np.zeros((1, 1), dtype=np.int64)
+    while len(matrix) < size:
+        matrix = np.block([[4 * matrix, 4 * matrix + 2], [4 * matrix + 3, 4 * matrix + 1]])
+    thresholds = ((matrix + 0.5) / matrix.size - 0.5).astype(np.float32)
+    thresholds.flags.writeable = False
+    return thresholds
+
+
+@lru_cache(maxsize=8)
+def blue_noise_matrix(size: int = BLUE_NOISE_SIZE, seed: int = 0) -> np.ndarray:
+    """
+    Blue-noise threshold matrix: white noise with its low frequencies
+    filtered out, then ranked so every threshold level appears equally
+    often. Tiles seamlessly (the filtering wraps around).
+
+    Args:
+        size: Side length
+        seed: Noise seed (the pattern is reproducible)
+
+    Returns:
+        Read-only (size, size) float32 array of thresholds in [-0.5, 0.5)
+    """
+    noise = np.random.default_rng(seed).random((size, size))
+    fy, fx = np.meshgrid(np.fft.fftfreq(size), np.fft.fftfreq(size), indexing='ij')
+    radius = np.sqrt(fx * fx + fy * fy)
+    # Smooth high-pass: suppress everything below about a quarter of Nyquist
+    highpass = 1 - np.exp(-(radius / 0.12) ** 2)
+    filtered = np.real(np.fft.ifft2(np.fft.fft2(noise) * highpass))
+
+    ranks = np.empty(filtered.size, dtype=np.float64)
+    ranks[np.argsort(filtered, axis=None)] = np.arange(filtered.size)
+    thresholds = ((ranks + 0.5) / filtered.size - 0.5).reshape(size, size).astype(np.float32)
+    thresholds.flags.writeable = False
+    return thresholds
+
+
+@lru_cache(maxsize=16)
+def _cell_step(cells: int) -> int:
+    """Step co-prime with cells near its golden section: i * step % cells visits every cell."""
+    step = max(1, round(cells * _GOLDEN_FRACTION))
+    while math.gcd(step, cells) != 1:
+        step += 1
+    return step
+
+
+def frame_offset(frame_index: int, shape: tuple[int, int]) -> tuple[int, int]:
+    """
+    Pattern offset for a frame when the pattern moves between frames.
+
+    Offsets cycle through every cell of the tile, once per height * width frames.
+
+    Args:
+        frame_index: Frame number
+        shape: Threshold matrix shape (height, width)
+
+    Returns:
+        (dy, dx) roll offset
+    """
+    cells = shape[0] * shape[1]
+    return divmod(frame_index * _cell_step(cells) % cells, shape[1])
+
+
+def threshold_matrix(kind: str) -> np.ndarray:
+    """
+    Threshold matrix for an ordered dither.
+
+    Args:
+        kind: 'bayer' or 'blue_noise'
+
+    Returns:
+        Read-only square float32 array of thresholds in [-0.5, 0.5)
+    """
+    if kind == 'bayer':
+        return bayer_matrix()
+    if kind == 'blue_noise':
+        return blue_noise_matrix()
+    raise ValueError(f"Unknown ordered dither: {kind}. Use one of {', '.join(ORDERED_DITHERS)}")
+
+
+def palette_spread(palette: np.ndarray) -> float:
+    """
+    Dither amplitude for a palette: the median distance from each entry to
+    its nearest neighbour, i.e. the typical step between palette colors.
+
+    Args:
+        palette: (K, 3) RGB palette
+
+    Returns:
+        Amplitude in RGB units (0 for a one-color palette)
+    """
+    # Padded palettes repeat entries; a repeat isn't a step
+    palette = np.unique(np.asarray(palette, dtype=np.float64).reshape(-1, 3), axis=0)
+    if len(palette) < 2:
+        return 0.0
+    distances = np.sqrt(((palette[:, None, :] - palette[None, :, :]) ** 2).sum(axis=2))
+    np.fill_diagonal(distances, np.inf)
+    return float(np.median(distances.min(axis=1)))
+
+
+def _pack(colors: np.ndarray) -> np.ndarray:
+    """Pack uint8 RGB triples into single integers."""
+    colors = colors.astype(np.uint32)
+    return (colors[..., 0] << 16) | (colors[..., 1] << 8) | colors[..., 2]
+
+
+def apply_threshold(frame: np.ndarray, matrix: np.ndarray, spread: float,
+                    frame_index: Optional[int] = None,
+                    palette: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Add a tiled threshold pattern to a frame, ready for nearest-color mapping.
+
+    Args:
+        frame: (H, W, 3) uint8 RGB array
+        matrix: Threshold matrix from threshold_matrix()
+        spread: Pattern amplitude in RGB units (see palette_spread())
+        frame_index: None to use the same pattern on every frame (temporally
+                     stable: static areas stay identical between frames), or
+                     the frame's index to shift the pattern each frame
+        palette: (K, 3) RGB palette the frame will be mapped to; pixels that
+                 already are one of its colors are left as they are (flat
+                 artwork isn't speckled)
+
+    Returns:
+        (H, W, 3) uint8 RGB array
+    """
+    height, width = frame.shape[:2]
+    if frame_index is not None:
+        matrix = np.roll(matrix, frame_offset(frame_index, matrix.shape), axis=(0, 1))
+    reps = (-(-height // matrix.shape[0]), -(-width // matrix.shape[1]))
+    pattern = np.tile(matrix, reps)[:height, :width, None] * np.float32(spread)
+    dithered = np.clip(frame + pattern, 0, 255).astype(np.uint8)
+    if palette is None:
+        return dithered
+
+    keys = np.unique(_pack(np.asarray(palette, dtype=np.uint8).reshape(-1, 3)))
+    packed = _pack(frame)
+    position = np.minimum(np.searchsorted(keys, packed), len(keys) - 1)
+    exact = keys[position] == packed
+    dithered[exact] = frame[exact]
+    return dithered
@@ -6,10 +6,43 @@ Provides functions for drawing shapes, text, emojis, and compositing elements
 together to create animation frames.
 """
 
+from functools import lru_cache
 from PIL import Image, ImageDraw, ImageFont
 import numpy as np
 from typing import Optional
 
+from core.typography import load_override_font
+
+
+@lru_cache(maxsize=None)
+def get_emoji_font(size: int, emoji: bool = True) -> ImageFont.ImageFont:
+    """
+    Get the emoji (or plain text) font at a size, loaded once per process.
+
+    Args:
+        size: Font size in pixels
+        emoji: Try the color emoji font before the text font
+
+    Returns:
+        ImageFont object
+    """
+    override = load_override_font(size)
+    if override is not None:
+        return override
+
+    font_paths = ["/System/Library/Fonts/Helvetica.ttc"]
+    if emoji:
+        # Use Apple Color Emoji font on macOS
+        font_paths.insert(0, "/System/Library/Fonts/Apple Color Emoji.ttc")
+
+    for font_path in font_paths:
+        try:
+            return ImageFont.truetype(font_path, size)
+        except (OSError, ValueError):
+            continue
+
+    return ImageFont.load_default()
+
 
 def create_blank_frame(width: int, height: int, color: tuple[int, int, int] = (255, 255, 255)) -> Image.Image:
     """
@@ -113,11 +146,7 @@ def draw_text(frame: Image.Image, text: str, position: tuple[int, int],
     """
     draw = ImageDraw.Draw(frame)
 
-    # Try to use default font, fall back to basic if not available
-    try:
-        font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", font_size)
-    except:
-        font = ImageFont.load_default()
+    font = get_emoji_font(font_size, emoji=False)
 
     if centered:
         bbox = draw.textbbox((0, 0), text, font=font)
@@ -146,12 +175,7 @@ def draw_emoji(frame: Image.Image, emoji: str, position: tuple[int, int], size:
     """
     draw = ImageDraw.Draw(frame)
 
-    # Use Apple Color Emoji font on macOS
-    try:
-        font = ImageFont.truetype("/System/Library/Fonts/Apple Color Emoji.ttc", size)
-    except:
-        # Fallback to text-based emoji
-        font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", size)
+    font = get_emoji_font(size)
 
     draw.text(position, emoji, font=font, embedded_color=True)
     return frame
@@ -187,6 +211,71 @@ def composite_layers(base: Image.Image, overlay: Image.Image,
     return base_rgba.convert('RGB')
 
 
+def create_color_key_mask(image: Image.Image, key_color: tuple[int, int, int],
+                          tolerance: int = 0, feather: int = 0) -> np.ndarray:
+    """
+    Build an alpha mask that is transparent wherever the image matches a key color.
+
+    The distance to the key color is the largest per-channel difference, so a
+    tolerance of 0 only keys out exact matches.
+
+    Args:
+        image: PIL Image (RGB or RGBA)
+        key_color: RGB color to make transparent
+        tolerance: Max channel difference still treated as the key color
+        feather: Width of the alpha ramp beyond the tolerance (0 = hard edge)
+
+    Returns:
+        uint8 array of shape (height, width) with alpha values 0-255
+    """
+    rgb = np.asarray(image.convert('RGB'), dtype=np.int16)
+    distance = np.abs(rgb - np.array(key_color, dtype=np.int16)).max(axis=-1)
+
+    if feather <= 0:
+        return np.where(distance > tolerance, 255, 0).astype(np.uint8)
+
+    ramp = (distance - tolerance) * (255.0 / feather)
+    return np.clip(ramp, 0, 255).astype(np.uint8)
+
+
+def apply_color_key(image: Image.Image, key_color: tuple[int, int, int],
+                    tolerance: int = 0, feather: int = 0,
+                    recover_edges: bool = True) -> Image.Image:
+    """
+    Make a solid background color transparent (chroma key).
+
+    Use this after drawing onto a canvas filled with the background color to
+    get a layer that can be rotated, scaled and composited.
+
+    Args:
+        image: PIL Image drawn on a key_color background
+        key_color: RGB background color to remove
+        tolerance: Max channel difference still treated as the key color
+        feather: Width of the alpha ramp beyond the tolerance (0 = hard edge)
+        recover_edges: Remove the key color blended into anti-aliased edge
+            pixels, so edges don't carry a halo onto other backgrounds
+
+    Returns:
+        RGBA image with the key color transparent
+    """
+    alpha = create_color_key_mask(image, key_color, tolerance, feather)
+    rgb = np.asarray(image.convert('RGB'), dtype=np.float32)
+    key = np.array(key_color, dtype=np.float32)
+
+    if recover_edges and feather > 0:
+        # Un-mix the key color from partially transparent pixels:
+        # pixel = a * color + (1 - a) * key  =>  color = key + (pixel - key) / a
+        partial = (alpha > 0) & (alpha < 255)
+        a = alpha[partial, None].astype(np.float32) / 255
+        rgb[partial] = np.clip(key + (rgb[partial] - key) / a, 0, 255)
+
+    # Fully transparent pixels take the key color so resampling blends toward it
+    rgb[alpha == 0] = key
+
+    rgba = np.dstack([rgb.astype(np.uint8), alpha])
+    return Image.fromarray(rgba)
+
+
 def draw_stick_figure(frame: Image.Image, position: tuple[int, int], scale: float = 1.0,
                       color: tuple[int, int, int] = (0, 0, 0), line_width: int = 3) -> Image.Image:
     """
@@ -289,15 +378,7 @@ def draw_emoji_enhanced(frame: Image.Image, emoji: str, position: tuple[int, int
     # Ensure minimum size to avoid font rendering errors
     size = max(12, size)
 
-    # Use Apple Color Emoji font on macOS
-    try:
-        font = ImageFont.truetype("/System/Library/Fonts/Apple Color Emoji.ttc", size)
-    except:
-        # Fallback to text-based emoji
-        try:
-            font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", size)
-        except:
-            font = ImageFont.load_default()
+    font = get_emoji_font(size)
 
     # Draw shadow first if enabled
     if shadow and size >= 20:  # Only draw shadow for larger emojis
@@ -6,13 +6,128 @@ This module provides the main interface for creating GIFs from programmatically
 generated frames, with automatic optimization for Slack's requirements.
 """
 
+import contextlib
+import io
+import os
+import shutil
+import tempfile
 from pathlib import Path
-from typing import Optional
-import imageio.v3 as imageio
+from typing import BinaryIO, Callable, Optional
 from PIL import Image
 import numpy as np
 
 
+SUPPORTED_FORMATS = ('gif', 'webp', 'apng', 'mp4', 'webm')
+
+# GIF color quantizers: PIL's median cut in RGB, or k-means in OKLab (core.quantize)
+QUANTIZERS = ('median_cut', 'oklab')
+
+# Dithering: PIL's Floyd-Steinberg error diffusion, ordered dithering with a
+# threshold matrix (core.dither), or none
+DITHER_MODES = ('floyd_steinberg', 'bayer', 'blue_noise', 'none')
+
+# Dither modes PIL's quantize() handles itself -> its dither flag
+DITHER_FLAGS = {'floyd_steinberg': 1, 'none': 0}
+
+# quantizer -> dither used when none is given
+DEFAULT_DITHER = {'median_cut': 'floyd_steinberg', 'oklab': 'none'}
+
+FORMAT_EXTENSIONS = {
+    '.gif': 'gif',
+    '.webp': 'webp',
+    '.png': 'apng',
+    '.apng': 'apng',
+    '.mp4': 'mp4',
+    '.webm': 'webm',
+}
+
+# format -> (ffmpeg codec, CRF at quality 100, CRF at quality 0)
+VIDEO_CODECS = {
+    'mp4': ('libx264', 18, 51),
+    'webm': ('libvpx-vp9', 15, 63),
+}
+
+# Abort after the projection step only when the projected size is this far over
+# the limit; closer calls are settled exactly by the byte counter while writing
+PROJECTION_TOLERANCE = 1.2
+
+
+def _imageio():
+    """Import imageio on first encode - it is the slowest import in the toolkit."""
+    import imageio.v3 as imageio
+    return imageio
+
+
+class GIFSizeLimitExceeded(ValueError):
+    """Raised when a GIF is (or is projected to be) over its size limit."""
+
+    def __init__(self, size_kb: float, limit_kb: float, stage: str, frames_encoded: Optional[int] = None):
+        self.size_kb = size_kb
+        self.limit_kb = limit_kb
+        self.stage = stage  # 'projection' or 'encoding'
+        self.frames_encoded = frames_encoded
+        if stage == 'projection':
+            message = (f"GIF is projected to be {size_kb:.1f} KB, over the {limit_kb:.0f} KB limit "
+                       f"(projected from {frames_encoded} frames)")
+        else:
+            message = f"GIF passed the {limit_kb:.0f} KB limit while encoding"
+        super().__init__(message)
+
+
+class _CountingWriter:
+    """File wrapper that counts bytes written and optionally raises once over a limit."""
+
+    def __init__(self, fp, limit_bytes: Optional[int] = None):
+        self.fp = fp
+        self.limit_bytes = limit_bytes
+        self.bytes_written = 0
+        self.exceeded = False
+
+    def write(self, data) -> int:
+        if self.exceeded:
+            # Encoder cleanup after the abort (e.g. the trailer) - discard it
+            return len(data)
+        self.bytes_written += memoryview(data).nbytes
+        if self.limit_bytes is not None and self.bytes_written > self.limit_bytes:
+            self.exceeded = True
+            raise GIFSizeLimitExceeded(self.bytes_written / 1024, self.limit_bytes / 1024, 'encoding')
+        return self.fp.write(data)
+
+    def flush(self):
+        if not self.fp.closed:
+            self.fp.flush()
+
+    def fileno(self):
+        # Without a file descriptor, PIL routes image data through write()
+        raise io.UnsupportedOperation('fileno')
+
+    def __getattr__(self, name):
+        return getattr(self.fp, name)
+
+
+def _check_quantizer(quantizer: str):
+    if quantizer not in QUANTIZERS:
+        raise ValueError(f"Unknown quantizer: {quantizer}. Use one of {', '.join(QUANTIZERS)}")
+
+
+def _check_dither(dither: Optional[str]):
+    if dither is not None and dither not in DITHER_MODES:
+        raise ValueError(f"Unknown dither: {dither}. Use one of {', '.join(DITHER_MODES)}")
+
+
+def _resolve_format(output, format: Optional[str]) -> str:
+    """Pick the output format: explicit, else from the file extension, else GIF."""
+    if format is None:
+        if isinstance(output, (str, Path)):
+            return FORMAT_EXTENSIONS.get(Path(output).suffix.lower(), 'gif')
+        return 'gif'
+
+    format = format.lower()
+    if format not in SUPPORTED_FORMATS:
+        raise ValueError(f"Unknown format: {format}. Use one of {', '.join(SUPPORTED_FORMATS)}")
+    return format
+
+
 class GIFBuilder:
     """Builder for creating optimized GIFs from frames."""
 
@@ -29,86 +144,175 @@ class GIFBuilder:
         self.height = height
         self.fps = fps
         self.frames: list[np.ndarray] = []
-
-    def add_frame(self, frame: np.ndarray | Image.Image):
+        # Per frame: rectangles that changed since the previous frame (None = unknown)
+        self.dirty_rects: list[Optional[list[tuple[int, int, int, int]]]] = []
+        # (K, 3) palette shared by every frame when all were added as 'P' images
+        # with the same palette (e.g. palette_render.IndexedCanvas); GIFs are
+        # then encoded with exactly these colors instead of being quantized
+        self.locked_palette: Optional[np.ndarray] = None
+
+    def add_frame(self, frame: np.ndarray | Image.Image,
+                  dirty_rects: Optional[list[tuple[int, int, int, int]]] = None):
         """
         Add a frame to the GIF.
 
         Args:
-            frame: Frame as numpy array or PIL Image (will be converted to RGB)
+            frame: Frame as numpy array or PIL Image (will be converted to RGB;
+                   'P' images sharing one palette lock the GIF to it)
+            dirty_rects: Rectangles (left, top, right, bottom) that differ from
+                         the previous frame, if known; lets deduplication skip
+                         the unchanged pixels. Defaults to frame.info['dirty_rects']
+                         (set by core.scene.SceneRenderer).
         """
+        palette = None
         if isinstance(frame, Image.Image):
+            if dirty_rects is None:
+                dirty_rects = frame.info.get('dirty_rects')
+            if frame.mode == 'P':
+                palette = np.array(frame.getpalette(), dtype=np.uint8).reshape(-1, 3)
             frame = np.array(frame.convert('RGB'))
 
+        if not self.frames:
+            self.locked_palette = palette
+        elif palette is None or self.locked_palette is None or not np.array_equal(palette, self.locked_palette):
+            self.locked_palette = None
+
         # Ensure frame is correct size
         if frame.shape[:2] != (self.height, self.width):
             pil_frame = Image.fromarray(frame)
             pil_frame = pil_frame.resize((self.width, self.height), Image.Resampling.LANCZOS)
             frame = np.array(pil_frame)
+            dirty_rects = None
 
         self.frames.append(frame)
+        self.dirty_rects.append(dirty_rects)
 
     def add_frames(self, frames: list[np.ndarray | Image.Image]):
         """Add multiple frames at once."""
         for frame in frames:
             self.add_frame(frame)
 
-    def optimize_colors(self, num_colors: int = 128, use_global_palette: bool = True) -> list[np.ndarray]:
+    def _build_global_palette(self, num_colors: int) -> Image.Image:
+        """Build one palette image from a sample of frames."""
+        # Sample frames to build palette
+        sample_size = min(5, len(self.frames))
+        sample_indices = [int(i * len(self.frames) / sample_size) for i in range(sample_size)]
+        sample_frames = [self.frames[i] for i in sample_indices]
+
+        # Combine sample frames into a single image for palette generation
+        # Flatten each frame to get all pixels, then stack them
+        all_pixels = np.vstack([f.reshape(-1, 3) for f in sample_frames])  # (total_pixels, 3)
+
+        # Create a properly-shaped RGB image from the pixel data
+        # We'll make a roughly square image from all the pixels
+        total_pixels = len(all_pixels)
+        width = min(512, int(np.sqrt(total_pixels)))  # Reasonable width, max 512
+        height = (total_pixels + width - 1) // width  # Ceiling division
+
+        # Pad if necessary to fill the rectangle
+        pixels_needed = width * height
+        if pixels_needed > total_pixels:
+            padding = np.zeros((pixels_needed - total_pixels, 3), dtype=np.uint8)
+            all_pixels = np.vstack([all_pixels, padding])
+
+        # Reshape to proper RGB image format (H, W, 3)
+        img_array = all_pixels[:pixels_needed].reshape(height, width, 3).astype(np.uint8)
+        combined_img = Image.fromarray(img_array)
+
+        # Generate global palette
+        return combined_img.quantize(colors=num_colors, method=2)
+
+    def _quantize_frame(self, frame: np.ndarray, num_colors: int,
+                        palette: Optional[Image.Image] = None, dither: str = 'floyd_steinberg',
+                        frame_index: Optional[int] = None) -> np.ndarray:
+        """Quantize one frame, onto a shared palette if given."""
+        pil_frame = Image.fromarray(frame)
+        if palette is None and dither in ('floyd_steinberg', 'none'):
+            quantized = pil_frame.quantize(colors=num_colors, method=2, dither=DITHER_FLAGS[dither])
+            return np.array(quantized.convert('RGB'))
+
+        if palette is None:
+            palette = pil_frame.quantize(colors=num_colors, method=2)
+        if dither not in DITHER_FLAGS:
+            from core.dither import apply_threshold, palette_spread, threshold_matrix
+            colors = np.array(palette.getpalette(), dtype=np.uint8).reshape(-1, 3)
+            pil_frame = Image.fromarray(apply_threshold(frame, threshold_matrix(dither),
+                                                        palette_spread(colors), frame_index, colors))
+        quantized = pil_frame.quantize(palette=palette, dither=DITHER_FLAGS.get(dither, 0))
+        return np.array(quantized.convert('RGB'))
+
+    def _frame_quantizer(self, num_colors: int, quantizer: str, dither: Optional[str],
+                         temporal_stable: bool, use_global_palette: bool = True
+                         ) -> tuple[Callable[[int, np.ndarray], np.ndarray], Optional[np.ndarray]]:
+        """
+        Set up quantization for the current frames.
+
+        Returns:
+            Tuple of (quantize, palette). quantize(index, frame) returns an
+            RGB frame when palette is None, else indices into palette.
+        """
+        dither = dither or DEFAULT_DITHER[quantizer]
+
+        def pattern_offset(i: int) -> Optional[int]:
+            return None if temporal_stable else i
+
+        if quantizer == 'oklab':
+            from core.dither import apply_threshold, palette_spread, threshold_matrix
+            from core.quantize import fit_palette
+
+            def to_indices(fitted, i: int, frame: np.ndarray) -> np.ndarray:
+                if dither == 'floyd_steinberg':
+                    palette_image = Image.new('P', (1, 1))
+                    palette_image.putpalette(fitted.palette.flatten().tolist())
+                    return np.array(Image.fromarray(frame).quantize(palette=palette_image, dither=1))
+                if dither != 'none':
+                    frame = apply_threshold(frame, threshold_matrix(dither), palette_spread(fitted.palette),
+                                            pattern_offset(i), fitted.palette)
+                return fitted.map(frame)
+
+            if not use_global_palette:
+                def quantize(i: int, frame: np.ndarray) -> np.ndarray:
+                    fitted = fit_palette([frame], num_colors)
+                    return fitted.palette[to_indices(fitted, i, frame)]
+                return quantize, None
+
+            fitted = fit_palette(self.frames, num_colors)
+            return (lambda i, frame: to_indices(fitted, i, frame)), fitted.palette
+
+        palette = None
+        if use_global_palette and len(self.frames) > 1:
+            # Create a global palette from all frames
+            palette = self._build_global_palette(num_colors)
+        return (lambda i, frame: self._quantize_frame(frame, num_colors, palette, dither, pattern_offset(i))), None
+
+    def optimize_colors(self, num_colors: int = 128, use_global_palette: bool = True,
+                        quantizer: str = 'median_cut', dither: Optional[str] = None,
+                        temporal_stable: bool = True) -> list[np.ndarray]:
         """
         Reduce colors in all frames using quantization.
 
         Args:
             num_colors: Target number of colors (8-256)
             use_global_palette: Use a single palette for all frames (better compression)
+            quantizer: 'median_cut' (PIL, in RGB) or 'oklab' (k-means in a
+                       perceptual color space: the same look from fewer colors)
+            dither: 'floyd_steinberg', 'bayer', 'blue_noise' or 'none' (default:
+                    floyd_steinberg for median cut, none for OKLab). The ordered
+                    dithers (bayer, blue_noise) are vectorized and keep static
+                    areas identical between frames, so animations compress better.
+            temporal_stable: Use the same ordered-dither pattern on every frame;
+                             False shifts it each frame (smoother-looking
+                             gradients in motion, larger files)
 
         Returns:
             List of color-optimized frames
         """
-        optimized = []
-
-        if use_global_palette and len(self.frames) > 1:
-            # Create a global palette from all frames
-            # Sample frames to build palette
-            sample_size = min(5, len(self.frames))
-            sample_indices = [int(i * len(self.frames) / sample_size) for i in range(sample_size)]
-            sample_frames = [self.frames[i] for i in sample_indices]
-
-            # Combine sample frames into a single image for palette generation
-            # Flatten each frame to get all pixels, then stack them
-            all_pixels = np.vstack([f.reshape(-1, 3) for f in sample_frames])  # (total_pixels, 3)
-
-            # Create a properly-shaped RGB image from the pixel data
-            # We'll make a roughly square image from all the pixels
-            total_pixels = len(all_pixels)
-            width = min(512, int(np.sqrt(total_pixels)))  # Reasonable width, max 512
-            height = (total_pixels + width - 1) // width  # Ceiling division
-
-            # Pad if necessary to fill the rectangle
-            pixels_needed = width * height
-            if pixels_needed > total_pixels:
-                padding = np.zeros((pixels_needed - total_pixels, 3), dtype=np.uint8)
-                all_pixels = np.vstack([all_pixels, padding])
-
-            # Reshape to proper RGB image format (H, W, 3)
-            img_array = all_pixels[:pixels_needed].reshape(height, width, 3).astype(np.uint8)
-            combined_img = Image.fromarray(img_array, mode='RGB')
-
-            # Generate global palette
-            global_palette = combined_img.quantize(colors=num_colors, method=2)
-
-            # Apply global palette to all frames
-            for frame in self.frames:
-                pil_frame = Image.fromarray(frame)
-                quantized = pil_frame.quantize(palette=global_palette, dither=1)
-                optimized.append(np.array(quantized.convert('RGB')))
-        else:
-            # Use per-frame quantization
-            for frame in self.frames:
-                pil_frame = Image.fromarray(frame)
-                quantized = pil_frame.quantize(colors=num_colors, method=2, dither=1)
-                optimized.append(np.array(quantized.convert('RGB')))
-
-        return optimized
+        _check_quantizer(quantizer)
+        _check_dither(dither)
+        quantize, palette = self._frame_quantizer(num_colors, quantizer, dither, temporal_stable,
+                                                  use_global_palette)
+        frames = [quantize(i, frame) for i, frame in enumerate(self.frames)]
+        return frames if palette is None else [palette[indices] for indices in frames]
 
     def deduplicate_frames(self, threshold: float = 0.995) -> int:
         """
@@ -123,48 +327,122 @@ class GIFBuilder:
         if len(self.frames) < 2:
             return 0
 
+        if len(self.dirty_rects) != len(self.frames):
+            self.dirty_rects = [None] * len(self.frames)  # frames was replaced directly
+
         deduplicated = [self.frames[0]]
+        deduplicated_rects = [self.dirty_rects[0]]
         removed_count = 0
+        # Everything that changed since the last kept frame (None = unknown)
+        changed = []
 
         for i in range(1, len(self.frames)):
-            # Compare with previous frame
-            prev_frame = np.array(deduplicated[-1], dtype=np.float32)
-            curr_frame = np.array(self.frames[i], dtype=np.float32)
-
-            # Calculate similarity (normalized)
-            diff = np.abs(prev_frame - curr_frame)
-            similarity = 1.0 - (np.mean(diff) / 255.0)
+            rects = self.dirty_rects[i]
+            changed = None if changed is None or rects is None else changed + rects
+            similarity = self._similarity(deduplicated[-1], self.frames[i], changed)
 
             # Keep frame if sufficiently different
             # High threshold (0.995) means only remove truly identical frames
             if similarity < threshold:
                 deduplicated.append(self.frames[i])
+                deduplicated_rects.append(changed)
+                changed = []
             else:
                 removed_count += 1
 
         self.frames = deduplicated
+        self.dirty_rects = deduplicated_rects
         return removed_count
 
-    def save(self, output_path: str | Path, num_colors: int = 128,
-             optimize_for_emoji: bool = False, remove_duplicates: bool = True) -> dict:
+    def _similarity(self, prev_frame: np.ndarray, curr_frame: np.ndarray,
+                    changed: Optional[list[tuple[int, int, int, int]]]) -> float:
         """
-        Save frames as optimized GIF for Slack.
+        Similarity of two frames: 1 - mean absolute difference / 255.
 
-        Args:
-            output_path: Where to save the GIF
-            num_colors: Number of colors to use (fewer = smaller file)
-            optimize_for_emoji: If True, optimize for <64KB emoji size
-            remove_duplicates: Remove duplicate consecutive frames
+        Only the bounding box of the changed rectangles is compared when they
+        are known (the rest of the difference is zero), so a frame where one
+        small sprite moved costs a small fraction of a full comparison.
+        """
+        total = prev_frame.size
+        if changed is not None:
+            if not changed:
+                return 1.0
+            left = max(0, min(rect[0] for rect in changed))
+            top = max(0, min(rect[1] for rect in changed))
+            right = min(self.width, max(rect[2] for rect in changed))
+            bottom = min(self.height, max(rect[3] for rect in changed))
+            if right <= left or bottom <= top:
+                return 1.0
+            prev_frame = prev_frame[top:bottom, left:right]
+            curr_frame = curr_frame[top:bottom, left:right]
+
+        # Calculate similarity (normalized over the whole frame)
+        diff = np.abs(prev_frame.astype(np.float32) - curr_frame.astype(np.float32))
+        return 1.0 - (float(np.sum(diff)) / total / 255.0)
+
+    def _project_size(self, head_frames: list[np.ndarray], total_frames: int,
+                      frame_duration: float, palette: Optional[np.ndarray] = None) -> int:
+        """
+        Project the encoded size of the whole GIF from its first few frames.
+
+        The head is encoded in memory; the first frame (usually the most
+        expensive, since later frames only store what changed) is counted
+        once and the average of the others is extrapolated to the rest.
+        """
+        from core.gif_inspector import parse_gif
+
+        buffer = io.BytesIO()
+        self._encode(buffer, head_frames, 'gif', frame_duration, 0, palette)
+        gif_info = parse_gif(buffer.getbuffer())
+        frames = gif_info['frames']
+
+        header_bytes = frames[0]['offset']
+        frame_bytes = [frame['end'] - frame['offset'] for frame in frames]
+        later = frame_bytes[1:] or frame_bytes
+        return header_bytes + frame_bytes[0] + int(np.mean(later) * (total_frames - 1)) + 1
+
+    def _size_exceeded(self, error: GIFSizeLimitExceeded, output: Path | BinaryIO,
+                       start: int, on_size_exceeded: str, format: str = 'gif',
+                       written: bool = True) -> dict:
+        """
+        Handle an over-limit GIF: drop the partial output, then raise or report.
+
+        written is False when the limit was hit before the output was opened
+        (at the projection stage): whatever is already there is left alone.
+        """
+        if written and isinstance(output, Path):
+            output.unlink(missing_ok=True)
+        elif written and output.seekable():
+            output.seek(start)
+            output.truncate()
+        print(f"\n✗ Stopped early: {error}")
+
+        if on_size_exceeded == 'raise':
+            raise error
+        return {
+            'path': None,
+            'format': format,
+            'status': 'aborted',
+            'stage': error.stage,
+            'size_kb': error.size_kb,
+            'limit_kb': error.limit_kb,
+            'frames_encoded': error.frames_encoded,
+            'dimensions': f'{self.width}x{self.height}',
+            'frame_count': len(self.frames),
+            'fps': self.fps,
+        }
+
+    def _prepare_frames(self, num_colors: int, optimize_for_emoji: bool,
+                        remove_duplicates: bool) -> int:
+        """
+        Run the format-independent stages: dedup, emoji resize and frame reduction.
 
         Returns:
-            Dictionary with file info (path, size, dimensions, frame_count)
+            num_colors, lowered for emoji
         """
         if not self.frames:
             raise ValueError("No frames to save. Add frames with add_frame() first.")
 
-        output_path = Path(output_path)
-        original_frame_count = len(self.frames)
-
         # Remove duplicate frames to reduce file size
         if remove_duplicates:
             removed = self.deduplicate_frames(threshold=0.98)
@@ -183,7 +461,13 @@ class GIFBuilder:
                     pil_frame = Image.fromarray(frame)
                     pil_frame = pil_frame.resize((128, 128), Image.Resampling.LANCZOS)
                     resized_frames.append(np.array(pil_frame))
+                if self.locked_palette is not None:
+                    # Resampling blends colors; snap them back onto the palette
+                    from core.palette_render import snap_to_palette
+                    resized_frames = [self.locked_palette[snap_to_palette(frame, self.locked_palette)]
+                                      for frame in resized_frames]
                 self.frames = resized_frames
+                self.dirty_rects = [None] * len(self.frames)
             num_colors = min(num_colors, 48)  # More aggressive color limit for emoji
 
             # More aggressive FPS reduction for emoji
@@ -192,44 +476,183 @@ class GIFBuilder:
                 # Keep every nth frame to get close to 12 frames
                 keep_every = max(1, len(self.frames) // 12)
                 self.frames = [self.frames[i] for i in range(0, len(self.frames), keep_every)]
+                self.dirty_rects = [None] * len(self.frames)
+
+        return num_colors
 
-        # Optimize colors with global palette
-        optimized_frames = self.optimize_colors(num_colors, use_global_palette=True)
+    def _quantize_for_gif(self, num_colors: int, size_limit_kb: Optional[float],
+                          projection_frames: int, frame_duration: float,
+                          quantizer: str = 'median_cut', dither: Optional[str] = None,
+                          temporal_stable: bool = True) -> tuple[list[np.ndarray], Optional[np.ndarray]]:
+        """
+        Quantize frames onto a global palette, projecting the size first if limited.
+
+        Returns:
+            Tuple of (frames, palette): RGB frames and None for median cut, or
+            index frames and their (K, 3) palette for OKLab
+        """
+        quantize, gif_palette = self._frame_quantizer(num_colors, quantizer, dither, temporal_stable)
+        optimized_frames = []
+
+        if size_limit_kb is not None and len(self.frames) > projection_frames > 0:
+            # Quantize and encode just the head first, and give up if the
+            # projection is clearly over the limit
+            optimized_frames = [quantize(i, frame) for i, frame in enumerate(self.frames[:projection_frames])]
+            projected_kb = self._project_size(optimized_frames, len(self.frames), frame_duration,
+                                              gif_palette) / 1024
+            if projected_kb > size_limit_kb * PROJECTION_TOLERANCE:
+                raise GIFSizeLimitExceeded(projected_kb, size_limit_kb, 'projection', projection_frames)
+
+        optimized_frames += [quantize(i, self.frames[i]) for i in range(len(optimized_frames), len(self.frames))]
+        return optimized_frames, gif_palette
+
+    def _index_for_gif(self) -> Optional[list[np.ndarray]]:
+        """Frames as indices into the locked palette, or None if any pixel is off it."""
+        from core.palette_render import exact_indices
+
+        indexed = []
+        for frame in self.frames:
+            indices = exact_indices(frame, self.locked_palette)
+            if indices is None:
+                return None
+            indexed.append(indices)
+        return indexed
+
+    def _encode(self, fp, frames: list[np.ndarray], format: str, frame_duration: float, quality: int,
+                palette: Optional[np.ndarray] = None):
+        """Encode frames in one of SUPPORTED_FORMATS to a binary file object.
+
+        With a palette, GIF frames are (H, W) index arrays into it.
+        """
+        if format == 'gif' and palette is not None:
+            images = []
+            for indices in frames:
+                image = Image.fromarray(indices)
+                image.putpalette(palette.flatten().tolist())
+                images.append(image)
+            images[0].save(
+                fp,
+                format='GIF',
+                save_all=True,
+                append_images=images[1:],
+                duration=frame_duration,
+                loop=0
+            )
+        elif format == 'gif':
+            _imageio().imwrite(
+                fp,
+                frames,
+                extension='.gif',
+                duration=frame_duration,
+                loop=0  # Infinite loop
+            )
+        elif format in ('webp', 'apng'):
+            images = [Image.fromarray(frame) for frame in frames]
+            options = {'quality': quality, 'method': 4} if format == 'webp' else {}
+            images[0].save(
+                fp,
+                format='WEBP' if format == 'webp' else 'PNG',
+                save_all=True,
+                append_images=images[1:],
+                duration=int(round(frame_duration)),
+                loop=0,
+                **options
+            )
+        else:
+            # ffmpeg needs a real file to write the video container
+            codec, best_crf, worst_crf = VIDEO_CODECS[format]
+            crf = round(best_crf + (worst_crf - best_crf) * (100 - quality) / 100)
+            fd, tmp_path = tempfile.mkstemp(suffix=f'.{format}')
+            os.close(fd)
+            try:
+                _imageio().imwrite(
+                    tmp_path,
+                    np.stack(frames),
+                    plugin='FFMPEG',
+                    fps=self.fps,
+                    codec=codec,
+                    quality=None,
+                    # Constant quality (-b:v 0 lets VP9 use CRF alone)
+                    output_params=['-crf', str(crf), '-b:v', '0'],
+                    pixelformat='yuv420p',
+                    macro_block_size=2  # yuv420p needs even dimensions
+                )
+                with open(tmp_path, 'rb') as f:
+                    shutil.copyfileobj(f, fp)
+            finally:
+                os.unlink(tmp_path)
+
+    def _write(self, output_path: str | Path | BinaryIO, format: Optional[str], num_colors: int,
+               quality: int, optimize_for_emoji: bool, size_limit_kb: Optional[float],
+               on_size_exceeded: str, projection_frames: int, quantizer: str = 'median_cut',
+               dither: Optional[str] = None, temporal_stable: bool = True) -> dict:
+        """Encode the prepared frames to one output and report on it."""
+        format = _resolve_format(output_path, format)
+        to_file = isinstance(output_path, (str, Path))
+        if to_file:
+            output_path = Path(output_path)
+        start = 0 if to_file or not output_path.seekable() else output_path.tell()
 
         # Calculate frame duration in milliseconds
         frame_duration = 1000 / self.fps
 
-        # Save GIF
-        imageio.imwrite(
-            output_path,
-            optimized_frames,
-            duration=frame_duration,
-            loop=0  # Infinite loop
-        )
+        # Save, counting bytes as frames are written so an over-limit
+        # encode stops as soon as it passes the limit
+        limit_bytes = int(size_limit_kb * 1024) if size_limit_kb is not None else None
+        palette = None
+        written = False
+        try:
+            if format == 'gif' and self.locked_palette is not None:
+                # Frames are already on one palette: index them exactly, no quantization
+                frames = self._index_for_gif()
+                if frames is not None:
+                    palette = self.locked_palette
+                else:
+                    print("  Frames no longer match their locked palette; quantizing instead")
+                    self.locked_palette = None
+            if format == 'gif' and palette is None:
+                # Optimize colors with global palette
+                frames, palette = self._quantize_for_gif(num_colors, size_limit_kb, projection_frames,
+                                                         frame_duration, quantizer, dither, temporal_stable)
+            elif format != 'gif':
+                frames = self.frames
+            if palette is not None:
+                num_colors = len(palette)
+
+            written = True
+            with open(output_path, 'wb') if to_file else contextlib.nullcontext(output_path) as f:
+                writer = _CountingWriter(f, limit_bytes)
+                self._encode(writer, frames, format, frame_duration, quality, palette)
+        except GIFSizeLimitExceeded as error:
+            return self._size_exceeded(error, output_path, start, on_size_exceeded, format, written)
 
         # Get file info
-        file_size_kb = output_path.stat().st_size / 1024
+        file_size_kb = writer.bytes_written / 1024
         file_size_mb = file_size_kb / 1024
 
         info = {
-            'path': str(output_path),
+            'path': str(output_path) if to_file else None,
+            'format': format,
             'size_kb': file_size_kb,
             'size_mb': file_size_mb,
             'dimensions': f'{self.width}x{self.height}',
-            'frame_count': len(optimized_frames),
+            'frame_count': len(frames),
             'fps': self.fps,
-            'duration_seconds': len(optimized_frames) / self.fps,
-            'colors': num_colors
+            'duration_seconds': len(frames) / self.fps,
+            'colors': num_colors if format == 'gif' else None,
+            'status': 'ok'
         }
 
         # Print info
-        print(f"\n✓ GIF created successfully!")
-        print(f"  Path: {output_path}")
+        print(f"\n✓ {format.upper()} created successfully!")
+        if to_file:
+            print(f"  Path: {output_path}")
         print(f"  Size: {file_size_kb:.1f} KB ({file_size_mb:.2f} MB)")
         print(f"  Dimensions: {self.width}x{self.height}")
-        print(f"  Frames: {len(optimized_frames)} @ {self.fps} fps")
+        print(f"  Frames: {len(frames)} @ {self.fps} fps")
         print(f"  Duration: {info['duration_seconds']:.1f}s")
-        print(f"  Colors: {num_colors}")
+        if format == 'gif':
+            print(f"  Colors: {num_colors}" + (" (locked palette)" if self.locked_palette is not None else ""))
 
         # Warnings
         if optimize_for_emoji and file_size_kb > 64:
@@ -241,6 +664,110 @@ class GIFBuilder:
 
         return info
 
+    def save(self, output_path: str | Path | BinaryIO, num_colors: int = 128,
+             optimize_for_emoji: bool = False, remove_duplicates: bool = True,
+             size_limit_kb: Optional[float] = None, on_size_exceeded: str = 'raise',
+             projection_frames: int = 4, format: Optional[str] = None,
+             quality: int = 80, quantizer: str = 'median_cut', dither: Optional[str] = None,
+             temporal_stable: bool = True) -> dict:
+        """
+        Save frames as optimized GIF for Slack (or as WebP, APNG, MP4 or WebM).
+
+        With size_limit_kb set (e.g. validators.SLACK_EMOJI_LIMIT_KB), the
+        first projection_frames frames are encoded in memory to project the
+        final size, and the encode stops as soon as it is clearly going to be
+        over the limit - or, while writing, the moment it is. (The projection
+        is GIF only; videos are checked once ffmpeg has finished.)
+
+        Args:
+            output_path: Where to save the GIF - a path, or a binary file-like
+                         object (e.g. io.BytesIO) to write to without touching disk
+            num_colors: Number of colors to use (fewer = smaller file, GIF only)
+            optimize_for_emoji: If True, optimize for <64KB emoji size
+            remove_duplicates: Remove duplicate consecutive frames
+            size_limit_kb: Stop encoding once the GIF will exceed this size (None = no limit)
+            on_size_exceeded: 'raise' to raise GIFSizeLimitExceeded, 'return' to
+                              return an info dict with status 'aborted'
+            projection_frames: Frames to encode up front for the size projection
+            format: 'gif', 'webp', 'apng', 'mp4' or 'webm' (default: from the
+                    file extension, else 'gif')
+            quality: 0-100 quality for WebP and video (ignored for GIF/APNG)
+            quantizer: GIF color quantizer, 'median_cut' or 'oklab' (see
+                       optimize_colors(); 'oklab' usually needs fewer colors)
+            dither: GIF dithering, 'floyd_steinberg', 'bayer', 'blue_noise' or
+                    'none' (default depends on the quantizer; see optimize_colors())
+            temporal_stable: Same ordered-dither pattern on every frame
+
+        Returns:
+            Dictionary with file info (path, format, size, dimensions, frame_count, status)
+        """
+        if on_size_exceeded not in ('raise', 'return'):
+            raise ValueError(f"on_size_exceeded must be 'raise' or 'return', not {on_size_exceeded!r}")
+        _check_quantizer(quantizer)
+        _check_dither(dither)
+
+        # Check the format before spending time on the frames
+        _resolve_format(output_path, format)
+        num_colors = self._prepare_frames(num_colors, optimize_for_emoji, remove_duplicates)
+        return self._write(output_path, format, num_colors, quality, optimize_for_emoji,
+                           size_limit_kb, on_size_exceeded, projection_frames, quantizer, dither,
+                           temporal_stable)
+
+    def save_many(self, outputs: list, num_colors: int = 128, optimize_for_emoji: bool = False,
+                  remove_duplicates: bool = True, quality: int = 80,
+                  size_limit_kb: Optional[float] = None, on_size_exceeded: str = 'return',
+                  projection_frames: int = 4, quantizer: str = 'median_cut',
+                  dither: Optional[str] = None, temporal_stable: bool = True) -> list[dict]:
+        """
+        Save the same animation in several formats from one pass over the frames.
+
+        Dedup and emoji resizing run once; each output then only pays for
+        its own encode. Over-limit outputs are reported with status
+        'aborted' by default, so one failing format doesn't stop the others.
+
+        Args:
+            outputs: Paths (format from the extension), or (path_or_fileobj, format) tuples
+            num_colors, optimize_for_emoji, remove_duplicates, quality,
+            size_limit_kb, on_size_exceeded, projection_frames, quantizer, dither,
+            temporal_stable: As for save()
+
+        Returns:
+            List of info dicts, one per output, in order
+        """
+        if on_size_exceeded not in ('raise', 'return'):
+            raise ValueError(f"on_size_exceeded must be 'raise' or 'return', not {on_size_exceeded!r}")
+        _check_quantizer(quantizer)
+        _check_dither(dither)
+
+        targets = [output if isinstance(output, tuple) else (output, None) for output in outputs]
+        for output, format in targets:
+            _resolve_format(output, format)
+
+        num_colors = self._prepare_frames(num_colors, optimize_for_emoji, remove_duplicates)
+        return [
+            self._write(output, format, num_colors, quality, optimize_for_emoji,
+                        size_limit_kb, on_size_exceeded, projection_frames, quantizer, dither,
+                        temporal_stable)
+            for output, format in targets
+        ]
+
+    def to_bytes(self, **save_kwargs) -> bytes:
+        """
+        Encode the GIF in memory.
+
+        Args:
+            **save_kwargs: Options for save() (num_colors, optimize_for_emoji, ...)
+
+        Returns:
+            GIF file contents (b'' if a size limit aborted the encode with
+            on_size_exceeded='return')
+        """
+        buffer = io.BytesIO()
+        self.save(buffer, **save_kwargs)
+        return buffer.getvalue()
+
     def clear(self):
         """Clear all frames (useful for creating multiple GIFs)."""
-        self.frames = []
\ No newline at end of file
+        self.frames = []
+        self.dirty_rects = []
+        self.locked_palette = None
\ No newline at end of file
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+GIF Inspector - Read GIF structure without decoding any pixels.
+
+Walks the GIF block structure (header, color tables, extensions, image
+descriptors) and skips over the LZW-compressed image data, so inspecting a
+GIF costs a few microseconds per frame regardless of its dimensions. Use it
+to count frames, read per-frame delays or see where a file's bytes go.
+"""
+
+import mmap
+import struct
+from pathlib import Path
+from typing import BinaryIO, Optional, Union
+
+
+TRAILER = 0x3B
+EXTENSION_INTRODUCER = 0x21
+IMAGE_DESCRIPTOR = 0x2C
+GRAPHIC_CONTROL_LABEL = 0xF9
+APPLICATION_LABEL = 0xFF
+
+# A GIF on disk (path) or in memory (bytes, a buffer, or a BytesIO)
+GIFSource = Union[str, Path, bytes, bytearray, memoryview, BinaryIO]
+
+
+def as_gif_buffer(source: GIFSource) -> Optional[memoryview]:
+    """
+    Get a byte view of an in-memory GIF without copying it.
+
+    Args:
+        source: bytes, bytearray, memoryview, or an object with getbuffer()
+                (io.BytesIO); paths return None
+
+    Returns:
+        memoryview of unsigned bytes, or None if source is a path
+    """
+    if isinstance(source, (str, Path)):
+        return None
+    if hasattr(source, 'getbuffer'):
+        source = source.getbuffer()
+    return memoryview(source).cast('B')
+
+
+def _skip_sub_blocks(data, offset: int) -> tuple[int, int]:
+    """
+    Skip a chain of data sub-blocks.
+
+    Returns:
+        Tuple of (offset after the block terminator, payload bytes skipped)
+    """
+    payload = 0
+    while True:
+        block_size = data[offset]
+        offset += 1
+        if block_size == 0:
+            return offset, payload
+        payload += block_size
+        offset += block_size
+
+
+def _color_table_size(packed: int) -> int:
+    """Number of colors in a color table flagged in a packed field (0 if absent)."""
+    if not packed & 0x80:
+        return 0
+    return 2 ** ((packed & 0x07) + 1)
+
+
+def parse_gif(data) -> dict:
+    """
+    Parse the block structure of a GIF held in memory.
+
+    Args:
+        data: bytes, bytearray, memoryview or mmap of the whole file
+
+    Returns:
+        Dictionary with width, height, version, global_palette_size,
+        background_index, loop_count (None if no NETSCAPE block, 0 = forever),
+        frame_count, duration_ms, truncated, and 'frames' - one dict per frame
+        with index, left, top, width, height, delay_ms, disposal,
+        transparent_index, local_palette_size, interlaced, offset, end and
+        compressed_bytes (LZW payload, without sub-block length bytes)
+    """
+    size = len(data)
+    if size < 13 or bytes(data[:3]) != b'GIF':
+        raise ValueError("Not a GIF file")
+
+    width, height, packed, background_index = struct.unpack_from('<HHBB', data, 6)
+    global_palette_size = _color_table_size(packed)
+    offset = 13 + 3 * global_palette_size
+
+    info = {
+        'version': bytes(data[3:6]).decode('ascii', 'replace'),
+        'width': width,
+        'height': height,
+        'global_palette_size': global_palette_size,
+        'background_index': background_index,
+        'loop_count': None,
+        'truncated': False,
+    }
+    frames = []
+
+    # Graphic Control Extension applies to the next image only
+    pending_control = None
+    frame_start = None
+
+    try:
+        while True:
+            block_start = offset
+            introducer = data[offset]
+            offset += 1
+
+            if introducer == TRAILER:
+                break
+
+            if introducer == EXTENSION_INTRODUCER:
+                label = data[offset]
+                offset += 1
+                if frame_start is None:
+                    frame_start = block_start
+
+                if label == GRAPHIC_CONTROL_LABEL and data[offset] >= 4:
+                    control, delay, transparent = struct.unpack_from('<BHB', data, offset + 1)
+                    pending_control = {
+                        'delay_ms': delay * 10,
+                        'disposal': (control >> 2) & 0x07,
+                        'transparent_index': transparent if control & 0x01 else None,
+                    }
+                elif label == APPLICATION_LABEL and data[offset] == 11 \
+                        and bytes(data[offset + 1:offset + 12]) in (b'NETSCAPE2.0', b'ANIMEXTS1.0'):
+                    loop_block = offset + 12
+                    if data[loop_block] >= 3 and data[loop_block + 1] == 1:
+                        info['loop_count'] = struct.unpack_from('<H', data, loop_block + 2)[0]
+
+                offset, _ = _skip_sub_blocks(data, offset)
+
+            elif introducer == IMAGE_DESCRIPTOR:
+                left, top, frame_width, frame_height, packed = struct.unpack_from('<HHHHB', data, offset)
+                offset += 9
+                local_palette_size = _color_table_size(packed)
+                offset += 3 * local_palette_size
+                offset += 1  # LZW minimum code size
+                offset, compressed_bytes = _skip_sub_blocks(data, offset)
+
+                control = pending_control or {'delay_ms': 0, 'disposal': 0, 'transparent_index': None}
+                frames.append({
+                    'index': len(frames),
+                    'left': left,
+                    'top': top,
+                    'width': frame_width,
+                    'height': frame_height,
+                    'local_palette_size': local_palette_size,
+                    'interlaced': bool(packed & 0x40),
+                    **control,
+                    'offset': frame_start if frame_start is not None else block_start,
+                    'end': offset,
+                    'compressed_bytes': compressed_bytes,
+                })
+                pending_control = None
+                frame_start = None
+
+            else:
+                raise ValueError(f"Unknown GIF block 0x{introducer:02x} at byte {block_start}")
+
+    except (IndexError, struct.error):
+        # Ran off the end of the data
+        info['truncated'] = True
+
+    if offset > size:
+        info['truncated'] = True
+
+    info['frames'] = frames
+    info['frame_count'] = len(frames)
+    info['duration_ms'] = sum(frame['delay_ms'] for frame in frames)
+    return info
+
+
+def inspect_gif(source: GIFSource) -> dict:
+    """
+    Inspect a GIF file's structure without decoding pixels.
+
+    Files are memory-mapped, so only the block headers are actually read
+    from disk.
+
+    Args:
+        source: Path to a GIF file, or the GIF in memory (bytes, buffer, BytesIO)
+
+    Returns:
+        Dictionary as from parse_gif(), plus file_size
+    """
+    if isinstance(source, (str, Path)):
+        with open(source, 'rb') as f:
+            try:
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # Empty files can't be mapped
+                data = f.read()
+            try:
+                info = parse_gif(data)
+                info['file_size'] = len(data)
+            finally:
+                if isinstance(data, mmap.mmap):
+                    data.close()
+        return info
+
+    data = as_gif_buffer(source)
+    info = parse_gif(data)
+    info['file_size'] = data.nbytes
+    return info
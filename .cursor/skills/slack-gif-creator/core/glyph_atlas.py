@@ -0,0 +1,517 @@
+#!/usr/bin/env python3
+"""
+Glyph Atlas - Text drawn from pre-rasterized glyphs with NumPy.
+
+Drawing text through PIL runs FreeType over the whole string on every
+call, and an outline multiplies that by the number of offsets (24 calls
+for a 2 px outline). An atlas rasterizes each glyph of a font once into a
+packed coverage texture; text is then built by copying glyph rectangles
+into a mask, which makes per-character animation cheap - every letter can
+move, appear or disappear independently each frame:
+
+    for i in range(num_frames):
+        t = i / (num_frames - 1)
+        frame = create_blank_frame(480, 480, (20, 20, 40))
+        draw_atlas_text(frame, 'HELLO!', (240, 240), font_size=60, centered=True,
+                        outline_color=(0, 0, 0), outline_width=2,
+                        offsets=char_offsets(6, t, effect='wave'),
+                        visible=typewriter_count(6, t))
+
+Atlases are cached per process by (font size, bold) and on disk, so worker
+processes (batch pools, the render server) load them instead of
+rasterizing again. They follow the font override
+(typography.set_font_override()).
+"""
+
+import hashlib
+import io
+import math
+import os
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+
+from core.render_cache import DEFAULT_CACHE_DIR, _atomic_write
+from core.typography import get_font
+
+
+# Bump when the file layout or the rasterization changes
+ATLAS_FORMAT_VERSION = 1
+
+# Printable ASCII; other characters are added to an atlas when first drawn
+DEFAULT_CHARSET = ''.join(chr(code) for code in range(32, 127))
+
+DEFAULT_ATLAS_DIR = Path(os.environ.get('SLACK_GIF_ATLAS_DIR', DEFAULT_CACHE_DIR / 'glyph-atlas'))
+
+TEXT_EFFECTS = ('none', 'wave', 'bounce', 'wiggle')
+
+# Empty pixels around each glyph in the texture
+_PADDING = 1
+
+_atlas_dir: Optional[Path] = DEFAULT_ATLAS_DIR
+
+
+def set_atlas_dir(path: str | Path | None):
+    """
+    Set where atlases are cached on disk.
+
+    Args:
+        path: Directory shared by all processes using the atlases (default:
+              $SLACK_GIF_ATLAS_DIR or ~/.cache/slack-gif-creator/glyph-atlas),
+              or None to keep atlases in memory only
+    """
+    global _atlas_dir
+    _atlas_dir = Path(path) if path is not None else None
+    get_atlas.cache_clear()
+
+
+def _font_id(font: ImageFont.ImageFont) -> str:
+    """Identify a font file (and its version on disk) for the atlas cache key."""
+    path = getattr(font, 'path', None)
+    if isinstance(path, (str, os.PathLike)):
+        try:
+            stat = os.stat(path)
+            return f'{os.fspath(path)}:{stat.st_size}:{int(stat.st_mtime)}'
+        except OSError:
+            return os.fspath(path)
+    if hasattr(font, 'getname'):
+        return ':'.join(str(part) for part in font.getname())
+    return type(font).__name__
+
+
+def _rasterize(font: ImageFont.ImageFont, char: str) -> tuple[np.ndarray, int, int, float]:
+    """One glyph as (coverage, left, top, advance); left/top are relative to the pen."""
+    left, top, right, bottom = (int(v) for v in font.getbbox(char))
+    advance = float(font.getlength(char))
+    if right <= left or bottom <= top:
+        return np.zeros((0, 0), dtype=np.uint8), 0, 0, advance
+    image = Image.new('L', (right - left, bottom - top), 0)
+    ImageDraw.Draw(image).text((-left, -top), char, fill=255, font=font)
+    return np.asarray(image), left, top, advance
+
+
+def _build_texture(font: ImageFont.ImageFont, chars: str) -> tuple[np.ndarray, str, np.ndarray, list[float]]:
+    """Rasterize and pack characters: (texture, chars, boxes, advances) for GlyphAtlas."""
+    glyphs = [_rasterize(font, char) for char in chars]
+    positions, shape = _pack([(coverage.shape[1], coverage.shape[0]) for coverage, *_ in glyphs])
+
+    texture = np.zeros(shape, dtype=np.uint8)
+    boxes = np.zeros((len(chars), 6), dtype=np.int32)
+    for i, ((coverage, left, top, _), (x, y)) in enumerate(zip(glyphs, positions)):
+        h, w = coverage.shape
+        texture[y:y + h, x:x + w] = coverage
+        boxes[i] = (x, y, w, h, left, top)
+    texture.flags.writeable = False
+    return texture, chars, boxes, [advance for *_, advance in glyphs]
+
+
+def _pack(sizes: list[tuple[int, int]]) -> tuple[list[tuple[int, int]], tuple[int, int]]:
+    """
+    Shelf-pack rectangles, tallest first.
+
+    Returns:
+        (x, y) of each rectangle, and the (height, width) of the texture
+    """
+    area = sum((w + _PADDING) * (h + _PADDING) for w, h in sizes)
+    width = max([64, int(math.sqrt(area) * 1.15) + 1, *(w + _PADDING for w, _ in sizes)])
+    positions = [(0, 0)] * len(sizes)
+    x = y = shelf_height = 0
+    for i in sorted(range(len(sizes)), key=lambda i: -sizes[i][1]):
+        w, h = sizes[i]
+        if x + w + _PADDING > width:
+            x, y, shelf_height = 0, y + shelf_height, 0
+        positions[i] = (x, y)
+        x += w + _PADDING
+        shelf_height = max(shelf_height, h + _PADDING)
+    return positions, (max(1, y + shelf_height), width)
+
+
+class GlyphAtlas:
+    """The glyphs of one font rasterized into a packed coverage texture."""
+
+    def __init__(self, texture: np.ndarray, chars: str, boxes: np.ndarray, advances: np.ndarray,
+                 font: Optional[ImageFont.ImageFont] = None):
+        """
+        Initialize atlas. Use build() or get_atlas() rather than building one by hand.
+
+        Args:
+            texture: (H, W) uint8 coverage texture
+            chars: The characters in the atlas
+            boxes: (len(chars), 6) int array of x, y, width, height in the
+                   texture and left, top offsets from the pen position
+            advances: (len(chars),) advance widths
+            font: Font to rasterize characters missing from the atlas (None:
+                  missing characters are skipped)
+        """
+        self.font = font
+        # (previous char, char) -> kerning adjustment, filled in as pairs are first seen
+        self._kerning: dict[tuple[str, str], float] = {}
+        self._set_glyphs(texture, chars, boxes, advances)
+
+    def _set_glyphs(self, texture: np.ndarray, chars: str, boxes: np.ndarray, advances: np.ndarray):
+        if len(boxes) != len(chars) or len(advances) != len(chars):
+            raise ValueError("Atlas needs one box and one advance per character")
+        self.texture = texture
+        self.chars = chars
+        self.boxes = np.asarray(boxes, dtype=np.int32)
+        self.advances = np.asarray(advances, dtype=np.float64)
+        self._index = {char: i for i, char in enumerate(chars)}
+        self._glyphs: list[Optional[np.ndarray]] = [None] * len(chars)
+
+    @classmethod
+    def build(cls, font: ImageFont.ImageFont, chars: str = DEFAULT_CHARSET) -> 'GlyphAtlas':
+        """
+        Rasterize characters of a font into an atlas.
+
+        Args:
+            font: PIL font
+            chars: Characters to include (duplicates are dropped)
+
+        Returns:
+            GlyphAtlas
+        """
+        chars = ''.join(dict.fromkeys(chars))
+        return cls(*_build_texture(font, chars), font)
+
+    @classmethod
+    def from_bytes(cls, data: bytes, font: Optional[ImageFont.ImageFont] = None) -> 'GlyphAtlas':
+        """
+        Load an atlas saved with to_bytes().
+
+        Args:
+            data: Saved atlas
+            font: Font for characters missing from the atlas
+
+        Returns:
+            GlyphAtlas
+        """
+        with np.load(io.BytesIO(data), allow_pickle=False) as saved:
+            if int(saved['version']) != ATLAS_FORMAT_VERSION:
+                raise ValueError(f"Unsupported glyph atlas format {int(saved['version'])}")
+            chars = ''.join(chr(code) for code in saved['codepoints'])
+            return cls(saved['texture'], chars, saved['boxes'], saved['advances'], font)
+
+    def to_bytes(self) -> bytes:
+        """Serialize the atlas (texture and metrics; not the font)."""
+        buffer = io.BytesIO()
+        np.savez(buffer, version=ATLAS_FORMAT_VERSION, texture=self.texture, boxes=self.boxes,
+                 advances=self.advances, codepoints=np.array([ord(c) for c in self.chars], dtype=np.uint32))
+        return buffer.getvalue()
+
+    def missing(self, text: str) -> str:
+        """Characters of text that are not in the atlas (each once)."""
+        return ''.join(dict.fromkeys(char for char in text if char not in self._index))
+
+    def add(self, chars: str) -> bool:
+        """
+        Add characters to the atlas (re-packing the texture).
+
+        Args:
+            chars: Characters to add; ones already present are ignored
+
+        Returns:
+            True if the atlas changed (False also without a font to rasterize with)
+        """
+        new = self.missing(chars)
+        if not new or self.font is None:
+            return False
+        self._set_glyphs(*_build_texture(self.font, self.chars + new))
+        return True
+
+    def glyph(self, index: int) -> np.ndarray:
+        """Coverage of one glyph (a read-only view into the texture)."""
+        glyph = self._glyphs[index]
+        if glyph is None:
+            x, y, w, h = self.boxes[index, :4]
+            glyph = self._glyphs[index] = self.texture[y:y + h, x:x + w]
+        return glyph
+
+    def _pair_kerning(self, previous: str, char: str) -> float:
+        pair = (previous, char)
+        kerning = self._kerning.get(pair)
+        if kerning is None:
+            kerning = 0.0
+            if self.font is not None:
+                kerning = (self.font.getlength(previous + char)
+                           - self.advances[self._index[previous]] - self.advances[self._index[char]])
+            self._kerning[pair] = kerning
+        return kerning
+
+    def layout(self, text: str) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Pen position of each character, as PIL would place them on one line.
+
+        Args:
+            text: Text (characters missing from the atlas are skipped)
+
+        Returns:
+            (indices, pen_x): atlas index and pen x position of each drawn character
+        """
+        indices, pen_x = [], []
+        x, previous = 0.0, None
+        for char in text:
+            index = self._index.get(char)
+            if index is None:
+                continue
+            if previous is not None:
+                x += self._pair_kerning(previous, char)
+            indices.append(index)
+            pen_x.append(x)
+            x += self.advances[index]
+            previous = char
+        return np.array(indices, dtype=np.intp), np.array(pen_x, dtype=np.float64)
+
+    def text_mask(self, text: str, offsets: Optional[np.ndarray] = None,
+                  visible: Optional[int] = None) -> tuple[np.ndarray, tuple[int, int], tuple[int, int]]:
+        """
+        Coverage mask of text, composed from the atlas.
+
+        Args:
+            text: Text to compose
+            offsets: (len(text), 2) per-character (dx, dy) pixel offsets
+            visible: Draw only the first this many characters (the layout of
+                     the whole text is kept, so revealed text doesn't move)
+
+        Returns:
+            (mask, origin, bbox): (H, W) uint8 mask; where its top-left corner
+            sits relative to the pen start; and the (left, top, right, bottom)
+            ink box of the whole text without offsets, like typography's text_bbox()
+        """
+        drawn = [i for i, char in enumerate(text) if char in self._index]
+        indices, pen_x = self.layout(text)
+        empty = np.zeros((0, 0), dtype=np.uint8)
+        if len(indices) == 0:
+            return empty, (0, 0), (0, 0, 0, 0)
+
+        boxes = self.boxes[indices]
+        lefts = np.round(pen_x).astype(np.int64) + boxes[:, 4]
+        tops = boxes[:, 5].astype(np.int64)
+        rights, bottoms = lefts + boxes[:, 2], tops + boxes[:, 3]
+        inked = boxes[:, 2] > 0
+        bbox = (0, 0, 0, 0)
+        if inked.any():
+            bbox = (int(lefts[inked].min()), int(tops[inked].min()),
+                    int(rights[inked].max()), int(bottoms[inked].max()))
+
+        if offsets is not None:
+            offsets = np.round(np.asarray(offsets, dtype=np.float64)).astype(np.int64)
+            if offsets.shape != (len(text), 2):
+                raise ValueError(f"offsets must have shape ({len(text)}, 2), got {offsets.shape}")
+            offsets = offsets[drawn]
+            lefts, rights = lefts + offsets[:, 0], rights + offsets[:, 0]
+            tops, bottoms = tops + offsets[:, 1], bottoms + offsets[:, 1]
+
+        count = len(indices)
+        if visible is not None:
+            # visible counts characters of text, including any skipped ones
+            count = int(np.searchsorted(np.array(drawn), visible))
+        shown = np.flatnonzero(inked[:count])
+        if len(shown) == 0:
+            return empty, (0, 0), bbox
+
+        x0, y0 = int(lefts[shown].min()), int(tops[shown].min())
+        mask = np.zeros((int(bottoms[shown].max()) - y0, int(rights[shown].max()) - x0), dtype=np.uint8)
+        for i in shown:
+            x, y = lefts[i] - x0, tops[i] - y0
+            glyph = self.glyph(indices[i])
+            region = mask[y:y + glyph.shape[0], x:x + glyph.shape[1]]
+            np.maximum(region, glyph, out=region)
+        return mask, (x0, y0), bbox
+
+
+@lru_cache(maxsize=64)
+def get_atlas(font_size: int, bold: bool = True) -> GlyphAtlas:
+    """
+    Atlas of the typography font at a size, loaded from disk or built once.
+
+    Args:
+        font_size: Font size in pixels
+        bold: Use bold font variant
+
+    Returns:
+        GlyphAtlas (shared; characters it lacks are added by draw_atlas_text())
+    """
+    font = get_font(font_size, bold=bold)
+    path = _atlas_path(font, font_size, bold)
+    if path is not None:
+        try:
+            return GlyphAtlas.from_bytes(path.read_bytes(), font)
+        except (OSError, ValueError, KeyError):
+            pass  # Not cached yet, or unreadable: build it
+    atlas = GlyphAtlas.build(font)
+    _store(atlas, path)
+    return atlas
+
+
+def _atlas_path(font: ImageFont.ImageFont, font_size: int, bold: bool) -> Optional[Path]:
+    if _atlas_dir is None:
+        return None
+    key = hashlib.sha256(repr((ATLAS_FORMAT_VERSION, Image.__version__, _font_id(font),
+                               font_size, bold)).encode('utf-8')).hexdigest()
+    return _atlas_dir / f'{key}.npz'
+
+
+def _store(atlas: GlyphAtlas, path: Optional[Path]):
+    if path is None:
+        return
+    try:
+        _atomic_write(path, atlas.to_bytes())
+    except OSError:
+        pass  # The disk cache is an optimization; drawing works without it
+
+
+def _atlas_for(text: str, font_size: int, bold: bool) -> GlyphAtlas:
+    """The cached atlas, with any characters of text it lacked added (and saved)."""
+    atlas = get_atlas(font_size, bold)
+    if atlas.missing(text) and atlas.add(text):
+        _store(atlas, _atlas_path(atlas.font, font_size, bold))
+    return atlas
+
+
+def _dilate(mask: np.ndarray, radius: int) -> np.ndarray:
+    """Grow a mask by radius pixels in every direction (square), padding it by radius."""
+    padded = np.pad(mask, radius)
+    grown = padded.copy()
+    for shift in range(1, radius + 1):
+        np.maximum(grown[:, shift:], padded[:, :-shift], out=grown[:, shift:])
+        np.maximum(grown[:, :-shift], padded[:, shift:], out=grown[:, :-shift])
+    rows = grown.copy()
+    for shift in range(1, radius + 1):
+        np.maximum(grown[shift:], rows[:-shift], out=grown[shift:])
+        np.maximum(grown[:-shift], rows[shift:], out=grown[:-shift])
+    return grown
+
+
+def _blend(pixels: np.ndarray, mask: np.ndarray, x: int, y: int, color: tuple[int, int, int]):
+    """Paint color into pixels (H, W, 3) through a coverage mask placed at (x, y), clipped."""
+    height, width = pixels.shape[:2]
+    x0, y0 = max(x, 0), max(y, 0)
+    x1, y1 = min(x + mask.shape[1], width), min(y + mask.shape[0], height)
+    if x0 >= x1 or y0 >= y1:
+        return
+    alpha = mask[y0 - y:y1 - y, x0 - x:x1 - x, None].astype(np.uint16)
+    region = pixels[y0:y1, x0:x1, :3]
+    color = np.asarray(color[:3], dtype=np.uint16)
+    # Integer "over": (region * (255 - alpha) + color * alpha) / 255, rounded
+    blended = region.astype(np.uint16)
+    blended *= 255 - alpha
+    blended += color * alpha
+    blended += 127
+    blended += blended >> 8
+    blended >>= 8
+    region[...] = blended
+
+
+def draw_atlas_text(
+    frame: Image.Image | np.ndarray,
+    text: str,
+    position: tuple[int, int],
+    font_size: int = 40,
+    text_color: tuple[int, int, int] = (255, 255, 255),
+    outline_color: Optional[tuple[int, int, int]] = None,
+    outline_width: int = 0,
+    centered: bool = False,
+    bold: bool = True,
+    offsets: Optional[np.ndarray] = None,
+    visible: Optional[int] = None
+) -> Image.Image | np.ndarray:
+    """
+    Draw one line of text from the glyph atlas, optionally per-character animated.
+
+    Without an outline this matches ImageDraw.text() except where
+    neighbouring glyphs overlap (e.g. 'fi' or 'ff' at small sizes): there
+    the glyphs' coverage is combined by taking the larger value instead of
+    being rasterized together, so a few pixels can differ by up to about 30
+    levels. The outline is the text's coverage grown by outline_width, so
+    its soft edge is a little lighter than
+    typography.draw_text_with_outline()'s, which overdraws the text at
+    every offset.
+
+    Args:
+        frame: PIL Image or (H, W, 3) uint8 array to draw on
+        text: Text to draw
+        position: (x, y) pen position (top-left unless centered=True)
+        font_size: Font size in pixels
+        text_color: RGB color for text fill
+        outline_color: RGB color for outline (None for no outline)
+        outline_width: Width of outline in pixels
+        centered: If True, center text at position (ignoring offsets)
+        bold: Use bold font variant
+        offsets: (len(text), 2) per-character (dx, dy) offsets, e.g. from char_offsets()
+        visible: Draw only the first this many characters, e.g. from typewriter_count()
+
+    Returns:
+        Modified frame (arrays are drawn on in place; a new Image for PIL input)
+    """
+    atlas = _atlas_for(text, font_size, bold)
+    mask, (left, top), bbox = atlas.text_mask(text, offsets, visible)
+
+    x, y = position
+    if centered:
+        # Same as typography: the pen goes half the ink box's size up and left
+        x -= (bbox[2] - bbox[0]) // 2
+        y -= (bbox[3] - bbox[1]) // 2
+
+    pixels = np.array(frame.convert('RGB')) if isinstance(frame, Image.Image) else frame
+    if mask.size:
+        if outline_color is not None and outline_width > 0:
+            _blend(pixels, _dilate(mask, outline_width), x + left - outline_width,
+                   y + top - outline_width, outline_color)
+        _blend(pixels, mask, x + left, y + top, text_color)
+    return Image.fromarray(pixels) if isinstance(frame, Image.Image) else pixels
+
+
+def char_offsets(num_chars: int, t: float, effect: str = 'wave', amplitude: float = 8.0,
+                 cycles: float = 1.0, phase_step: float = 0.6) -> np.ndarray:
+    """
+    Per-character offsets for a text animation frame.
+
+    Args:
+        num_chars: Number of characters (len(text))
+        t: Animation progress (0.0-1.0)
+        effect: 'wave' (letters rise and fall in turn), 'bounce' (letters hop
+                off the baseline in turn), 'wiggle' (letters jitter in place)
+                or 'none'
+        amplitude: Largest offset in pixels
+        cycles: Repetitions of the motion over the animation (whole numbers loop)
+        phase_step: Phase difference between neighbouring letters, in radians
+
+    Returns:
+        (num_chars, 2) float array of (dx, dy)
+    """
+    phase = 2 * math.pi * cycles * t - phase_step * np.arange(num_chars)
+    offsets = np.zeros((num_chars, 2))
+    if effect == 'wave':
+        offsets[:, 1] = -amplitude * np.sin(phase)
+    elif effect == 'bounce':
+        offsets[:, 1] = -amplitude * np.abs(np.sin(phase / 2))
+    elif effect == 'wiggle':
+        offsets[:, 0] = 0.5 * amplitude * np.sin(2 * phase + 1.7 * np.arange(num_chars))
+        offsets[:, 1] = 0.5 * amplitude * np.cos(3 * phase + 2.3 * np.arange(num_chars))
+    elif effect != 'none':
+        raise ValueError(f"Unknown text effect: {effect}. Use one of {', '.join(TEXT_EFFECTS)}")
+    return offsets
+
+
+def typewriter_count(num_chars: int, t: float, hold: float = 0.25) -> int:
+    """
+    Characters shown at a point of a typewriter reveal.
+
+    Args:
+        num_chars: Number of characters (len(text))
+        t: Animation progress (0.0-1.0)
+        hold: Fraction of the animation at the end with all text shown
+
+    Returns:
+        Number of leading characters to show
+    """
+    reveal = max(1e-9, 1.0 - hold)
+    return min(num_chars, int(math.ceil(num_chars * min(1.0, max(0.0, t) / reveal))))
+
+
+def clear_atlases():
+    """Drop the in-memory atlases (called when the fonts change; disk entries stay valid)."""
+    get_atlas.cache_clear()
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Render Jobs - Turn JSON job descriptions into finished GIFs.
+
+Shared by the batch command line and the render server. A job is a dict
+like one batch manifest line:
+
+    {"template": "bounce", "params": {...}, "seed": 7, "fps": 20,
+     "num_colors": 64, "max_size_kb": 64}
+
+Fields: template (required, see core/template_registry.py), params, seed,
+width/height (default: frame size), fps, num_colors, quantizer, dither,
+temporal_stable, optimize_for_emoji, remove_duplicates, format, quality,
+and max_size_kb - a size budget; over-budget GIFs are re-encoded with fewer
+colors until they fit.
+"""
+
+import inspect
+from pathlib import Path
+from typing import BinaryIO, Callable
+
+from core.template_registry import get_template
+
+
+# Colors to fall back to, in order, when a GIF is over its size budget
+BUDGET_COLOR_STEPS = [128, 96, 64, 48, 32, 24, 16]
+
+# Job fields that change the encoded output (part of the cache key)
+BUILDER_SETTINGS = ('width', 'height', 'fps', 'num_colors', 'quantizer', 'dither', 'temporal_stable',
+                    'optimize_for_emoji', 'remove_duplicates', 'max_size_kb', 'format', 'quality')
+
+
+def params_from_json(value):
+    """Turn JSON lists back into the tuples templates expect for colors/positions."""
+    if isinstance(value, list):
+        return tuple(params_from_json(v) for v in value)
+    if isinstance(value, dict):
+        return {k: params_from_json(v) for k, v in value.items()}
+    return value
+
+
+def job_call(job: dict) -> tuple[Callable, dict]:
+    """
+    Get the template function and keyword arguments for a job.
+
+    Args:
+        job: Job dict
+
+    Returns:
+        Tuple of (create function, keyword arguments); the job's seed is
+        included when the template takes one
+    """
+    if 'template' not in job:
+        raise ValueError("Job needs a 'template'")
+
+    create_fn = get_template(job['template'])
+    params = params_from_json(job.get('params', {}))
+    if not isinstance(params, dict):
+        raise ValueError("Job 'params' must be an object")
+
+    seed = job.get('seed')
+    if seed is not None and 'seed' in inspect.signature(create_fn).parameters:
+        params['seed'] = seed
+    return create_fn, params
+
+
+def job_cache_key(job: dict, params: dict) -> str:
+    """
+    Build the render cache key for a job.
+
+    Args:
+        job: Job dict
+        params: Keyword arguments from job_call()
+
+    Returns:
+        Key for core.render_cache
+    """
+    from core.render_cache import make_cache_key
+
+    settings = {k: job[k] for k in BUILDER_SETTINGS if k in job}
+    return make_cache_key(job['template'], params, job.get('seed'), settings)
+
+
+def encode_frames(frames: list, output: str | Path | BinaryIO, job: dict, num_colors: int) -> dict:
+    """
+    Encode frames with the job's builder settings.
+
+    Args:
+        frames: Frames from the template
+        output: Path or binary file object
+        job: Job dict
+        num_colors: Colors to use
+
+    Returns:
+        Info dict from GIFBuilder.save()
+    """
+    from core.gif_builder import GIFBuilder
+
+    first = frames[0]
+    width, height = (first.shape[1], first.shape[0]) if hasattr(first, 'shape') else first.size
+    builder = GIFBuilder(
+        width=job.get('width', width),
+        height=job.get('height', height),
+        fps=job.get('fps', 15)
+    )
+    builder.add_frames(frames)
+    return builder.save(
+        output,
+        num_colors=num_colors,
+        optimize_for_emoji=job.get('optimize_for_emoji', False),
+        remove_duplicates=job.get('remove_duplicates', True),
+        format=job.get('format'),
+        quality=job.get('quality', 80),
+        quantizer=job.get('quantizer', 'median_cut'),
+        dither=job.get('dither'),
+        temporal_stable=job.get('temporal_stable', True)
+    )
+
+
+def encode_within_budget(frames: list, output: str | Path | BinaryIO, job: dict) -> tuple[dict, int]:
+    """
+    Encode frames, retrying with fewer colors until the job's max_size_kb fits.
+
+    Args:
+        frames: Frames from the template
+        output: Path or binary file object (rewound before each attempt)
+        job: Job dict
+
+    Returns:
+        Tuple of (info from the last attempt, number of attempts). The last
+        attempt may still be over budget.
+    """
+    max_size_kb = job.get('max_size_kb')
+    num_colors = job.get('num_colors', 128)
+    steps = [num_colors] + [c for c in BUDGET_COLOR_STEPS if c < num_colors]
+
+    for attempt, colors in enumerate(steps, 1):
+        if hasattr(output, 'seek'):
+            output.seek(0)
+            output.truncate()
+        info = encode_frames(frames, output, job, colors)
+        if max_size_kb is None or info['size_kb'] <= max_size_kb:
+            break
+    return info, attempt
@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""
+Palette-Locked Rendering - Frames drawn straight onto a fixed, named palette.
+
+A LockedPalette is a named palette (color_palettes.PALETTES or
+EMOJI_PALETTES) plus a few blend ramps between its entries, so every
+frame uses at most 256 exact colors chosen up front. An IndexedCanvas holds
+a frame as palette indices; compositing a layer snaps each pixel to the
+palette and blends it with what is underneath through a precomputed mixing
+table, so the result is palette indices again - no quantization pass:
+
+    palette = LockedPalette.from_name('vibrant_emoji')
+    canvas = IndexedCanvas(palette, 128, 128, background=(255, 255, 255))
+    layer = canvas.new_layer()
+    ImageDraw.Draw(layer).ellipse([24, 24, 104, 104], fill=(255, 68, 68))
+    canvas.composite(layer)
+    builder.add_frame(canvas.to_image())     # a 'P' image
+
+GIFBuilder recognizes frames that all share one palette and encodes them
+as they are, with exactly those colors (see GIFBuilder.locked_palette).
+"""
+
+from functools import lru_cache
+from itertools import combinations
+from numbers import Integral
+from typing import Optional
+
+import numpy as np
+from PIL import Image
+
+from core.color_palettes import EMOJI_PALETTES, PALETTES
+
+
+# Blend levels in the mixing table; layer alpha is rounded to one of these
+ALPHA_LEVELS = 16
+
+# Bits per channel of the nearest-color table for colors not in the palette
+_TABLE_BITS = 5
+
+# Colors matched at once when searching for nearest entries (bounds memory)
+_CHUNK = 8192
+
+
+def _pack(colors: np.ndarray) -> np.ndarray:
+    """(..., 3) uint8 colors -> (...) int32 keys."""
+    colors = colors.astype(np.int32)
+    return (colors[..., 0] << 16) | (colors[..., 1] << 8) | colors[..., 2]
+
+
+def _nearest(colors: np.ndarray, palette: np.ndarray) -> np.ndarray:
+    """Index of the nearest palette entry (squared RGB distance) for each of (N, 3) colors."""
+    palette = palette.astype(np.float32)
+    indices = np.empty(len(colors), dtype=np.uint8)
+    for start in range(0, len(colors), _CHUNK):
+        chunk = colors[start:start + _CHUNK].astype(np.float32)
+        distances = ((chunk[:, None, :] - palette[None, :, :]) ** 2).sum(axis=2)
+        indices[start:start + _CHUNK] = np.argmin(distances, axis=1)
+    return indices
+
+
+@lru_cache(maxsize=16)
+def _lookup_tables(palette_bytes: bytes) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Sorted exact keys, their indices, and the coarse nearest-color table for a palette."""
+    palette = np.frombuffer(palette_bytes, dtype=np.uint8).reshape(-1, 3)
+    keys = _pack(palette)
+    # First entry wins for duplicate colors
+    unique_keys, first = np.unique(keys, return_index=True)
+
+    levels = (np.arange(1 << _TABLE_BITS) << (8 - _TABLE_BITS)) + (1 << (7 - _TABLE_BITS))
+    grid = np.stack(np.meshgrid(levels, levels, levels, indexing='ij'), axis=-1).reshape(-1, 3)
+    table = _nearest(grid, palette).reshape((1 << _TABLE_BITS,) * 3)
+    return unique_keys, first.astype(np.uint8), table
+
+
+def snap_to_palette(pixels: np.ndarray, palette: np.ndarray) -> np.ndarray:
+    """
+    Map RGB pixels to palette indices.
+
+    Pixels that are exactly a palette color get that entry; any other
+    color gets the entry nearest its cell in a 32x32x32 table.
+
+    Args:
+        pixels: (..., 3) uint8 RGB array
+        palette: (K, 3) uint8 palette colors, K <= 256
+
+    Returns:
+        (...) uint8 array of palette indices
+    """
+    pixels = np.asarray(pixels, dtype=np.uint8)
+    palette = np.ascontiguousarray(palette, dtype=np.uint8)
+    if len(palette) > 256:
+        raise ValueError(f"A palette holds at most 256 colors, got {len(palette)}")
+    keys, first, table = _lookup_tables(palette.tobytes())
+
+    packed = _pack(pixels)
+    position = np.minimum(np.searchsorted(keys, packed), len(keys) - 1)
+    exact = keys[position] == packed
+    shift = 8 - _TABLE_BITS
+    coarse = table[pixels[..., 0] >> shift, pixels[..., 1] >> shift, pixels[..., 2] >> shift]
+    return np.where(exact, first[position], coarse)
+
+
+def exact_indices(pixels: np.ndarray, palette: np.ndarray) -> Optional[np.ndarray]:
+    """
+    Map RGB pixels to palette indices, only if every pixel is a palette color.
+
+    Args:
+        pixels: (..., 3) uint8 RGB array
+        palette: (K, 3) uint8 palette colors
+
+    Returns:
+        (...) uint8 array of palette indices, or None if any pixel is off-palette
+    """
+    palette = np.ascontiguousarray(palette, dtype=np.uint8)
+    keys, first, _ = _lookup_tables(palette.tobytes())
+    packed = _pack(np.asarray(pixels, dtype=np.uint8))
+    position = np.minimum(np.searchsorted(keys, packed), len(keys) - 1)
+    if not np.array_equal(keys[position], packed):
+        return None
+    return first[position]
+
+
+class LockedPalette:
+    """A fixed palette: base colors, blend ramps between them, and a mixing table."""
+
+    def __init__(self, colors: list[tuple[int, int, int]], ramp_steps: int = 2,
+                 ramp_pairs: Optional[list[tuple[int, int]]] = None):
+        """
+        Initialize palette.
+
+        Args:
+            colors: Base colors (RGB tuples)
+            ramp_steps: Intermediate colors added between each ramp pair
+                        (evenly spaced, end colors excluded)
+            ramp_pairs: Pairs of base color indices to ramp between
+                        (None = every pair)
+        """
+        base = np.array(colors, dtype=np.uint8).reshape(-1, 3)
+        if len(base) == 0:
+            raise ValueError("A palette needs at least one color")
+        if ramp_steps < 0:
+            raise ValueError("ramp_steps must be 0 or more")
+        if ramp_pairs is None:
+            ramp_pairs = list(combinations(range(len(base)), 2))
+        for a, b in ramp_pairs:
+            if not (0 <= a < len(base) and 0 <= b < len(base)):
+                raise ValueError(f"Ramp pair {(a, b)} is out of range for {len(base)} colors")
+
+        steps = np.arange(1, ramp_steps + 1) / (ramp_steps + 1)
+        ramps = [np.round(base[a] + (base[b].astype(np.float64) - base[a]) * steps[:, None])
+                 for a, b in ramp_pairs]
+        palette = np.concatenate([base.astype(np.float64), *ramps]).astype(np.uint8)
+        if len(palette) > 256:
+            raise ValueError(f"Palette has {len(palette)} colors with its ramps, over the 256 GIF "
+                             f"limit; lower ramp_steps or pass fewer ramp_pairs")
+
+        self.base_count = len(base)
+        self.colors = palette
+        self.colors.flags.writeable = False
+        self._mix: Optional[np.ndarray] = None
+
+    @classmethod
+    def from_name(cls, name: str, ramp_steps: int = 2,
+                  ramp_pairs: Optional[list[tuple[int, int]]] = None) -> 'LockedPalette':
+        """
+        Palette from a named palette (PALETTES or EMOJI_PALETTES).
+
+        Args:
+            name: Palette name, e.g. 'vibrant', 'pastel', 'simple', 'vibrant_emoji'
+            ramp_steps, ramp_pairs: As for LockedPalette()
+
+        Returns:
+            LockedPalette
+        """
+        if name in EMOJI_PALETTES:
+            colors = EMOJI_PALETTES[name]
+        elif name.lower() in PALETTES:
+            # Roles can share a color (e.g. text and text_light)
+            colors = list(dict.fromkeys(PALETTES[name.lower()].values()))
+        else:
+            names = ', '.join([*PALETTES, *EMOJI_PALETTES])
+            raise ValueError(f"Unknown palette: {name}. Use one of {names}")
+        return cls(colors, ramp_steps, ramp_pairs)
+
+    def __len__(self) -> int:
+        return len(self.colors)
+
+    @property
+    def mix(self) -> np.ndarray:
+        """
+        Mixing table, built on first use: mix[under, over, level] is the
+        entry nearest to color over drawn at alpha level / (ALPHA_LEVELS - 1)
+        on top of color under.
+        """
+        if self._mix is None:
+            k = len(self.colors)
+            colors = self.colors.astype(np.float32)
+            alpha = (np.arange(ALPHA_LEVELS, dtype=np.float32) / (ALPHA_LEVELS - 1))[None, None, :, None]
+            blends = colors[:, None, None, :] * (1 - alpha) + colors[None, :, None, :] * alpha
+            self._mix = _nearest(blends.reshape(-1, 3), self.colors).reshape(k, k, ALPHA_LEVELS)
+            # The end levels are exact, whatever the rounding above
+            self._mix[:, :, 0] = np.arange(k, dtype=np.uint8)[:, None]
+            self._mix[:, :, -1] = np.arange(k, dtype=np.uint8)[None, :]
+        return self._mix
+
+    def snap(self, pixels: np.ndarray) -> np.ndarray:
+        """
+        Map RGB pixels to indices in this palette.
+
+        Args:
+            pixels: (..., 3) uint8 RGB array
+
+        Returns:
+            (...) uint8 array of palette indices
+        """
+        return snap_to_palette(pixels, self.colors)
+
+    def index_of(self, color: tuple[int, int, int]) -> int:
+        """Index of the entry nearest to one color."""
+        return int(self.snap(np.array(color[:3], dtype=np.uint8)))
+
+    def palette_bytes(self) -> list[int]:
+        """Flat [r, g, b, ...] list for Image.putpalette()."""
+        return self.colors.flatten().tolist()
+
+
+@lru_cache(maxsize=16)
+def get_locked_palette(name: str, ramp_steps: int = 2) -> LockedPalette:
+    """
+    Shared LockedPalette for a named palette (the mixing table is built once).
+
+    Args:
+        name: Palette name
+        ramp_steps: Intermediate colors between each pair of base colors
+
+    Returns:
+        LockedPalette
+    """
+    return LockedPalette.from_name(name, ramp_steps)
+
+
+class IndexedCanvas:
+    """A frame stored as indices into a LockedPalette."""
+
+    def __init__(self, palette: LockedPalette | str, width: int, height: int,
+                 background: tuple[int, int, int] | int = 0):
+        """
+        Initialize canvas.
+
+        Args:
+            palette: LockedPalette, or a palette name
+            width: Canvas width in pixels
+            height: Canvas height in pixels
+            background: Background color (snapped to the palette) or palette index
+        """
+        self.palette = get_locked_palette(palette) if isinstance(palette, str) else palette
+        self.width = width
+        self.height = height
+        background = background if isinstance(background, Integral) else self.palette.index_of(background)
+        self.indices = np.full((height, width), background, dtype=np.uint8)
+
+    def copy(self) -> 'IndexedCanvas':
+        """Independent copy of the canvas."""
+        canvas = IndexedCanvas.__new__(IndexedCanvas)
+        canvas.palette, canvas.width, canvas.height = self.palette, self.width, self.height
+        canvas.indices = self.indices.copy()
+        return canvas
+
+    def fill(self, color: tuple[int, int, int] | int):
+        """Fill the whole canvas with one color (snapped to the palette) or palette index."""
+        self.indices[:] = color if isinstance(color, Integral) else self.palette.index_of(color)
+
+    def new_layer(self, size: Optional[tuple[int, int]] = None) -> Image.Image:
+        """Transparent RGBA image to draw on and then composite() (default: canvas size)."""
+        return Image.new('RGBA', size or (self.width, self.height), (0, 0, 0, 0))
+
+    def composite(self, layer: Image.Image | np.ndarray, position: tuple[int, int] = (0, 0)):
+        """
+        Draw a layer onto the canvas through the mixing table.
+
+        Args:
+            layer: RGBA (or RGB, fully opaque) PIL image or array
+            position: (x, y) of the layer's top-left corner on the canvas
+        """
+        if isinstance(layer, Image.Image):
+            layer = np.asarray(layer.convert('RGBA') if layer.mode not in ('RGB', 'RGBA') else layer)
+        layer = np.asarray(layer, dtype=np.uint8)
+
+        # Clip the layer to the canvas
+        x, y = position
+        left, top = max(0, x), max(0, y)
+        right, bottom = min(self.width, x + layer.shape[1]), min(self.height, y + layer.shape[0])
+        if right <= left or bottom <= top:
+            return
+        layer = layer[top - y:bottom - y, left - x:right - x]
+        region = self.indices[top:bottom, left:right]
+
+        over = self.palette.snap(layer[..., :3])
+        if layer.shape[2] == 3:
+            region[:] = over
+            return
+        level = (layer[..., 3].astype(np.uint16) * (ALPHA_LEVELS - 1) + 127) // 255
+        drawn = level > 0
+        region[drawn] = self.palette.mix[region[drawn], over[drawn], level[drawn]]
+
+    def to_image(self) -> Image.Image:
+        """The canvas as a 'P' mode PIL image with the locked palette."""
+        image = Image.fromarray(self.indices)
+        image.putpalette(self.palette.palette_bytes())
+        return image
+
+    def to_rgb(self) -> np.ndarray:
+        """The canvas as an (H, W, 3) uint8 RGB array."""
+        return self.palette.colors[self.indices]
@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+Motion Paths - Spline paths sampled at constant speed.
+
+Paths are chains of cubic Bezier segments, built from waypoints
+(Catmull-Rom, passing through every point), from Bezier control points, or
+as a parabolic arc. Each path builds an arc-length table once, so every
+frame's position can be sampled in one vectorized call at constant speed
+(equal distance per unit of progress, however long each segment is),
+optionally eased:
+
+    path = SplinePath.catmull_rom([(40, 400), (160, 120), (320, 360), (440, 80)])
+    positions = path.sample(num_frames=30, easing='ease_in_out')   # (30, 2) array
+
+    positions = sample_path([(40, 400), (160, 120), (440, 80)], 30)  # cached by points
+"""
+
+from functools import lru_cache
+from typing import Optional
+
+import numpy as np
+
+from core.easing import get_easing, get_easing_lut
+
+
+# Arc-length table resolution: chord samples per Bezier segment
+SAMPLES_PER_SEGMENT = 64
+
+
+def _unit(vector: np.ndarray) -> np.ndarray:
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm > 0 else vector
+
+
+class SplinePath:
+    """A 2D path made of cubic Bezier segments."""
+
+    def __init__(self, segments: np.ndarray):
+        """
+        Initialize path. Use the catmull_rom(), bezier(), linear() or arc()
+        constructors rather than building segments by hand.
+
+        Args:
+            segments: Array of shape (num_segments, 4, 2): the four control
+                      points of each cubic Bezier segment
+        """
+        segments = np.asarray(segments, dtype=np.float64)
+        if segments.ndim != 3 or segments.shape[1:] != (4, 2) or len(segments) == 0:
+            raise ValueError("segments must have shape (num_segments, 4, 2)")
+        self.segments = segments
+        self._lengths: Optional[tuple[np.ndarray, np.ndarray]] = None
+
+    @classmethod
+    def catmull_rom(cls, points: list[tuple[float, float]], closed: bool = False,
+                    alpha: float = 0.5) -> 'SplinePath':
+        """
+        Smooth path through every point (Catmull-Rom spline).
+
+        Args:
+            points: Waypoints (at least 2)
+            closed: Join the last point back to the first
+            alpha: 0.5 = centripetal (no loops or cusps with unevenly spaced
+                   points), 0.0 = uniform, 1.0 = chordal
+
+        Returns:
+            SplinePath
+        """
+        points = np.asarray(points, dtype=np.float64)
+        if len(points) < 2:
+            raise ValueError("A path needs at least 2 points")
+
+        if closed:
+            padded = np.concatenate([points[-1:], points, points[:2]])
+        else:
+            # Mirror the neighbours of the end points so the curve starts and ends on them
+            padded = np.concatenate([2 * points[:1] - points[1:2], points, 2 * points[-1:] - points[-2:-1]])
+        p0, p1, p2, p3 = padded[:-3], padded[1:-2], padded[2:-1], padded[3:]
+
+        # Knot intervals; guard repeated points
+        d0, d1, d2 = (np.maximum(np.linalg.norm(b - a, axis=1) ** alpha, 1e-9)[:, None]
+                      for a, b in ((p0, p1), (p1, p2), (p2, p3)))
+
+        # Tangents at p1 and p2 over the span, then each span as a cubic Bezier
+        m1 = ((p1 - p0) / d0 - (p2 - p0) / (d0 + d1) + (p2 - p1) / d1) * d1
+        m2 = ((p2 - p1) / d1 - (p3 - p1) / (d1 + d2) + (p3 - p2) / d2) * d1
+        return cls(np.stack([p1, p1 + m1 / 3, p2 - m2 / 3, p2], axis=1))
+
+    @classmethod
+    def bezier(cls, control_points: list[tuple[float, float]]) -> 'SplinePath':
+        """
+        Path from cubic Bezier control points.
+
+        Args:
+            control_points: 3k + 1 points: start, then (control, control, end)
+                            for each of the k segments
+
+        Returns:
+            SplinePath
+        """
+        points = np.asarray(control_points, dtype=np.float64)
+        if len(points) < 4 or (len(points) - 1) % 3:
+            raise ValueError("A cubic Bezier path needs 3k + 1 control points (4, 7, 10, ...)")
+        starts = np.arange(0, len(points) - 1, 3)
+        return cls(np.stack([points[starts + k] for k in range(4)], axis=1))
+
+    @classmethod
+    def linear(cls, points: list[tuple[float, float]]) -> 'SplinePath':
+        """
+        Straight segments between the points.
+
+        Args:
+            points: Waypoints (at least 2)
+
+        Returns:
+            SplinePath
+        """
+        points = np.asarray(points, dtype=np.float64)
+        if len(points) < 2:
+            raise ValueError("A path needs at least 2 points")
+        start, end = points[:-1], points[1:]
+        return cls(np.stack([start, start + (end - start) / 3, end - (end - start) / 3, end], axis=1))
+
+    @classmethod
+    def arc(cls, start: tuple[float, float], end: tuple[float, float], height: float) -> 'SplinePath':
+        """
+        Parabolic arc, the same curve as easing.calculate_arc_motion().
+
+        Args:
+            start: (x, y) start
+            end: (x, y) end
+            height: Arc height at the midpoint (positive = upward)
+
+        Returns:
+            SplinePath
+        """
+        start, end = np.asarray(start, dtype=np.float64), np.asarray(end, dtype=np.float64)
+        # A parabola is a quadratic Bezier whose control point sits 2x the
+        # height above the midpoint; raise it to a cubic
+        control = (start + end) / 2 - np.array([0.0, 2 * height])
+        segment = [start, start + 2 / 3 * (control - start), end + 2 / 3 * (control - end), end]
+        return cls(np.array([segment]))
+
+    def points_at(self, u: np.ndarray) -> np.ndarray:
+        """
+        Evaluate the path at curve parameters.
+
+        Args:
+            u: Array of parameters from 0 to num_segments (segment i covers
+               [i, i + 1]); not evenly spaced along the path in general
+
+        Returns:
+            Array of (x, y) positions, shape (len(u), 2)
+        """
+        u = np.clip(np.asarray(u, dtype=np.float64), 0, len(self.segments))
+        index = np.minimum(u.astype(int), len(self.segments) - 1)
+        s = (u - index)[:, None]
+        p0, p1, p2, p3 = (self.segments[index, k] for k in range(4))
+        r = 1 - s
+        return r * r * r * p0 + 3 * r * r * s * p1 + 3 * r * s * s * p2 + s * s * s * p3
+
+    def _arc_lengths(self) -> tuple[np.ndarray, np.ndarray]:
+        """Arc-length table: curve parameters and the distance along the path at each."""
+        if self._lengths is None:
+            u = np.linspace(0, len(self.segments), len(self.segments) * SAMPLES_PER_SEGMENT + 1)
+            chords = np.linalg.norm(np.diff(self.points_at(u), axis=0), axis=1)
+            self._lengths = (u, np.concatenate([[0.0], np.cumsum(chords)]))
+        return self._lengths
+
+    @property
+    def length(self) -> float:
+        """Path length in pixels."""
+        return float(self._arc_lengths()[1][-1])
+
+    def at_progress(self, progress: np.ndarray, constant_speed: bool = True) -> np.ndarray:
+        """
+        Positions at progress values from 0.0 (start) to 1.0 (end).
+
+        Args:
+            progress: Array of progress values
+            constant_speed: Map progress to distance along the path; otherwise
+                            to the curve parameter (each segment takes equal
+                            time, so speed follows segment length)
+
+        Returns:
+            Array of (x, y) positions, shape (len(progress), 2)
+        """
+        progress = np.asarray(progress, dtype=np.float64)
+        if not constant_speed:
+            return self.points_at(progress * len(self.segments))
+
+        u, distance = self._arc_lengths()
+        total = distance[-1]
+        if total == 0:
+            return self.points_at(np.zeros(len(progress)))
+        target = progress * total
+        points = self.points_at(np.interp(np.clip(target, 0, total), distance, u))
+
+        # Eased progress can overshoot (back, elastic): carry on straight past the ends
+        before, after = target < 0, target > total
+        if np.any(before) or np.any(after):
+            first, second, second_last, last = self.points_at(u[[0, 1, -2, -1]])
+            points[before] = first + _unit(first - second) * -target[before][:, None]
+            points[after] = last + _unit(last - second_last) * (target[after] - total)[:, None]
+        return points
+
+    def sample(self, num_frames: int, easing: str = 'linear', constant_speed: bool = True) -> np.ndarray:
+        """
+        Position for every frame, start to end.
+
+        Args:
+            num_frames: Number of frames; frame i is at progress i / (num_frames - 1)
+            easing: Easing applied to progress along the whole path
+            constant_speed: See at_progress()
+
+        Returns:
+            Array of (x, y) positions, shape (num_frames, 2)
+        """
+        t = np.arange(num_frames) / (num_frames - 1) if num_frames > 1 else np.zeros(num_frames)
+        return self.at_progress(get_easing(easing, vectorized=True)(t), constant_speed)
+
+
+@lru_cache(maxsize=64)
+def _cached_path(kind: str, points: tuple) -> SplinePath:
+    builders = {'catmull_rom': SplinePath.catmull_rom, 'bezier': SplinePath.bezier, 'linear': SplinePath.linear}
+    if kind not in builders:
+        raise ValueError(f"Unknown path kind: {kind}. Use one of {', '.join(builders)}")
+    return builders[kind](list(points))
+
+
+@lru_cache(maxsize=256)
+def _cached_samples(kind: str, points: tuple, num_frames: int, easing: str,
+                    constant_speed: bool, lut_resolution: Optional[int]) -> np.ndarray:
+    # lut_resolution only keys the cache: set_easing_lut() changes the eased samples
+    samples = _cached_path(kind, points).sample(num_frames, easing, constant_speed)
+    samples.flags.writeable = False  # Shared between callers
+    return samples
+
+
+def sample_path(points: list[tuple[float, float]], num_frames: int, easing: str = 'linear',
+                kind: str = 'catmull_rom', constant_speed: bool = True) -> np.ndarray:
+    """
+    Sample a path through points for every frame, cached by the points.
+
+    Args:
+        points: Waypoints ('catmull_rom', 'linear') or control points ('bezier')
+        num_frames: Number of frames
+        easing: Easing applied to progress along the whole path
+        kind: 'catmull_rom', 'bezier' or 'linear'
+        constant_speed: Equal distance per unit of progress
+
+    Returns:
+        Read-only array of (x, y) positions, shape (num_frames, 2)
+    """
+    key = tuple((float(x), float(y)) for x, y in points)
+    return _cached_samples(kind, key, num_frames, easing, constant_speed, get_easing_lut())
@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+Perceptual Quantization - Palettes chosen in OKLab instead of RGB.
+
+PIL's median cut splits RGB space evenly, but equal RGB steps are not equal
+visible steps: it spends colors on differences nobody sees and bands smooth
+gradients. OKLab is a perceptual color space (equal distances look about
+equally different), so clustering there gets the same look from fewer
+colors:
+
+    quantizer = OKLabQuantizer.fit(frames, num_colors=48)
+    indices = quantizer.map(frame)          # (H, W) palette indices
+    quantized = quantizer.palette[indices]  # (H, W, 3) RGB
+
+k-means runs on a 5-bit-per-channel histogram of the frames (thousands of
+points, not millions of pixels). Frames are mapped through a 6-bit table:
+each bin's nearest palette entry in OKLab is found once, using a bin ->
+OKLab table built once per process, and after that mapping is a lookup per
+pixel. Artwork with no more distinct colors than num_colors keeps its
+exact colors.
+"""
+
+from functools import lru_cache
+from typing import Optional
+
+import numpy as np
+
+
+# Bits per channel of the bins frames are mapped through (the cached OKLab table)
+BITS = 6
+
+# Bits per channel of the histogram the palette is fitted on
+FIT_BITS = 5
+
+# k-means stops after this many rounds, or earlier once no bin changes cluster
+MAX_ITERATIONS = 16
+
+# Bins compared against the palette at once (bounds memory)
+_CHUNK = 16384
+
+# Linear sRGB -> LMS, and cube-rooted LMS -> OKLab (Ottosson, 2020)
+_RGB_TO_LMS = np.array([
+    [0.4122214708, 0.5363325363, 0.0514459929],
+    [0.2119034982, 0.6806995451, 0.1073969566],
+    [0.0883024619, 0.2817188376, 0.6299787005],
+])
+_LMS_TO_OKLAB = np.array([
+    [0.2104542553, 0.7936177850, -0.0040720468],
+    [1.9779984951, -2.4285922050, 0.4505937099],
+    [0.0259040371, 0.7827717662, -0.8086757660],
+])
+
+
+def rgb_to_oklab(colors: np.ndarray) -> np.ndarray:
+    """
+    Convert sRGB colors to OKLab.
+
+    Args:
+        colors: (..., 3) array of 0-255 RGB
+
+    Returns:
+        (..., 3) float array of L (0-1), a, b
+    """
+    c = np.asarray(colors, dtype=np.float64) / 255.0
+    linear = np.where(c <= 0.04045, c / 12.92, ((c + 0.055) / 1.055) ** 2.4)
+    return np.cbrt(linear @ _RGB_TO_LMS.T) @ _LMS_TO_OKLAB.T
+
+
+@lru_cache(maxsize=2)
+def oklab_table(bits: int = BITS) -> np.ndarray:
+    """
+    OKLab of the center of every RGB bin, built once per process.
+
+    Args:
+        bits: Bits per channel
+
+    Returns:
+        Read-only (2 ** (3 * bits), 3) float32 array, indexed by bin_index()
+    """
+    levels = (np.arange(1 << bits) << (8 - bits)) + (1 << (7 - bits))
+    grid = np.stack(np.meshgrid(levels, levels, levels, indexing='ij'), axis=-1).reshape(-1, 3)
+    table = rgb_to_oklab(grid).astype(np.float32)
+    table.flags.writeable = False
+    return table
+
+
+def _pack(colors: np.ndarray) -> np.ndarray:
+    """(..., 3) uint8 colors -> (...) int32 keys."""
+    colors = np.asarray(colors).astype(np.int32)
+    return (colors[..., 0] << 16) | (colors[..., 1] << 8) | colors[..., 2]
+
+
+def bin_index(pixels: np.ndarray, bits: int = BITS) -> np.ndarray:
+    """
+    Bin of each RGB pixel.
+
+    Args:
+        pixels: (..., 3) uint8 RGB array
+        bits: Bits per channel
+
+    Returns:
+        (...) int array of bin indices
+    """
+    shift = 8 - bits
+    p = np.asarray(pixels, dtype=np.uint8) >> shift
+    return (p[..., 0].astype(np.int32) << (2 * bits)) | (p[..., 1].astype(np.int32) << bits) | p[..., 2]
+
+
+def _nearest(points: np.ndarray, centers: np.ndarray) -> np.ndarray:
+    """Index of the nearest center for each point."""
+    labels = np.empty(len(points), dtype=np.intp)
+    center_norms = (centers ** 2).sum(axis=1)
+    for start in range(0, len(points), _CHUNK):
+        chunk = points[start:start + _CHUNK]
+        # |p - c|^2 without the |p|^2 term, which doesn't change the argmin
+        labels[start:start + _CHUNK] = np.argmin(center_norms[None, :] - 2 * chunk @ centers.T, axis=1)
+    return labels
+
+
+def _kmeans_plus_plus(points: np.ndarray, weights: np.ndarray, k: int,
+                      rng: np.random.Generator) -> np.ndarray:
+    """Weighted k-means++ seeding: spread the first centers out."""
+    centers = [points[np.argmax(weights)]]
+    distances = ((points - centers[0]) ** 2).sum(axis=1)
+    for _ in range(1, k):
+        scores = distances * weights
+        total = scores.sum()
+        if total <= 0:
+            break
+        centers.append(points[rng.choice(len(points), p=scores / total)])
+        distances = np.minimum(distances, ((points - centers[-1]) ** 2).sum(axis=1))
+    return np.array(centers)
+
+
+class OKLabQuantizer:
+    """A palette in OKLab, with a per-bin lookup table for mapping frames onto it."""
+
+    def __init__(self, palette: np.ndarray, exact: bool = False):
+        """
+        Initialize quantizer from a palette. Use fit() to choose one from frames.
+
+        Args:
+            palette: (K, 3) uint8 RGB palette, K <= 256
+            exact: Map pixels that are exactly a palette color to that entry
+                   (otherwise close colors sharing a bin map together)
+        """
+        palette = np.asarray(palette, dtype=np.uint8).reshape(-1, 3)
+        if not 0 < len(palette) <= 256:
+            raise ValueError(f"A palette needs 1-256 colors, got {len(palette)}")
+        self.palette = palette
+        self._palette_lab = rgb_to_oklab(palette).astype(np.float32)
+        # Bin -> palette index, filled in as bins are first seen (-1 = not yet)
+        self._table = np.full(1 << (3 * BITS), -1, dtype=np.int16)
+        self._exact_keys = np.sort(_pack(palette)) if exact else None
+        self._exact_index = np.argsort(_pack(palette)).astype(np.uint8) if exact else None
+
+    @classmethod
+    def fit(cls, frames: list[np.ndarray], num_colors: int = 128,
+            max_iterations: int = MAX_ITERATIONS, seed: int = 0) -> 'OKLabQuantizer':
+        """
+        Choose a palette for frames with weighted k-means in OKLab.
+
+        Args:
+            frames: RGB frames ((H, W, 3) uint8 arrays)
+            num_colors: Palette size (2-256)
+            max_iterations: k-means rounds at most
+            seed: Seed for the k-means++ starting centers (fits are reproducible)
+
+        Returns:
+            OKLabQuantizer
+        """
+        if not 2 <= num_colors <= 256:
+            raise ValueError(f"num_colors must be 2-256, got {num_colors}")
+        if not frames:
+            raise ValueError("No frames to fit a palette to")
+        pixels = [np.asarray(frame, dtype=np.uint8).reshape(-1, 3) for frame in frames]
+
+        # Histogram of coarse bins, with the exact mean color of each
+        size = 1 << (3 * FIT_BITS)
+        counts = np.zeros(size, dtype=np.int64)
+        sums = np.zeros((size, 3), dtype=np.float64)
+        for frame_pixels in pixels:
+            bins = bin_index(frame_pixels, FIT_BITS)
+            counts += np.bincount(bins, minlength=size)
+            for channel in range(3):
+                sums[:, channel] += np.bincount(bins, weights=frame_pixels[:, channel], minlength=size)
+
+        occupied = np.flatnonzero(counts)
+        weights = counts[occupied].astype(np.float64)
+        means = sums[occupied] / weights[:, None]
+
+        if len(occupied) <= num_colors:
+            # Flat artwork: keep every color exactly if there are few enough
+            colors = np.unique(np.concatenate([_pack(frame_pixels) for frame_pixels in pixels]))
+            if len(colors) <= num_colors:
+                return cls(np.stack([colors >> 16, (colors >> 8) & 255, colors & 255], axis=1), exact=True)
+            return cls(np.round(means).astype(np.uint8))
+
+        points = rgb_to_oklab(means)
+        centers = _kmeans_plus_plus(points, weights, num_colors, np.random.default_rng(seed))
+        labels = None
+        for _ in range(max_iterations):
+            new_labels = _nearest(points, centers)
+            if labels is not None and np.array_equal(new_labels, labels):
+                break
+            labels = new_labels
+            totals = np.bincount(labels, weights=weights, minlength=len(centers))
+            used = totals > 0
+            for channel in range(3):
+                sums_lab = np.bincount(labels, weights=weights * points[:, channel], minlength=len(centers))
+                centers[used, channel] = sums_lab[used] / totals[used]
+
+        # Each palette color is the pixel-weighted mean RGB of its cluster
+        totals = np.bincount(labels, weights=weights, minlength=len(centers))
+        keep = np.flatnonzero(totals > 0)
+        rgb = np.stack([np.bincount(labels, weights=weights * means[:, channel], minlength=len(centers))
+                        for channel in range(3)], axis=1)
+        return cls(np.round(rgb[keep] / totals[keep, None]).astype(np.uint8))
+
+    def map(self, frame: np.ndarray) -> np.ndarray:
+        """
+        Map a frame to palette indices.
+
+        Args:
+            frame: (H, W, 3) uint8 RGB array
+
+        Returns:
+            (H, W) uint8 array of palette indices
+        """
+        bins = bin_index(frame, BITS)
+        indices = self._table[bins]
+        if np.any(indices < 0):
+            # First time these bins are seen: nearest entry in OKLab
+            new_bins = np.unique(bins[indices < 0])
+            self._table[new_bins] = _nearest(oklab_table(BITS)[new_bins], self._palette_lab)
+            indices = self._table[bins]
+        indices = indices.astype(np.uint8)
+
+        if self._exact_keys is not None:
+            packed = _pack(frame)
+            position = np.minimum(np.searchsorted(self._exact_keys, packed), len(self._exact_keys) - 1)
+            exact = self._exact_keys[position] == packed
+            indices[exact] = self._exact_index[position[exact]]
+        return indices
+
+    def quantize(self, frame: np.ndarray) -> np.ndarray:
+        """
+        Quantize a frame to the palette.
+
+        Args:
+            frame: (H, W, 3) uint8 RGB array
+
+        Returns:
+            (H, W, 3) uint8 RGB array using only palette colors
+        """
+        return self.palette[self.map(frame)]
+
+
+def mean_delta_e(original: np.ndarray, quantized: np.ndarray) -> float:
+    """
+    Mean OKLab distance between two RGB images (x100, so ~1 is a just-visible step).
+
+    Args:
+        original: (..., 3) RGB array
+        quantized: (..., 3) RGB array of the same shape
+
+    Returns:
+        Mean distance
+    """
+    difference = rgb_to_oklab(original) - rgb_to_oklab(quantized)
+    return float(np.sqrt((difference ** 2).sum(axis=-1)).mean() * 100)
+
+
+def fit_palette(frames: list[np.ndarray], num_colors: int, max_frames: Optional[int] = 16) -> OKLabQuantizer:
+    """
+    Fit an OKLabQuantizer on a sample of frames.
+
+    Args:
+        frames: RGB frames
+        num_colors: Palette size
+        max_frames: Frames sampled for the histogram (None = all)
+
+    Returns:
+        OKLabQuantizer
+    """
+    if max_frames is not None and len(frames) > max_frames:
+        frames = [frames[int(i * len(frames) / max_frames)] for i in range(max_frames)]
+    return OKLabQuantizer.fit(frames, num_colors)
@@ -0,0 +1,395 @@
+#!/usr/bin/env python3
+"""
+Render Cache - Reuse finished GIFs for repeated template/parameter combinations.
+
+Results are stored on local disk under a content-addressed key built from the
+template name, its parameters, the seed, the GIFBuilder settings and the
+toolkit version. The cache is bounded in size and evicts least recently used
+entries; it is safe to share one cache directory between worker processes.
+"""
+
+import hashlib
+import io
+import json
+import os
+import sys
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Optional
+
+from core import __version__
+
+if TYPE_CHECKING:
+    import numpy as np
+    from PIL import Image
+
+
+# Bump core.__version__ when rendering output changes, so stale cache entries
+# are never served
+TOOLKIT_VERSION = __version__
+
+DEFAULT_CACHE_DIR = Path(os.environ.get(
+    'SLACK_GIF_CACHE_DIR',
+    Path.home() / '.cache' / 'slack-gif-creator'
+))
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024  # 512 MB
+
+# Writes between scans of the whole cache directory, so entries written by
+# other processes are counted even while this one stays under max_bytes
+RESCAN_INTERVAL = 64
+
+
+def _canonicalize(value):
+    """Convert a parameter value into plain JSON data with a stable layout."""
+    if value is None or isinstance(value, (str, bool, int, float)):
+        return value
+    if isinstance(value, dict):
+        return {str(k): _canonicalize(v) for k, v in sorted(value.items(), key=lambda kv: str(kv[0]))}
+    if isinstance(value, (list, tuple)):
+        return [_canonicalize(v) for v in value]
+    if isinstance(value, Path):
+        return str(value)
+
+    # Arrays and images can only exist if numpy / PIL were imported by the
+    # caller, so a cache lookup never has to import them itself
+    np = sys.modules.get('numpy')
+    if np is not None and isinstance(value, np.generic):
+        return value.item()
+    if np is not None and isinstance(value, np.ndarray):
+        digest = hashlib.sha256(np.ascontiguousarray(value).tobytes()).hexdigest()
+        return {'__ndarray__': [str(value.dtype), list(value.shape), digest]}
+    pil_image = sys.modules.get('PIL.Image')
+    if pil_image is not None and isinstance(value, pil_image.Image):
+        digest = hashlib.sha256(value.tobytes()).hexdigest()
+        return {'__image__': [value.mode, list(value.size), digest]}
+    raise TypeError(f"Can't build a cache key from a {type(value).__name__} value")
+
+
+def make_cache_key(template: str, params: dict, seed: Optional[int] = None,
+                   builder_settings: Optional[dict] = None,
+                   version: str = TOOLKIT_VERSION) -> str:
+    """
+    Build a content-addressed key for a render.
+
+    Args:
+        template: Template name (e.g. 'explode')
+        params: Keyword arguments passed to the template's create function
+        seed: Integer seed (None for unseeded renders)
+        builder_settings: GIFBuilder / save() settings (size, fps, colors, ...)
+        version: Toolkit version the result was rendered with
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    np = sys.modules.get('numpy')
+    integer_types = (int, np.integer) if np is not None else int
+    if seed is not None and not isinstance(seed, integer_types):
+        raise TypeError("Cache keys need an integer seed, not a Generator")
+
+    payload = _canonicalize({
+        'template': template,
+        'params': params,
+        'seed': seed,
+        'builder': builder_settings or {},
+        'version': version,
+    })
+    encoded = json.dumps(payload, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+
+@contextmanager
+def _file_lock(lock_path: Path):
+    """Hold an exclusive inter-process lock (a no-op where flock is unavailable)."""
+    with open(lock_path, 'a+') as lock_file:
+        try:
+            import fcntl
+        except ImportError:
+            yield
+            return
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _atomic_write(path: Path, data: bytes):
+    """Write a file so readers in other processes never see it half-written."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix='.tmp-')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+class RenderCache:
+    """Size-bounded, LRU-evicting on-disk cache of rendered GIFs."""
+
+    def __init__(self, cache_dir: str | Path | None = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Initialize render cache.
+
+        Args:
+            cache_dir: Cache directory (default: $SLACK_GIF_CACHE_DIR or
+                       ~/.cache/slack-gif-creator)
+            max_bytes: Total size above which least recently used entries are evicted
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else DEFAULT_CACHE_DIR
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        # Cache size as of the last scan plus what this process wrote since
+        # (None until the first scan)
+        self._approx_bytes: Optional[int] = None
+        self._writes_since_scan = 0
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def _entry_path(self, key: str, suffix: str) -> Path:
+        # Shard by key prefix to keep directories small
+        return self.cache_dir / key[:2] / f'{key}{suffix}'
+
+    def _read(self, path: Path) -> Optional[bytes]:
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            # Missing, or evicted by another process between lookup and read
+            return None
+        try:
+            # Touch on access: mtime is the LRU clock
+            os.utime(path)
+        except OSError:
+            pass
+        return data
+
+    def get(self, key: str) -> Optional[tuple[bytes, dict]]:
+        """
+        Look up a cached GIF.
+
+        Args:
+            key: Key from make_cache_key()
+
+        Returns:
+            (gif_bytes, info) on a hit, None on a miss
+        """
+        data = self._read(self._entry_path(key, '.gif'))
+        if data is None:
+            self.misses += 1
+            return None
+
+        meta = self._read(self._entry_path(key, '.json'))
+        if meta is None:
+            # Evicted by another process since the .gif was read
+            self.misses += 1
+            return None
+        self.hits += 1
+        return data, json.loads(meta)
+
+    def put(self, key: str, data: bytes, info: Optional[dict] = None):
+        """
+        Store a rendered GIF.
+
+        Args:
+            key: Key from make_cache_key()
+            data: GIF file bytes
+            info: Metadata to return with the GIF on later hits (e.g. save() info)
+        """
+        # Metadata first: the .gif appearing marks the entry as complete
+        meta = json.dumps(info or {}).encode('utf-8')
+        _atomic_write(self._entry_path(key, '.json'), meta)
+        _atomic_write(self._entry_path(key, '.gif'), data)
+        self._wrote(len(meta) + len(data))
+
+    def get_frames(self, key: str) -> Optional['np.ndarray']:
+        """
+        Look up a cached frame stack.
+
+        Args:
+            key: Key from make_cache_key()
+
+        Returns:
+            uint8 array of shape (frames, height, width, 3), or None
+        """
+        import numpy as np
+
+        path = self._entry_path(key, '.npy')
+        try:
+            frames = np.load(path)
+        except (FileNotFoundError, ValueError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return frames
+
+    def put_frames(self, key: str, frames: list['np.ndarray | Image.Image']):
+        """
+        Store an intermediate frame stack (e.g. before quantization).
+
+        Args:
+            key: Key from make_cache_key()
+            frames: Frames as numpy arrays or PIL Images (all the same size)
+        """
+        import numpy as np
+        from PIL import Image
+
+        stack = np.stack([np.asarray(f.convert('RGB')) if isinstance(f, Image.Image) else f
+                          for f in frames]).astype(np.uint8)
+        buffer = io.BytesIO()
+        np.save(buffer, stack)
+        _atomic_write(self._entry_path(key, '.npy'), buffer.getvalue())
+        self._wrote(buffer.tell())
+
+    def _wrote(self, size: int):
+        """Account for a write, and evict if the cache may have outgrown max_bytes."""
+        self._writes_since_scan += 1
+        if self._approx_bytes is not None:
+            self._approx_bytes += size
+        if self._approx_bytes is None or self._approx_bytes > self.max_bytes \
+                or self._writes_since_scan >= RESCAN_INTERVAL:
+            self.evict()
+
+    def _entries(self) -> list[tuple[float, int, Path]]:
+        """List (mtime, size, path) for every cache file."""
+        entries = []
+        for shard in self.cache_dir.iterdir():
+            if not shard.is_dir():
+                continue
+            for path in shard.iterdir():
+                if path.name.startswith('.tmp-'):
+                    continue
+                try:
+                    stat = path.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def evict(self) -> int:
+        """
+        Delete least recently used entries until the cache fits in max_bytes.
+
+        An entry's files (.gif and .json, or .npy) go together; get() touches
+        the .gif, so its mtime is the entry's last use.
+
+        Returns:
+            Number of bytes freed
+        """
+        with _file_lock(self.cache_dir / '.lock'):
+            groups: dict[str, list[tuple[float, int, Path]]] = {}
+            for entry in self._entries():
+                groups.setdefault(entry[2].stem, []).append(entry)
+
+            def last_used(files: list[tuple[float, int, Path]]) -> float:
+                gif_times = [mtime for mtime, _, path in files if path.suffix == '.gif']
+                return gif_times[0] if gif_times else max(mtime for mtime, _, _ in files)
+
+            total = sum(size for files in groups.values() for _, size, _ in files)
+            freed = 0
+
+            for files in sorted(groups.values(), key=last_used):
+                if total - freed <= self.max_bytes:
+                    break
+                for _, size, path in files:
+                    try:
+                        path.unlink()
+                        freed += size
+                    except FileNotFoundError:
+                        pass
+
+            self._approx_bytes = total - freed
+            self._writes_since_scan = 0
+            return freed
+
+    def clear(self):
+        """Delete every cache entry."""
+        with _file_lock(self.cache_dir / '.lock'):
+            for _, _, path in self._entries():
+                try:
+                    path.unlink()
+                except FileNotFoundError:
+                    pass
+            self._approx_bytes = 0
+            self._writes_since_scan = 0
+
+    def stats(self) -> dict:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dictionary with hits, misses, hit_rate (this process) and
+            entries, size_bytes, max_bytes (whole cache directory)
+        """
+        entries = self._entries()
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'entries': sum(1 for _, _, path in entries if path.suffix == '.gif'),
+            'size_bytes': sum(size for _, size, _ in entries),
+            'max_bytes': self.max_bytes,
+        }
+
+
+def render_cached(cache: RenderCache, template: str, create_fn: Callable,
+                  params: dict, output_path: str | Path, seed: Optional[int] = None,
+                  builder_settings: Optional[dict] = None) -> dict:
+    """
+    Render a template to a GIF, reusing a cached result when one exists.
+
+    Args:
+        cache: RenderCache to use
+        template: Template name, part of the cache key
+        create_fn: Template function returning frames (e.g. create_explode_animation)
+        params: Keyword arguments for create_fn
+        output_path: Where to write the GIF
+        seed: Integer seed, passed to create_fn when not None. Randomized
+              templates should always get one - an unseeded render is cached
+              and reused like any other
+        builder_settings: GIFBuilder settings: width, height, fps, plus any
+                          save() options (num_colors, optimize_for_emoji, ...)
+
+    Returns:
+        Dictionary with file info as from GIFBuilder.save(), plus 'cached'
+        (True on a hit) and 'cache_key'
+    """
+    from core.gif_builder import GIFBuilder
+
+    builder_settings = dict(builder_settings or {})
+    key = make_cache_key(template, params, seed, builder_settings)
+    output_path = Path(output_path)
+
+    cached = cache.get(key)
+    if cached is not None:
+        data, info = cached
+        output_path.write_bytes(data)
+        info.update({'path': str(output_path), 'cached': True, 'cache_key': key})
+        return info
+
+    call_params = dict(params)
+    if seed is not None:
+        call_params['seed'] = seed
+    frames = create_fn(**call_params)
+
+    builder = GIFBuilder(
+        width=builder_settings.pop('width', 480),
+        height=builder_settings.pop('height', 480),
+        fps=builder_settings.pop('fps', 15)
+    )
+    builder.add_frames(frames)
+    info = builder.save(output_path, **builder_settings)
+
+    cache.put(key, output_path.read_bytes(), {k: v for k, v in info.items() if k != 'path'})
+    info.update({'cached': False, 'cache_key': key})
+    return info
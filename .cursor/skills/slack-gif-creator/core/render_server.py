@@ -0,0 +1,527 @@
+#!/usr/bin/env python3
+"""
+Render Server - A local JSON-over-HTTP API for rendering GIFs.
+
+An asyncio HTTP/1.1 server in front of a pool of worker processes. Each
+worker imports the templates and loads fonts once at start-up, so a request
+only pays for its own render and encode. Standard library only.
+
+    POST /render     one job (see core/jobs.py) -> the encoded GIF, streamed
+                     (chunked); send 'Accept: application/json' for a JSON
+                     result with the file base64-encoded
+    POST /batch      {"jobs": [...]} -> one JSON line per job as each finishes
+    GET  /templates  template names
+    GET  /health     queue depth and counters
+
+Identical jobs that are in flight at the same time are rendered once and
+the result is shared. At most workers + max_queue jobs are accepted at a
+time; beyond that requests get 503 with Retry-After, so clients back off
+instead of piling up unbounded work.
+"""
+
+import asyncio
+import base64
+import contextlib
+import io
+import json
+import os
+import signal
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import AsyncIterator, Optional
+from urllib.parse import urlsplit
+
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+DEFAULT_MAX_QUEUE = 64
+
+MAX_BODY_BYTES = 1024 * 1024
+STREAM_CHUNK_BYTES = 64 * 1024
+IDLE_TIMEOUT_S = 30
+
+CONTENT_TYPES = {
+    'gif': 'image/gif',
+    'webp': 'image/webp',
+    'apng': 'image/apng',
+    'mp4': 'video/mp4',
+    'webm': 'video/webm',
+}
+
+REASONS = {
+    200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+    411: 'Length Required', 413: 'Payload Too Large', 500: 'Internal Server Error',
+    503: 'Service Unavailable',
+}
+
+# Worker-side state, set once per process by _init_worker
+_cache = None
+
+
+class ServerBusy(Exception):
+    """Raised when accepting a job would overflow the render queue."""
+
+
+class HTTPError(Exception):
+    """An error response to send instead of handling the request."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+def _init_worker(cache_dir: Optional[str], cache_max_bytes: int):
+    """Process pool initializer: import everything and warm the font caches."""
+    global _cache
+    import core
+
+    core.preload()
+
+    if cache_dir:
+        from core.render_cache import RenderCache
+        _cache = RenderCache(cache_dir, max_bytes=cache_max_bytes)
+
+
+def render_job(job: dict) -> dict:
+    """
+    Render one job in memory. Runs in a worker process; never raises.
+
+    Args:
+        job: Job dict (see core/jobs.py)
+
+    Returns:
+        Result with id, template, status ('ok', 'over_budget' or 'error'),
+        the save() info, timings, and 'data' - the encoded file (bytes, or
+        None on error)
+    """
+    from core.jobs import encode_within_budget, job_cache_key, job_call
+
+    start = time.perf_counter()
+    result = {'id': job.get('id'), 'template': job.get('template'), 'worker': os.getpid(),
+              'data': None}
+
+    try:
+        create_fn, params = job_call(job)
+        max_size_kb = job.get('max_size_kb')
+
+        key = None
+        if _cache is not None:
+            key = job_cache_key(job, params)
+            cached = _cache.get(key)
+            if cached is not None:
+                data, info = cached
+                result.update(info)
+                result.update({'status': 'ok', 'cached': True, 'data': data,
+                               'timings': {'total_s': time.perf_counter() - start}})
+                return result
+
+        output = io.BytesIO()
+        with contextlib.redirect_stdout(io.StringIO()):
+            render_start = time.perf_counter()
+            frames = create_fn(**params)
+            render_s = time.perf_counter() - render_start
+
+            encode_start = time.perf_counter()
+            info, attempts = encode_within_budget(frames, output, job)
+            encode_s = time.perf_counter() - encode_start
+
+        info.pop('path', None)
+        within_budget = max_size_kb is None or info['size_kb'] <= max_size_kb
+        data = output.getvalue()
+        result.update(info)
+        result.update({
+            'status': 'ok' if within_budget else 'over_budget',
+            'cached': False,
+            'attempts': attempts,
+            'data': data,
+            'timings': {
+                'render_s': render_s,
+                'encode_s': encode_s,
+                'total_s': time.perf_counter() - start,
+            },
+        })
+
+        if key is not None and within_budget:
+            _cache.put(key, data, info)
+
+    except Exception as e:
+        result.update({
+            'status': 'error',
+            'error': f'{type(e).__name__}: {e}',
+            'traceback': traceback.format_exc(),
+            'timings': {'total_s': time.perf_counter() - start},
+        })
+
+    return result
+
+
+def _job_key(job: dict) -> str:
+    """Key identifying identical jobs (everything but the id)."""
+    from core.render_cache import make_cache_key
+
+    try:
+        return make_cache_key(str(job.get('template')),
+                              {k: v for k, v in job.items() if k != 'id'})
+    except TypeError:
+        raise HTTPError(400, 'Job contains values that are not JSON data') from None
+
+
+def _public(result: dict, include_data: bool = False) -> dict:
+    """A result as JSON data: without the file bytes, or with them base64-encoded."""
+    public = {k: v for k, v in result.items() if k not in ('data', 'traceback')}
+    if include_data and result.get('data') is not None:
+        public['data_base64'] = base64.b64encode(result['data']).decode('ascii')
+    return public
+
+
+class RenderServer:
+    """Asyncio HTTP server rendering jobs on a warm process pool."""
+
+    def __init__(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+                 workers: Optional[int] = None, max_queue: int = DEFAULT_MAX_QUEUE,
+                 cache_dir: Optional[str] = None, cache_max_bytes: int = 512 * 1024 * 1024):
+        """
+        Initialize render server.
+
+        Args:
+            host: Interface to bind (default: localhost only)
+            port: TCP port (0 = pick a free one)
+            workers: Worker processes (None = CPU count)
+            max_queue: Jobs that may wait for a free worker before
+                       requests are refused with 503
+            cache_dir: Optional render cache directory shared by the workers
+            cache_max_bytes: Render cache size limit
+        """
+        self.host = host
+        self.port = port
+        self.workers = workers or os.cpu_count() or 1
+        self.max_queue = max_queue
+        self.cache_dir = cache_dir
+        self.cache_max_bytes = cache_max_bytes
+
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._server: Optional[asyncio.base_events.Server] = None
+        self._in_flight: dict[str, asyncio.Future] = {}
+        self._pending = 0
+        self._restart_lock = asyncio.Lock()
+        self.stats = {'requests': 0, 'jobs': 0, 'coalesced': 0, 'rejected': 0, 'errors': 0}
+
+    @property
+    def capacity(self) -> int:
+        """Most jobs accepted at once (running + queued)."""
+        return self.workers + self.max_queue
+
+    def _start_pool(self):
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_worker,
+            initargs=(self.cache_dir, self.cache_max_bytes)
+        )
+        # Start every worker now so the first requests don't wait for warm-up
+        for future in [self._pool.submit(os.getpid) for _ in range(self.workers)]:
+            future.result()
+
+    async def start(self):
+        """Start the worker pool and begin listening."""
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._start_pool)
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def close(self):
+        """Stop listening and shut the worker pool down."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+
+    def _reserve(self, count: int):
+        if self._pending + count > self.capacity:
+            self.stats['rejected'] += count
+            raise ServerBusy(f'{self._pending} jobs in progress, limit is {self.capacity}')
+        self._pending += count
+
+    def _start_job(self, job: dict) -> asyncio.Future:
+        """Submit a job to the pool, or join the identical job already in flight."""
+        key = _job_key(job)
+        future = self._in_flight.get(key)
+        if future is not None:
+            self.stats['coalesced'] += 1
+            return future
+
+        self._reserve(1)
+        self.stats['jobs'] += 1
+        loop = asyncio.get_running_loop()
+        try:
+            future = loop.run_in_executor(self._pool, render_job, job)
+        except BrokenProcessPool:
+            # A worker died (e.g. out of memory); replace the pool, then run the job
+            future = asyncio.ensure_future(self._render_after_restart(self._pool, job))
+        self._in_flight[key] = future
+
+        def finished(done):
+            self._pending -= 1
+            if self._in_flight.get(key) is done:
+                del self._in_flight[key]
+
+        future.add_done_callback(finished)
+        return future
+
+    async def _restart_pool(self, broken: ProcessPoolExecutor):
+        """Replace a broken pool, once however many jobs noticed it, off the event loop."""
+        async with self._restart_lock:
+            if self._pool is not broken:
+                return  # Already replaced
+            broken.shutdown(wait=False, cancel_futures=True)
+            await asyncio.get_running_loop().run_in_executor(None, self._start_pool)
+
+    async def _render_after_restart(self, broken: ProcessPoolExecutor, job: dict) -> dict:
+        await self._restart_pool(broken)
+        return await asyncio.get_running_loop().run_in_executor(self._pool, render_job, job)
+
+    async def render(self, job: dict) -> dict:
+        """
+        Render a job, sharing the result with identical in-flight jobs.
+
+        Args:
+            job: Job dict
+
+        Returns:
+            Result from render_job(), with this job's id
+        """
+        return await self._result(job, self._start_job(job))
+
+    async def _result(self, job: dict, future: asyncio.Future) -> dict:
+        """Wait for a job started with _start_job()."""
+        try:
+            # Shielded: a client hanging up must not cancel a render others share
+            result = await asyncio.shield(future)
+        except BrokenProcessPool as e:
+            result = {'id': job.get('id'), 'template': job.get('template'), 'status': 'error',
+                      'error': f'{type(e).__name__}: {e}', 'data': None}
+        if result['status'] == 'error':
+            self.stats['errors'] += 1
+        # Coalesced jobs share one result; each caller gets its own id back
+        return {**result, 'id': job.get('id')}
+
+    # HTTP
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                try:
+                    request = await asyncio.wait_for(_read_request(reader), IDLE_TIMEOUT_S)
+                except HTTPError as e:
+                    await _send_json(writer, e.status, {'error': str(e)}, keep_alive=False)
+                    break
+                if request is None:
+                    break
+
+                method, path, headers, body = request
+                keep_alive = headers.get('connection', '').lower() != 'close'
+                self.stats['requests'] += 1
+                try:
+                    await self._route(writer, method, path, headers, body, keep_alive)
+                except HTTPError as e:
+                    await _send_json(writer, e.status, {'error': str(e)}, keep_alive=keep_alive)
+                except ServerBusy as e:
+                    await _send_json(writer, 503, {'error': f'Server busy: {e}'},
+                                     keep_alive=keep_alive, headers={'Retry-After': '1'})
+                if not keep_alive:
+                    break
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+            with contextlib.suppress(ConnectionError):
+                await writer.wait_closed()
+
+    async def _route(self, writer, method: str, path: str, headers: dict, body: bytes,
+                     keep_alive: bool):
+        routes = {
+            '/health': ('GET', self._health),
+            '/templates': ('GET', self._templates),
+            '/render': ('POST', self._render),
+            '/batch': ('POST', self._batch),
+        }
+        if path not in routes:
+            raise HTTPError(404, f'No route for {path}')
+        allowed, handler = routes[path]
+        if method != allowed:
+            raise HTTPError(405, f'{path} only accepts {allowed}')
+        await handler(writer, headers, body, keep_alive)
+
+    async def _health(self, writer, headers, body, keep_alive):
+        from core import __version__
+        await _send_json(writer, 200, {
+            'status': 'ok',
+            'version': __version__,
+            'workers': self.workers,
+            'pending': self._pending,
+            'capacity': self.capacity,
+            'in_flight': len(self._in_flight),
+            **self.stats,
+        }, keep_alive=keep_alive)
+
+    async def _templates(self, writer, headers, body, keep_alive):
+        from core.template_registry import list_templates
+        await _send_json(writer, 200, {'templates': list_templates()}, keep_alive=keep_alive)
+
+    async def _render(self, writer, headers, body, keep_alive):
+        job = _parse_json_object(body)
+        result = await self.render(job)
+
+        if result['status'] == 'error':
+            status = 400 if result.get('error', '').startswith(('ValueError', 'TypeError')) else 500
+            await _send_json(writer, status, _public(result), keep_alive=keep_alive)
+            return
+
+        if 'application/json' in headers.get('accept', ''):
+            await _send_json(writer, 200, _public(result, include_data=True), keep_alive=keep_alive)
+            return
+
+        data = result['data']
+        info = _public(result)
+        await _send_chunked(
+            writer, 200, CONTENT_TYPES.get(result.get('format'), 'application/octet-stream'),
+            _iter_chunks(data),
+            headers={'X-Render-Status': result['status'],
+                     'X-Render-Info': json.dumps(info, separators=(',', ':'))},
+            keep_alive=keep_alive
+        )
+
+    async def _batch(self, writer, headers, body, keep_alive):
+        request = _parse_json_object(body)
+        jobs = request.get('jobs')
+        if not isinstance(jobs, list) or not all(isinstance(job, dict) for job in jobs):
+            raise HTTPError(400, "Body needs 'jobs': a list of job objects")
+        include_data = request.get('include_data', True)
+
+        # Admit the whole batch or none of it (identical jobs count once)
+        unique = {_job_key(job) for job in jobs} - set(self._in_flight)
+        if self._pending + len(unique) > self.capacity:
+            self.stats['rejected'] += len(unique)
+            raise ServerBusy(f'batch of {len(unique)} jobs does not fit ({self._pending} in progress, '
+                             f'limit is {self.capacity})')
+
+        # Start every job before answering, so the batch holds its places in
+        # the queue: nothing is awaited between the check above and here
+        tasks = []
+        for index, job in enumerate(jobs):
+            job.setdefault('id', index)
+            tasks.append(asyncio.ensure_future(self._result(job, self._start_job(job))))
+
+        async def lines() -> AsyncIterator[bytes]:
+            for task in asyncio.as_completed(tasks):
+                result = await task
+                yield (json.dumps(_public(result, include_data)) + '\n').encode('utf-8')
+
+        await _send_chunked(writer, 200, 'application/x-ndjson', lines(), keep_alive=keep_alive)
+
+
+async def _read_request(reader: asyncio.StreamReader) -> Optional[tuple[str, str, dict, bytes]]:
+    """Read one HTTP/1.1 request (None when the client closed the connection)."""
+    request_line = await reader.readline()
+    if not request_line:
+        return None
+    try:
+        method, target, _version = request_line.decode('latin-1').split()
+    except ValueError:
+        raise HTTPError(400, 'Malformed request line') from None
+
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+
+    if 'chunked' in headers.get('transfer-encoding', '').lower():
+        raise HTTPError(411, 'Send a Content-Length; chunked request bodies are not supported')
+    try:
+        length = int(headers.get('content-length', 0))
+    except ValueError:
+        raise HTTPError(400, 'Invalid Content-Length') from None
+    if length > MAX_BODY_BYTES:
+        raise HTTPError(413, f'Request body over {MAX_BODY_BYTES} bytes')
+
+    body = await reader.readexactly(length) if length else b''
+    return method.upper(), urlsplit(target).path, headers, body
+
+
+def _parse_json_object(body: bytes) -> dict:
+    try:
+        value = json.loads(body)
+    except ValueError as e:
+        raise HTTPError(400, f'Invalid JSON: {e}') from None
+    if not isinstance(value, dict):
+        raise HTTPError(400, 'Request body must be a JSON object')
+    return value
+
+
+def _head(status: int, content_type: str, headers: Optional[dict], keep_alive: bool) -> bytes:
+    lines = [f'HTTP/1.1 {status} {REASONS.get(status, "")}', f'Content-Type: {content_type}',
+             f'Connection: {"keep-alive" if keep_alive else "close"}']
+    lines += [f'{name}: {value}' for name, value in (headers or {}).items()]
+    return ('\r\n'.join(lines) + '\r\n').encode('latin-1')
+
+
+async def _send_json(writer: asyncio.StreamWriter, status: int, payload: dict,
+                     keep_alive: bool = True, headers: Optional[dict] = None):
+    body = json.dumps(payload).encode('utf-8')
+    writer.write(_head(status, 'application/json', headers, keep_alive)
+                 + f'Content-Length: {len(body)}\r\n\r\n'.encode('latin-1') + body)
+    await writer.drain()
+
+
+async def _iter_chunks(data: bytes) -> AsyncIterator[bytes]:
+    view = memoryview(data)
+    for offset in range(0, len(view), STREAM_CHUNK_BYTES):
+        yield view[offset:offset + STREAM_CHUNK_BYTES]
+
+
+async def _send_chunked(writer: asyncio.StreamWriter, status: int, content_type: str,
+                        chunks: AsyncIterator[bytes], headers: Optional[dict] = None,
+                        keep_alive: bool = True):
+    """Stream a response with chunked transfer encoding, waiting on slow clients."""
+    writer.write(_head(status, content_type, headers, keep_alive) + b'Transfer-Encoding: chunked\r\n\r\n')
+    async for chunk in chunks:
+        if chunk:
+            writer.write(f'{len(chunk):x}\r\n'.encode('latin-1'))
+            writer.write(chunk)
+            writer.write(b'\r\n')
+            await writer.drain()
+    writer.write(b'0\r\n\r\n')
+    await writer.drain()
+
+
+async def serve(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, workers: Optional[int] = None,
+                max_queue: int = DEFAULT_MAX_QUEUE, cache_dir: Optional[str] = None,
+                cache_max_bytes: int = 512 * 1024 * 1024, ready=None):
+    """
+    Run a render server until SIGINT or SIGTERM.
+
+    Args:
+        host, port, workers, max_queue, cache_dir, cache_max_bytes: As for RenderServer
+        ready: Optional callback, called with the server once it is listening
+    """
+    server = RenderServer(host, port, workers=workers, max_queue=max_queue,
+                          cache_dir=cache_dir, cache_max_bytes=cache_max_bytes)
+    await server.start()
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        with contextlib.suppress(NotImplementedError):
+            loop.add_signal_handler(sig, stop.set)
+
+    if ready is not None:
+        ready(server)
+    try:
+        await stop.wait()
+    finally:
+        await server.close()
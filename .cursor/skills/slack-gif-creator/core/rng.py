@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""
+Random Numbers - Seedable random number generators for effects and templates.
+
+Effects and templates take a `seed` argument instead of using the global
+`random` module, so the same seed always produces the same GIF. That makes
+renders reproducible, cacheable and safe to split across processes.
+"""
+
+from typing import Union
+
+import numpy as np
+
+
+# Anything accepted where a seed is expected
+SeedLike = Union[int, np.random.Generator, None]
+
+
+def get_rng(seed: SeedLike = None) -> np.random.Generator:
+    """
+    Get a NumPy random generator from a seed.
+
+    Args:
+        seed: Integer seed, an existing Generator (returned as-is so callers
+              can share one stream), or None for fresh OS entropy
+
+    Returns:
+        numpy.random.Generator
+    """
+    if isinstance(seed, np.random.Generator):
+        return seed
+    return np.random.default_rng(seed)
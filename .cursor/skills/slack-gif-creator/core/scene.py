@@ -0,0 +1,566 @@
+#!/usr/bin/env python3
+"""
+Scene Graph - Retained-mode rendering that only redraws what changed.
+
+Instead of drawing every element onto a blank canvas each frame, build a
+Scene of nodes (sprites, emoji, text, shapes, particle systems), change
+their properties between frames, and let a SceneRenderer redraw just the
+regions that changed on top of the previous frame. A frame where one small
+sprite moves costs about as much as drawing that sprite twice, however
+many other nodes are in the scene.
+
+    scene = Scene(480, 480)
+    ball = scene.add(ShapeNode('circle', size=60, fill=(255, 80, 80), position=(40, 240)))
+    scene.add(TextNode('GOAL!', font_size=48, position=(240, 80)))
+
+    renderer = SceneRenderer(scene)
+    frames = []
+    for i in range(30):
+        ball.position = (40 + i * 14, 240)
+        frames.append(renderer.render())
+
+Every node has position (the node's center), scale, rotation (degrees,
+counter-clockwise), opacity (0.0-1.0), z (higher draws on top) and visible.
+Rendered frames carry the rectangles that changed since the previous frame
+in frame.info['dirty_rects'], which GIFBuilder uses to skip comparing
+unchanged pixels.
+"""
+
+import math
+from abc import ABC, abstractmethod
+from typing import Callable, Optional
+
+import numpy as np
+from PIL import Image, ImageDraw
+
+from core.frame_composer import get_emoji_font
+from core.typography import get_font
+
+
+# (left, top, right, bottom), right/bottom exclusive
+Rect = tuple[int, int, int, int]
+
+# Redraw the whole frame once the changed area is this big a fraction of it
+FULL_REDRAW_FRACTION = 0.6
+
+
+def _union(a: Rect, b: Rect) -> Rect:
+    return (min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3]))
+
+
+def _intersects(a: Rect, b: Rect) -> bool:
+    return a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]
+
+
+def _area(rect: Rect) -> int:
+    return max(0, rect[2] - rect[0]) * max(0, rect[3] - rect[1])
+
+
+def _unpremultiply(image: Image.Image) -> Image.Image:
+    """Undo premultiplied alpha (PIL draws embedded-color text into RGBA premultiplied)."""
+    pixels = np.array(image, dtype=np.float32)
+    alpha = pixels[..., 3:]
+    np.divide(pixels[..., :3] * 255.0, alpha, out=pixels[..., :3], where=alpha > 0)
+    return Image.fromarray(np.clip(np.rint(pixels), 0, 255).astype(np.uint8), 'RGBA')
+
+
+def merge_rects(rects: list[Rect], bounds: Rect, full_fraction: float = FULL_REDRAW_FRACTION) -> list[Rect]:
+    """
+    Clip rectangles to bounds and merge the overlapping ones.
+
+    Args:
+        rects: Rectangles as (left, top, right, bottom)
+        bounds: Frame rectangle to clip to
+        full_fraction: Return just bounds once the merged area covers this
+                       fraction of it (one big redraw beats many small ones)
+
+    Returns:
+        Non-overlapping list of rectangles
+    """
+    clipped = []
+    for rect in rects:
+        rect = (max(rect[0], bounds[0]), max(rect[1], bounds[1]),
+                min(rect[2], bounds[2]), min(rect[3], bounds[3]))
+        if _area(rect) > 0:
+            clipped.append(rect)
+
+    merged = []
+    for rect in clipped:
+        # Absorb every merged rect this one touches, until nothing changes
+        changed = True
+        while changed:
+            changed = False
+            for other in merged:
+                if _intersects(rect, other):
+                    merged.remove(other)
+                    rect = _union(rect, other)
+                    changed = True
+                    break
+        merged.append(rect)
+
+    if sum(_area(rect) for rect in merged) >= full_fraction * _area(bounds):
+        return [bounds]
+    return merged
+
+
+class Node(ABC):
+    """Base class for scene nodes."""
+
+    def __init__(self, position: tuple[float, float] = (0, 0), scale: float = 1.0,
+                 rotation: float = 0.0, opacity: float = 1.0, z: int = 0, visible: bool = True):
+        """
+        Initialize node.
+
+        Args:
+            position: (x, y) of the node's center in the frame
+            scale: Size multiplier
+            rotation: Rotation in degrees (counter-clockwise)
+            opacity: 0.0 (invisible) to 1.0 (opaque)
+            z: Drawing order; higher z draws on top (ties: order added)
+            visible: Whether the node is drawn
+        """
+        self.position = position
+        self.scale = scale
+        self.rotation = rotation
+        self.opacity = opacity
+        self.z = z
+        self.visible = visible
+
+    @abstractmethod
+    def state(self) -> tuple:
+        """Everything that affects how the node looks; a change makes it dirty."""
+
+    @abstractmethod
+    def bounds(self) -> Optional[Rect]:
+        """Frame rectangle the node draws into (None if it draws nothing)."""
+
+    @abstractmethod
+    def draw(self, canvas: Image.Image, origin: tuple[int, int]):
+        """
+        Draw the node onto a canvas covering part of the frame.
+
+        Args:
+            canvas: RGB image to draw on
+            origin: Frame coordinates of the canvas's top-left corner
+        """
+
+
+class SpriteNode(Node):
+    """An RGBA image placed, scaled, rotated and faded as a whole."""
+
+    def __init__(self, image: Optional[Image.Image] = None, anchor: Optional[tuple[float, float]] = None,
+                 **node_args):
+        """
+        Initialize sprite node.
+
+        Args:
+            image: Sprite image (converted to RGBA)
+            anchor: Point in the image placed at position (default: its center)
+            **node_args: position, scale, rotation, opacity, z, visible
+        """
+        super().__init__(**node_args)
+        self.image = image.convert('RGBA') if image is not None else None
+        self.anchor = anchor
+        self._transformed_key = None
+        self._transformed = None
+
+    def content_key(self) -> tuple:
+        """Identifies the sprite content; subclasses rebuild the sprite when it changes."""
+        return (id(self.image), self.anchor)
+
+    def sprite(self) -> tuple[Image.Image, tuple[float, float]]:
+        """Untransformed sprite and its anchor point."""
+        anchor = self.anchor or (self.image.width / 2, self.image.height / 2)
+        return self.image, anchor
+
+    def _transformed_sprite(self) -> tuple[Image.Image, tuple[float, float]]:
+        """Sprite with scale, rotation and opacity applied (cached until they change)."""
+        key = (self.content_key(), self.scale, self.rotation, self.opacity)
+        if key == self._transformed_key:
+            return self._transformed
+
+        image, (ax, ay) = self.sprite()
+        if self.scale != 1.0:
+            size = (max(1, round(image.width * self.scale)), max(1, round(image.height * self.scale)))
+            ax, ay = ax * size[0] / image.width, ay * size[1] / image.height
+            image = image.resize(size, Image.Resampling.LANCZOS)
+        if self.rotation % 360:
+            # Rotate about the center; the anchor turns with the image
+            cx, cy = image.width / 2, image.height / 2
+            angle = math.radians(self.rotation)
+            dx, dy = ax - cx, ay - cy
+            image = image.rotate(self.rotation, resample=Image.Resampling.BICUBIC, expand=True)
+            ax = image.width / 2 + dx * math.cos(angle) + dy * math.sin(angle)
+            ay = image.height / 2 - dx * math.sin(angle) + dy * math.cos(angle)
+        if self.opacity < 1.0:
+            image = image.copy()
+            opacity = max(0.0, self.opacity)
+            image.putalpha(image.getchannel('A').point(lambda a: int(a * opacity)))
+
+        self._transformed_key = key
+        self._transformed = (image, (ax, ay))
+        return self._transformed
+
+    def _top_left(self) -> tuple[Image.Image, tuple[int, int]]:
+        image, (ax, ay) = self._transformed_sprite()
+        return image, (round(self.position[0] - ax), round(self.position[1] - ay))
+
+    def state(self) -> tuple:
+        image, top_left = self._top_left()
+        return (self.visible, self.z, self._transformed_key, top_left)
+
+    def bounds(self) -> Optional[Rect]:
+        if not self.visible or self.opacity <= 0:
+            return None
+        image, (left, top) = self._top_left()
+        return (left, top, left + image.width, top + image.height)
+
+    def draw(self, canvas: Image.Image, origin: tuple[int, int]):
+        image, (left, top) = self._top_left()
+        canvas.paste(image, (left - origin[0], top - origin[1]), image)
+
+
+class EmojiNode(SpriteNode):
+    """An emoji, drawn once into a sprite."""
+
+    def __init__(self, emoji: str, size: int = 60, **node_args):
+        """
+        Initialize emoji node.
+
+        Args:
+            emoji: Emoji character(s)
+            size: Emoji size in pixels (minimum 12)
+            **node_args: position (center of the size x size box), scale,
+                         rotation, opacity, z, visible
+        """
+        super().__init__(**node_args)
+        self.emoji = emoji
+        self.size = size
+        self._sprite_key = None
+        self._sprite = None
+
+    def content_key(self) -> tuple:
+        return (self.emoji, self.size)
+
+    def sprite(self) -> tuple[Image.Image, tuple[float, float]]:
+        key = self.content_key()
+        if key != self._sprite_key:
+            size = max(12, self.size)
+            font = get_emoji_font(size)
+            left, top, right, bottom = ImageDraw.Draw(Image.new('RGBA', (1, 1))).textbbox(
+                (0, 0), self.emoji, font=font, embedded_color=True)
+            # Text origin inside the sprite (glyphs can extend left of / above it)
+            ox, oy = -min(left, 0), -min(top, 0)
+            image = Image.new('RGBA', (max(1, right + ox), max(1, bottom + oy)), (0, 0, 0, 0))
+            draw = ImageDraw.Draw(image)
+            try:
+                draw.text((ox, oy), self.emoji, font=font, embedded_color=True)
+                image = _unpremultiply(image)
+            except Exception:
+                draw.text((ox, oy), self.emoji, font=font, fill=(0, 0, 0, 255))
+            # Same placement as draw_emoji_enhanced at (x - size // 2, y - size // 2)
+            self._sprite = (image, (ox + self.size // 2, oy + self.size // 2))
+            self._sprite_key = key
+        return self._sprite
+
+
+class TextNode(SpriteNode):
+    """Text with an optional outline, drawn once into a sprite."""
+
+    def __init__(self, text: str, font_size: int = 40, color: tuple[int, int, int] = (255, 255, 255),
+                 outline_color: tuple[int, int, int] = (0, 0, 0), outline_width: int = 3,
+                 bold: bool = True, **node_args):
+        """
+        Initialize text node.
+
+        Args:
+            text: Text to draw
+            font_size: Font size in pixels
+            color: Text color
+            outline_color: Outline color
+            outline_width: Outline width in pixels (0 = no outline)
+            bold: Use the bold font
+            **node_args: position (center of the text), scale, rotation,
+                         opacity, z, visible
+        """
+        super().__init__(**node_args)
+        self.text = text
+        self.font_size = font_size
+        self.color = color
+        self.outline_color = outline_color
+        self.outline_width = outline_width
+        self.bold = bold
+        self._sprite_key = None
+        self._sprite = None
+
+    def content_key(self) -> tuple:
+        return (self.text, self.font_size, self.color, self.outline_color, self.outline_width, self.bold)
+
+    def sprite(self) -> tuple[Image.Image, tuple[float, float]]:
+        key = self.content_key()
+        if key != self._sprite_key:
+            font = get_font(self.font_size, bold=self.bold)
+            stroke = self.outline_width
+            left, top, right, bottom = ImageDraw.Draw(Image.new('RGBA', (1, 1))).textbbox(
+                (0, 0), self.text, font=font, stroke_width=stroke)
+            image = Image.new('RGBA', (max(1, right - left), max(1, bottom - top)), (0, 0, 0, 0))
+            ImageDraw.Draw(image).text((-left, -top), self.text, font=font, fill=self.color,
+                                       stroke_width=stroke, stroke_fill=self.outline_color)
+            self._sprite = (image, (image.width / 2, image.height / 2))
+            self._sprite_key = key
+        return self._sprite
+
+
+class ShapeNode(SpriteNode):
+    """A circle, rectangle or star, drawn once into a sprite."""
+
+    SHAPES = ('circle', 'rectangle', 'star')
+
+    def __init__(self, shape: str = 'circle', size: int | tuple[int, int] = 40,
+                 fill: Optional[tuple[int, int, int]] = (255, 255, 255),
+                 outline: Optional[tuple[int, int, int]] = None, outline_width: int = 0,
+                 **node_args):
+        """
+        Initialize shape node.
+
+        Args:
+            shape: 'circle', 'rectangle' or 'star'
+            size: Diameter, or (width, height)
+            fill: Fill color (None for none)
+            outline: Outline color (None for none)
+            outline_width: Outline width in pixels
+            **node_args: position (center), scale, rotation, opacity, z, visible
+        """
+        if shape not in self.SHAPES:
+            raise ValueError(f"Unknown shape: {shape}. Use one of {', '.join(self.SHAPES)}")
+        super().__init__(**node_args)
+        self.shape = shape
+        self.size = size
+        self.fill = fill
+        self.outline = outline
+        self.outline_width = outline_width
+        self._sprite_key = None
+        self._sprite = None
+
+    def content_key(self) -> tuple:
+        return (self.shape, self.size, self.fill, self.outline, self.outline_width)
+
+    def sprite(self) -> tuple[Image.Image, tuple[float, float]]:
+        key = self.content_key()
+        if key != self._sprite_key:
+            width, height = self.size if isinstance(self.size, tuple) else (self.size, self.size)
+            image = Image.new('RGBA', (max(1, width), max(1, height)), (0, 0, 0, 0))
+            draw = ImageDraw.Draw(image)
+            box = [0, 0, width - 1, height - 1]
+            style = {'fill': self.fill, 'outline': self.outline, 'width': self.outline_width}
+            if self.shape == 'circle':
+                draw.ellipse(box, **style)
+            elif self.shape == 'rectangle':
+                draw.rectangle(box, **style)
+            else:
+                cx, cy = width / 2, height / 2
+                points = []
+                for i in range(10):
+                    angle = i * math.pi / 5 - math.pi / 2
+                    radius = (width / 2 if i % 2 == 0 else width / 5)
+                    points.append((cx + radius * math.cos(angle), cy + radius * math.sin(angle) * height / width))
+                draw.polygon(points, **style)
+            self._sprite = (image, (width / 2, height / 2))
+            self._sprite_key = key
+        return self._sprite
+
+
+class ParticleNode(Node):
+    """
+    A visual_effects.ParticleSystem in the scene.
+
+    Call system.update() between frames as usual; the node is dirty while
+    any particle moves. position, scale, rotation and opacity don't apply -
+    particles are drawn where they are.
+    """
+
+    def __init__(self, system, z: int = 0, visible: bool = True):
+        """
+        Initialize particle node.
+
+        Args:
+            system: ParticleSystem to draw
+            z: Drawing order
+            visible: Whether the particles are drawn
+        """
+        super().__init__(z=z, visible=visible)
+        self.system = system
+
+    def state(self) -> tuple:
+        particles = tuple(
+            (int(p.x), int(p.y), p.size, p.shape, p.color, round(p.get_alpha(), 3))
+            for p in self.system.particles if p.is_alive()
+        )
+        return (self.visible, self.z, particles)
+
+    def bounds(self) -> Optional[Rect]:
+        rect = None
+        if not self.visible:
+            return None
+        for particle in self.system.particles:
+            if not particle.is_alive():
+                continue
+            x, y, reach = int(particle.x), int(particle.y), max(1, int(particle.size)) + 2
+            box = (x - reach, y - reach, x + reach + 1, y + reach + 1)
+            rect = box if rect is None else _union(rect, box)
+        return rect
+
+    def draw(self, canvas: Image.Image, origin: tuple[int, int]):
+        # Particles draw at their own coordinates; shift them into the canvas
+        for particle in self.system.particles:
+            saved = particle.x, particle.y
+            particle.x -= origin[0]
+            particle.y -= origin[1]
+            try:
+                particle.render(canvas)
+            finally:
+                particle.x, particle.y = saved
+
+
+class Scene:
+    """A background plus a set of nodes drawn in z order."""
+
+    def __init__(self, width: int = 480, height: int = 480,
+                 bg_color: tuple[int, int, int] = (255, 255, 255),
+                 background: Optional[Image.Image] = None):
+        """
+        Initialize scene.
+
+        Args:
+            width: Frame width
+            height: Frame height
+            bg_color: Background color
+            background: Background image (e.g. a gradient); overrides bg_color
+        """
+        self.width = width
+        self.height = height
+        self.bg_color = bg_color
+        self.background = background.convert('RGB').resize((width, height)) if background else None
+        self.nodes: list[Node] = []
+
+    def add(self, node: Node) -> Node:
+        """Add a node and return it."""
+        self.nodes.append(node)
+        return node
+
+    def remove(self, node: Node):
+        """Remove a node."""
+        self.nodes.remove(node)
+
+    def ordered_nodes(self) -> list[Node]:
+        """Nodes in drawing order (z, then order added)."""
+        return sorted(self.nodes, key=lambda node: node.z)
+
+    def draw_region(self, rect: Rect) -> Image.Image:
+        """
+        Draw the scene inside one rectangle of the frame.
+
+        Args:
+            rect: Frame rectangle (left, top, right, bottom)
+
+        Returns:
+            RGB image of the rectangle's size
+        """
+        left, top, right, bottom = rect
+        if self.background is not None:
+            canvas = self.background.crop(rect)
+        else:
+            canvas = Image.new('RGB', (right - left, bottom - top), self.bg_color)
+        for node in self.ordered_nodes():
+            if not node.visible:
+                continue
+            node_rect = node.bounds()
+            if node_rect is not None and _intersects(node_rect, rect):
+                node.draw(canvas, (left, top))
+        return canvas
+
+
+class SceneRenderer:
+    """Renders successive frames of a scene, redrawing only what changed."""
+
+    def __init__(self, scene: Scene, full_redraw_fraction: float = FULL_REDRAW_FRACTION):
+        """
+        Initialize scene renderer.
+
+        Args:
+            scene: Scene to render
+            full_redraw_fraction: Redraw the whole frame once the changed area
+                                  covers this fraction of it
+        """
+        self.scene = scene
+        self.full_redraw_fraction = full_redraw_fraction
+        self._buffer: Optional[Image.Image] = None
+        # id(node) -> (node, state, bounds) as of the previous frame
+        self._previous: dict[int, tuple[Node, tuple, Optional[Rect]]] = {}
+        self.stats = {'frames': 0, 'pixels_drawn': 0}
+
+    def _damage(self) -> list[Rect]:
+        """Rectangles whose content changed since the previous frame."""
+        damage = []
+        current = {}
+        for node in self.scene.nodes:
+            state, rect = node.state(), node.bounds()
+            current[id(node)] = (node, state, rect)
+            previous = self._previous.get(id(node))
+            if previous is None:
+                damage.append(rect)
+            elif previous[1] != state:
+                damage += [previous[2], rect]
+        for node_id, (node, state, rect) in self._previous.items():
+            if node_id not in current:
+                damage.append(rect)  # Removed from the scene
+        self._previous = current
+        return [rect for rect in damage if rect is not None]
+
+    def render(self) -> Image.Image:
+        """
+        Render the next frame.
+
+        Returns:
+            RGB frame; frame.info['dirty_rects'] lists the rectangles that
+            differ from the previous frame ([] if nothing changed; the whole
+            frame on the first call)
+        """
+        frame_rect = (0, 0, self.scene.width, self.scene.height)
+        damage = self._damage()
+
+        if self._buffer is None:
+            dirty = [frame_rect]
+        else:
+            dirty = merge_rects(damage, frame_rect, self.full_redraw_fraction)
+
+        if dirty == [frame_rect]:
+            self._buffer = self.scene.draw_region(frame_rect)
+        else:
+            for rect in dirty:
+                self._buffer.paste(self.scene.draw_region(rect), rect[:2])
+
+        self.stats['frames'] += 1
+        self.stats['pixels_drawn'] += sum(_area(rect) for rect in dirty)
+
+        frame = self._buffer.copy()
+        frame.info['dirty_rects'] = dirty
+        return frame
+
+    def render_sequence(self, num_frames: int, update: Callable[[int], None]) -> list[Image.Image]:
+        """
+        Render an animation.
+
+        Args:
+            num_frames: Number of frames
+            update: Called with the frame index before each frame is
+                    rendered; moves/changes nodes
+
+        Returns:
+            List of frames (each with info['dirty_rects'])
+        """
+        frames = []
+        for i in range(num_frames):
+            update(i)
+            frames.append(self.render())
+        return frames
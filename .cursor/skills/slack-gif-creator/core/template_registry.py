@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Template Registry - Look up animation templates by name.
+
+Maps short template names (as used in batch manifests) to the module and
+create function that renders them. Template modules are imported on first
+use, so looking up one template doesn't import all of them.
+"""
+
+import importlib
+from typing import Callable
+
+
+# name -> (module in templates/, create function)
+TEMPLATES = {
+    'bounce': ('bounce', 'create_bounce_animation'),
+    'explode': ('explode', 'create_explode_animation'),
+    'particle_burst': ('explode', 'create_particle_burst'),
+    'fade': ('fade', 'create_fade_animation'),
+    'crossfade': ('fade', 'create_crossfade'),
+    'fade_to_color': ('fade', 'create_fade_to_color'),
+    'flip': ('flip', 'create_flip_animation'),
+    'quick_flip': ('flip', 'create_quick_flip'),
+    'nope_flip': ('flip', 'create_nope_flip'),
+    'kaleidoscope': ('kaleidoscope', 'create_kaleidoscope_animation'),
+    'morph': ('morph', 'create_morph_animation'),
+    'reaction_morph': ('morph', 'create_reaction_morph'),
+    'shape_morph': ('morph', 'create_shape_morph'),
+    'move': ('move', 'create_move_animation'),
+    'pulse': ('pulse', 'create_pulse_animation'),
+    'attention_pulse': ('pulse', 'create_attention_pulse'),
+    'breathing': ('pulse', 'create_breathing_animation'),
+    'shake': ('shake', 'create_shake_animation'),
+    'slide': ('slide', 'create_slide_animation'),
+    'multi_slide': ('slide', 'create_multi_slide'),
+    'spin': ('spin', 'create_spin_animation'),
+    'loading_spinner': ('spin', 'create_loading_spinner'),
+    'wiggle': ('wiggle', 'create_wiggle_animation'),
+    'excited_wiggle': ('wiggle', 'create_excited_wiggle'),
+    'zoom': ('zoom', 'create_zoom_animation'),
+    'explosion_zoom': ('zoom', 'create_explosion_zoom'),
+    'mind_blown_zoom': ('zoom', 'create_mind_blown_zoom'),
+}
+
+
+def list_templates() -> list[str]:
+    """Get all registered template names."""
+    return sorted(TEMPLATES)
+
+
+def get_template(name: str) -> Callable:
+    """
+    Get a template's create function by name, importing its module if needed.
+
+    Args:
+        name: Template name (see list_templates())
+
+    Returns:
+        Create function returning a list of frames
+    """
+    if name not in TEMPLATES:
+        raise ValueError(f"Unknown template: {name!r}. Available: {', '.join(list_templates())}")
+
+    module_name, func_name = TEMPLATES[name]
+    module = importlib.import_module(f'templates.{module_name}')
+    return getattr(module, func_name)
@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+Text Layout - Cached text measurement, font fitting and line wrapping.
+
+Measuring text with PIL costs a layout pass every call, and fitting text by
+trying sizes one after another multiplies that. Here measurements are
+cached by (text, size, bold), glyph advance widths are cached per font, and
+fitting binary-searches the font size, so re-fitting the same caption (every
+frame of an animation, every job with the same text) is a few dictionary
+lookups:
+
+    size = fit_font_size('PARTY TIME', max_width=440, max_height=80)
+    layout = fit_wrapped_text(long_message, max_width=440, max_height=200)
+    layout['font_size'], layout['lines']       # e.g. 31, ['Deploy finished', 'with no errors']
+
+The caches follow the font override (typography.set_font_override()).
+"""
+
+from functools import lru_cache
+from typing import Optional
+
+from PIL import Image, ImageDraw
+
+from core.typography import get_font
+
+
+MIN_FONT_SIZE = 10
+
+# Extra pixels between wrapped lines (PIL's multiline default)
+LINE_SPACING = 4
+
+# Reused for multiline measurements, which only ImageDraw provides
+_scratch = ImageDraw.Draw(Image.new('RGB', (1, 1)))
+
+
+@lru_cache(maxsize=8192)
+def text_bbox(text: str, font_size: int, bold: bool = True) -> tuple[int, int, int, int]:
+    """
+    Bounding box of text drawn at (0, 0), the same as ImageDraw.textbbox().
+
+    Args:
+        text: Text to measure (may contain newlines)
+        font_size: Font size in pixels
+        bold: Use bold font variant
+
+    Returns:
+        (left, top, right, bottom)
+    """
+    font = get_font(font_size, bold=bold)
+    if '\n' in text:
+        return _scratch.multiline_textbbox((0, 0), text, font=font)
+    return font.getbbox(text)
+
+
+def text_size(text: str, font_size: int, bold: bool = True) -> tuple[int, int]:
+    """
+    Width and height of text's bounding box.
+
+    Args:
+        text: Text to measure
+        font_size: Font size in pixels
+        bold: Use bold font variant
+
+    Returns:
+        (width, height) tuple
+    """
+    left, top, right, bottom = text_bbox(text, font_size, bold)
+    return (right - left, bottom - top)
+
+
+@lru_cache(maxsize=256)
+def font_metrics(font_size: int, bold: bool = True) -> dict:
+    """
+    Vertical metrics of a font.
+
+    Args:
+        font_size: Font size in pixels
+        bold: Use bold font variant
+
+    Returns:
+        Dictionary with ascent, descent and line_height (ascent + descent)
+    """
+    ascent, descent = get_font(font_size, bold=bold).getmetrics()
+    return {'ascent': ascent, 'descent': descent, 'line_height': ascent + descent}
+
+
+@lru_cache(maxsize=256)
+def _advance_table(font_size: int, bold: bool) -> dict:
+    # Character -> advance width, filled in as characters are first seen
+    return {}
+
+
+def advance_widths(text: str, font_size: int, bold: bool = True) -> list[float]:
+    """
+    Advance width of each character (how far the pen moves after it).
+
+    Args:
+        text: Characters to look up
+        font_size: Font size in pixels
+        bold: Use bold font variant
+
+    Returns:
+        One width per character
+    """
+    table = _advance_table(font_size, bold)
+    widths = []
+    for char in text:
+        width = table.get(char)
+        if width is None:
+            width = table[char] = get_font(font_size, bold=bold).getlength(char)
+        widths.append(width)
+    return widths
+
+
+def wrap_text(text: str, max_width: float, font_size: int, bold: bool = True) -> list[str]:
+    """
+    Break text into lines no wider than max_width, at spaces where possible.
+
+    Line widths come from cached per-character advance widths (kerning is
+    ignored, which is within a pixel or two per line). Newlines in the text
+    always break; a word wider than max_width is split between characters.
+
+    Args:
+        text: Text to wrap
+        max_width: Maximum line width in pixels
+        font_size: Font size in pixels
+        bold: Use bold font variant
+
+    Returns:
+        List of lines
+    """
+    space = advance_widths(' ', font_size, bold)[0]
+    lines = []
+    for paragraph in text.split('\n'):
+        line, line_width = '', 0.0
+        for word in paragraph.split():
+            char_widths = advance_widths(word, font_size, bold)
+            word_width = sum(char_widths)
+            if line and line_width + space + word_width <= max_width:
+                line, line_width = f'{line} {word}', line_width + space + word_width
+                continue
+            if line:
+                lines.append(line)
+            line, line_width = '', 0.0
+            # Split words that don't fit on a line of their own
+            for char, width in zip(word, char_widths):
+                if line and line_width + width > max_width:
+                    lines.append(line)
+                    line, line_width = '', 0.0
+                line, line_width = line + char, line_width + width
+        lines.append(line)
+    return lines
+
+
+def _candidate_sizes(max_size: int, min_size: int, step: int) -> list[int]:
+    return list(range(max_size, min_size - 1, -step))
+
+
+def _largest_fitting(sizes: list[int], fits) -> Optional[int]:
+    """Binary search sizes (largest first) for the largest one that fits."""
+    low, high = 0, len(sizes)  # sizes[high:] fit, as far as we know
+    while low < high:
+        middle = (low + high) // 2
+        if fits(sizes[middle]):
+            high = middle
+        else:
+            low = middle + 1
+    return sizes[low] if low < len(sizes) else None
+
+
+def fit_font_size(text: str, max_width: int, max_height: int, max_size: int = 60,
+                  min_size: int = MIN_FONT_SIZE, bold: bool = True, step: int = 1) -> int:
+    """
+    Largest font size at which text fits in a box, by binary search.
+
+    Args:
+        text: Text to fit (one line, or lines separated by newlines)
+        max_width: Maximum width in pixels
+        max_height: Maximum height in pixels
+        max_size: Largest size to try
+        min_size: Smallest size; returned if nothing fits
+        bold: Use bold font variant
+        step: Only try max_size, max_size - step, ...
+
+    Returns:
+        Font size
+    """
+    def fits(size: int) -> bool:
+        width, height = text_size(text, size, bold)
+        return width <= max_width and height <= max_height
+
+    return _largest_fitting(_candidate_sizes(max_size, min_size, step), fits) or min_size
+
+
+def layout_lines(lines: list[str], font_size: int, bold: bool = True,
+                 spacing: int = LINE_SPACING) -> dict:
+    """
+    Size of a block of lines drawn one under another.
+
+    Args:
+        lines: Lines of text
+        font_size: Font size in pixels
+        bold: Use bold font variant
+        spacing: Extra pixels between lines
+
+    Returns:
+        Dictionary with font_size, lines, width (widest line), height,
+        line_height and spacing; line i is drawn at y = i * (line_height + spacing)
+    """
+    line_height = font_metrics(font_size, bold)['line_height']
+    width = max((text_bbox(line, font_size, bold)[2] for line in lines), default=0)
+    return {
+        'font_size': font_size,
+        'lines': lines,
+        'width': width,
+        'height': len(lines) * line_height + (len(lines) - 1) * spacing,
+        'line_height': line_height,
+        'spacing': spacing,
+    }
+
+
+@lru_cache(maxsize=1024)
+def fit_wrapped_text(text: str, max_width: int, max_height: int, max_size: int = 60,
+                     min_size: int = MIN_FONT_SIZE, bold: bool = True,
+                     spacing: int = LINE_SPACING) -> dict:
+    """
+    Largest font size at which text, wrapped to max_width, fits in a box.
+
+    Args:
+        text: Text to fit
+        max_width: Maximum width in pixels
+        max_height: Maximum height in pixels
+        max_size: Largest size to try
+        min_size: Smallest size; used (possibly overflowing) if nothing fits
+        bold: Use bold font variant
+        spacing: Extra pixels between lines
+
+    Returns:
+        Layout dictionary as from layout_lines(); don't modify it (it is
+        cached and shared)
+    """
+    def layout(size: int) -> dict:
+        return layout_lines(wrap_text(text, max_width, size, bold), size, bold, spacing)
+
+    def fits(size: int) -> bool:
+        block = layout(size)
+        return block['width'] <= max_width and block['height'] <= max_height
+
+    return layout(_largest_fitting(_candidate_sizes(max_size, min_size, 1), fits) or min_size)
+
+
+def clear_caches():
+    """Drop all cached measurements (called when the fonts change)."""
+    for cached in (text_bbox, font_metrics, _advance_table, fit_wrapped_text):
+        cached.cache_clear()
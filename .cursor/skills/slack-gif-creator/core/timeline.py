@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Timeline - Keyframed property tracks evaluated for every frame at once.
+
+Instead of hand-coding per-frame math (t = i / (num_frames - 1), phase
+branches, interpolate() calls), declare each animated property as a track
+of keyframes and evaluate the whole timeline in one vectorized pass:
+
+    timeline = Timeline(num_frames=30)
+    timeline.add_track('scale', [(0.0, 0.1), (0.3, 2.4, 'ease_out'), (1.0, 2.0, 'elastic_out')])
+    timeline.add_track('color', [(0.0, (255, 0, 0)), (1.0, (0, 0, 255), 'ease_in_out')])
+    columns = timeline.evaluate()     # {'scale': (30,) array, 'color': (30, 3) array}
+
+Keyframes are (time, value) or (time, value, easing). Time is animation
+progress from 0.0 to 1.0; values are numbers or tuples (positions, colors).
+The easing names the curve used to arrive at that keyframe from the previous
+one (default linear). Before the first keyframe and after the last, tracks
+hold their end values.
+
+Frames whose rendered properties don't change can be skipped:
+
+    sizes = (base_size * columns['scale']).astype(int)
+    frames = render_changed_frames(changed_frames(sizes), lambda i: draw(sizes[i]))
+"""
+
+from typing import Callable, Optional
+
+import numpy as np
+
+from core.easing import get_easing
+
+
+class Track:
+    """One keyframed property."""
+
+    def __init__(self, keyframes: list[tuple]):
+        """
+        Initialize track.
+
+        Args:
+            keyframes: (time, value) or (time, value, easing) tuples, in time order
+        """
+        if not keyframes:
+            raise ValueError("A track needs at least one keyframe")
+
+        self.times = np.array([float(keyframe[0]) for keyframe in keyframes])
+        if np.any(np.diff(self.times) < 0):
+            raise ValueError("Keyframe times must be in increasing order")
+
+        try:
+            self.values = np.array([keyframe[1] for keyframe in keyframes], dtype=np.float64)
+        except ValueError:
+            raise ValueError("Keyframe values must all have the same shape")
+        if self.values.ndim > 2:
+            raise ValueError("Keyframe values must be numbers or flat tuples")
+
+        self.easings = [keyframe[2] if len(keyframe) > 2 else 'linear' for keyframe in keyframes]
+
+    def evaluate(self, t: np.ndarray) -> np.ndarray:
+        """
+        Evaluate the track at many times at once.
+
+        Args:
+            t: Array of animation progress values
+
+        Returns:
+            Array of values: shape (len(t),) for numbers, (len(t), n) for tuples
+        """
+        t = np.asarray(t, dtype=np.float64)
+        if len(self.times) == 1:
+            return np.repeat(self.values[:1], len(t), axis=0)
+
+        # Segment i runs from keyframe i to keyframe i + 1; a frame exactly on
+        # a keyframe starts the next segment
+        segment = np.clip(np.searchsorted(self.times, t, side='right') - 1, 0, len(self.times) - 2)
+        start, end = self.times[segment], self.times[segment + 1]
+        span = end - start
+        local_t = np.where(span > 0, (t - start) / np.where(span > 0, span, 1.0), 1.0)
+        local_t = np.clip(local_t, 0.0, 1.0)
+
+        # One vectorized easing call per distinct curve
+        eased = np.empty_like(local_t)
+        arriving = np.array(self.easings)[segment + 1]
+        for name in set(arriving.tolist()):
+            mask = arriving == name
+            eased[mask] = get_easing(name, vectorized=True)(local_t[mask])
+
+        start_value, end_value = self.values[segment], self.values[segment + 1]
+        if self.values.ndim == 2:
+            eased = eased[:, None]
+        return start_value + (end_value - start_value) * eased
+
+
+class Timeline:
+    """A set of named tracks over a fixed number of frames."""
+
+    def __init__(self, num_frames: int):
+        """
+        Initialize timeline.
+
+        Args:
+            num_frames: Number of frames; frame i is at progress i / (num_frames - 1)
+        """
+        if num_frames < 1:
+            raise ValueError("num_frames must be at least 1")
+        self.num_frames = num_frames
+        self.tracks: dict[str, Track] = {}
+
+    def add_track(self, name: str, keyframes: list[tuple]) -> Track:
+        """
+        Add (or replace) a track.
+
+        Args:
+            name: Property name, e.g. 'scale', 'opacity', 'position', 'color'
+            keyframes: (time, value) or (time, value, easing) tuples
+
+        Returns:
+            The track
+        """
+        self.tracks[name] = Track(keyframes)
+        return self.tracks[name]
+
+    def frame_times(self, frames: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Animation progress of each frame.
+
+        Args:
+            frames: Frame indices (None = all frames)
+
+        Returns:
+            Array of progress values from 0.0 to 1.0
+        """
+        if frames is None:
+            frames = np.arange(self.num_frames)
+        frames = np.asarray(frames)
+        if self.num_frames == 1:
+            return np.zeros(len(frames))
+        return frames / (self.num_frames - 1)
+
+    def evaluate(self, frames: Optional[np.ndarray] = None) -> dict[str, np.ndarray]:
+        """
+        Evaluate every track for every frame (or just the given frames).
+
+        Args:
+            frames: Frame indices to evaluate (None = all frames)
+
+        Returns:
+            Dict of property name -> array with one row per frame
+        """
+        t = self.frame_times(frames)
+        return {name: track.evaluate(t) for name, track in self.tracks.items()}
+
+
+def changed_frames(*columns: np.ndarray) -> np.ndarray:
+    """
+    Find the frames that differ from the frame before.
+
+    Pass the per-frame values that actually affect the picture, already
+    rounded the way the renderer rounds them (e.g. integer sizes), so frames
+    that would render identically compare equal.
+
+    Args:
+        *columns: Arrays with one row per frame
+
+    Returns:
+        Boolean array, True where a frame needs rendering (always True for frame 0)
+    """
+    num_frames = len(columns[0])
+    changed = np.zeros(num_frames, dtype=bool)
+    if num_frames:
+        changed[0] = True
+    for column in columns:
+        column = np.asarray(column)
+        differs = column[1:] != column[:-1]
+        if differs.ndim > 1:
+            differs = differs.reshape(len(differs), -1).any(axis=1)
+        changed[1:] |= differs
+    return changed
+
+
+def render_changed_frames(changed: np.ndarray, render_frame: Callable[[int], object]) -> list:
+    """
+    Render only the frames that changed; repeat the previous frame otherwise.
+
+    Args:
+        changed: Boolean array from changed_frames()
+        render_frame: Called with a frame index; returns the PIL frame
+
+    Returns:
+        List of frames (repeats are copies, so frames can be edited independently)
+    """
+    frames = []
+    for i, needs_render in enumerate(changed):
+        frames.append(render_frame(i) if needs_render or not frames else frames[-1].copy())
+    return frames
@@ -6,6 +6,9 @@ This module provides high-quality text rendering that looks crisp and profession
 in GIFs, with outlines for readability and effects for visual impact.
 """
 
+import os
+import sys
+from functools import lru_cache
 from PIL import Image, ImageDraw, ImageFont
 from typing import Optional
 
@@ -21,11 +24,63 @@ TYPOGRAPHY_SCALE = {
     'tiny': 16,    # Tiny text
 }
 
+# Font to use instead of the system fonts: a font file path, or BUNDLED_FONT
+# for Pillow's built-in font, which renders the same on every machine
+FONT_OVERRIDE_ENV = 'SLACK_GIF_FONT'
+BUNDLED_FONT = 'bundled'
+_font_override: Optional[str] = os.environ.get(FONT_OVERRIDE_ENV) or None
 
+
+def set_font_override(font: Optional[str]):
+    """
+    Render all text and emoji with one font instead of the system fonts.
+
+    Used for reproducible output (e.g. benchmarks) on machines with
+    different fonts installed. Also settable with $SLACK_GIF_FONT.
+
+    Args:
+        font: Path to a TrueType/OpenType font, BUNDLED_FONT ('bundled') for
+              Pillow's built-in font, or None to go back to the system fonts
+    """
+    global _font_override
+    _font_override = str(font) if font is not None else None
+
+    from core.frame_composer import get_emoji_font
+    from core.text_layout import clear_caches
+    get_font.cache_clear()
+    get_emoji_font.cache_clear()
+    clear_caches()
+    # Atlases are only built once something draws with them
+    glyph_atlas = sys.modules.get('core.glyph_atlas')
+    if glyph_atlas is not None:
+        glyph_atlas.clear_atlases()
+
+
+def load_override_font(size: int) -> Optional[ImageFont.ImageFont]:
+    """
+    Load the override font at a size.
+
+    Args:
+        size: Font size in pixels
+
+    Returns:
+        ImageFont object, or None if no override is set
+    """
+    if _font_override is None:
+        return None
+    if _font_override == BUNDLED_FONT:
+        return ImageFont.load_default(size)
+    return ImageFont.truetype(_font_override, size)
+
+
+@lru_cache(maxsize=None)
 def get_font(size: int, bold: bool = False) -> ImageFont.FreeTypeFont:
     """
     Get a font with fallback support.
 
+    Fonts are loaded once per process and cached by (size, bold). The
+    override font (see set_font_override()) wins over the system fonts.
+
     Args:
         size: Font size in pixels
         bold: Use bold variant if available
@@ -33,6 +88,10 @@ def get_font(size: int, bold: bool = False) -> ImageFont.FreeTypeFont:
     Returns:
         ImageFont object
     """
+    override = load_override_font(size)
+    if override is not None:
+        return override
+
     # Try multiple font paths for cross-platform support
     font_paths = [
         # macOS fonts
@@ -48,7 +107,7 @@ def get_font(size: int, bold: bool = False) -> ImageFont.FreeTypeFont:
     for font_path in font_paths:
         try:
             return ImageFont.truetype(font_path, size)
-        except:
+        except (OSError, ValueError):
             continue
 
     # Ultimate fallback
@@ -91,9 +150,7 @@ def draw_text_with_outline(
 
     # Calculate position for centering
     if centered:
-        bbox = draw.textbbox((0, 0), text, font=font)
-        text_width = bbox[2] - bbox[0]
-        text_height = bbox[3] - bbox[1]
+        text_width, text_height = get_text_size(text, font_size, bold)
         x = position[0] - text_width // 2
         y = position[1] - text_height // 2
         position = (x, y)
@@ -144,9 +201,7 @@ def draw_text_with_shadow(
 
     # Calculate position for centering
     if centered:
-        bbox = draw.textbbox((0, 0), text, font=font)
-        text_width = bbox[2] - bbox[0]
-        text_height = bbox[3] - bbox[1]
+        text_width, text_height = get_text_size(text, font_size, bold)
         x = position[0] - text_width // 2
         y = position[1] - text_height // 2
         position = (x, y)
@@ -194,9 +249,7 @@ def draw_text_with_glow(
 
     # Calculate position for centering
     if centered:
-        bbox = draw.textbbox((0, 0), text, font=font)
-        text_width = bbox[2] - bbox[0]
-        text_height = bbox[3] - bbox[1]
+        text_width, text_height = get_text_size(text, font_size, bold)
         x = position[0] - text_width // 2
         y = position[1] - text_height // 2
         position = (x, y)
@@ -253,9 +306,7 @@ def draw_text_in_box(
     font = get_font(font_size, bold=bold)
 
     # Get text dimensions
-    bbox = draw.textbbox((0, 0), text, font=font)
-    text_width = bbox[2] - bbox[0]
-    text_height = bbox[3] - bbox[1]
+    text_width, text_height = get_text_size(text, font_size, bold)
 
     # Calculate box position
     if centered:
@@ -295,6 +346,8 @@ def get_text_size(text: str, font_size: int, bold: bool = True) -> tuple[int, in
     """
     Get the dimensions of text without drawing it.
 
+    Measurements are cached by (text, font_size, bold); see core.text_layout.
+
     Args:
         text: Text to measure
         font_size: Font size in pixels
@@ -303,14 +356,8 @@ def get_text_size(text: str, font_size: int, bold: bool = True) -> tuple[int, in
     Returns:
         (width, height) tuple
     """
-    font = get_font(font_size, bold=bold)
-    # Create temporary image to measure
-    temp_img = Image.new('RGB', (1, 1))
-    draw = ImageDraw.Draw(temp_img)
-    bbox = draw.textbbox((0, 0), text, font=font)
-    width = bbox[2] - bbox[0]
-    height = bbox[3] - bbox[1]
-    return (width, height)
+    from core.text_layout import text_size
+    return text_size(text, font_size, bold)
 
 
 def get_optimal_font_size(text: str, max_width: int, max_height: int,
@@ -318,6 +365,9 @@ def get_optimal_font_size(text: str, max_width: int, max_height: int,
     """
     Find the largest font size that fits within given dimensions.
 
+    Tries start_size, start_size - 2, ... down to 10 by binary search over
+    cached measurements.
+
     Args:
         text: Text to size
         max_width: Maximum width in pixels
@@ -327,13 +377,55 @@ def get_optimal_font_size(text: str, max_width: int, max_height: int,
     Returns:
         Optimal font size
     """
-    font_size = start_size
-    while font_size > 10:
-        width, height = get_text_size(text, font_size)
-        if width <= max_width and height <= max_height:
-            return font_size
-        font_size -= 2
-    return 10  # Minimum font size
+    from core.text_layout import fit_font_size
+    return fit_font_size(text, max_width, max_height, max_size=start_size, min_size=10, step=2)
+
+
+def draw_wrapped_text(
+    frame: Image.Image,
+    text: str,
+    box: tuple[int, int, int, int],
+    max_font_size: int = 60,
+    text_color: tuple[int, int, int] = (255, 255, 255),
+    outline_color: tuple[int, int, int] = (0, 0, 0),
+    outline_width: int = 2,
+    bold: bool = True
+) -> Image.Image:
+    """
+    Draw text wrapped and sized to fill a box, each line centered.
+
+    Good for long captions (e.g. a whole Slack message): the largest font
+    size at which the wrapped text fits is found once and cached, so drawing
+    the same caption on every frame costs only the drawing.
+
+    Args:
+        frame: PIL Image to draw on
+        text: Text to draw
+        box: (left, top, right, bottom) area to fill
+        max_font_size: Largest font size to use
+        text_color: RGB color for text fill
+        outline_color: RGB color for outline
+        outline_width: Width of outline in pixels (0 for none)
+        bold: Use bold font variant
+
+    Returns:
+        Modified frame
+    """
+    from core.text_layout import fit_wrapped_text
+
+    left, top, right, bottom = box
+    inset = 2 * outline_width
+    layout = fit_wrapped_text(text, right - left - inset, bottom - top - inset,
+                              max_size=max_font_size, bold=bold)
+    center_x = (left + right) // 2
+    y = (top + bottom - layout['height']) // 2
+    for line in layout['lines']:
+        x = center_x - get_text_size(line, layout['font_size'], bold)[0] // 2
+        draw_text_with_outline(frame, line, (x, y), font_size=layout['font_size'],
+                               text_color=text_color, outline_color=outline_color,
+                               outline_width=outline_width, bold=bold)
+        y += layout['line_height'] + layout['spacing']
+    return frame
 
 
 def scale_font_for_frame(base_size: int, frame_width: int, frame_height: int) -> int:
@@ -6,29 +6,42 @@ These validators help ensure your GIFs meet Slack's size and dimension constrain
 """
 
 from pathlib import Path
+from typing import Optional
 
+from core.gif_inspector import GIFSource, as_gif_buffer, inspect_gif
 
-def check_slack_size(gif_path: str | Path, is_emoji: bool = True) -> tuple[bool, dict]:
+
+# Slack upload limits
+SLACK_EMOJI_LIMIT_KB = 64
+SLACK_MESSAGE_LIMIT_KB = 2048
+
+
+def check_slack_size(gif_path: GIFSource, is_emoji: bool = True, verbose: bool = True) -> tuple[bool, dict]:
     """
     Check if GIF meets Slack size limits.
 
     Args:
-        gif_path: Path to GIF file
+        gif_path: Path to GIF file, or the GIF in memory (bytes, buffer, BytesIO)
         is_emoji: True for emoji GIF (64KB limit), False for message GIF (2MB limit)
+        verbose: Print feedback
 
     Returns:
         Tuple of (passes: bool, info: dict with details)
     """
-    gif_path = Path(gif_path)
+    buffer = as_gif_buffer(gif_path)
+    if buffer is not None:
+        size_bytes = buffer.nbytes
+    else:
+        gif_path = Path(gif_path)
 
-    if not gif_path.exists():
-        return False, {'error': f'File not found: {gif_path}'}
+        if not gif_path.exists():
+            return False, {'error': f'File not found: {gif_path}'}
 
-    size_bytes = gif_path.stat().st_size
+        size_bytes = gif_path.stat().st_size
     size_kb = size_bytes / 1024
     size_mb = size_kb / 1024
 
-    limit_kb = 64 if is_emoji else 2048
+    limit_kb = SLACK_EMOJI_LIMIT_KB if is_emoji else SLACK_MESSAGE_LIMIT_KB
     limit_mb = limit_kb / 1024
 
     passes = size_kb <= limit_kb
@@ -44,19 +57,21 @@ def check_slack_size(gif_path: str | Path, is_emoji: bool = True) -> tuple[bool,
     }
 
     # Print feedback
+    log = print if verbose else (lambda *args, **kwargs: None)
     if passes:
-        print(f"✓ {size_kb:.1f} KB - within {limit_kb} KB limit")
+        log(f"✓ {size_kb:.1f} KB - within {limit_kb} KB limit")
     else:
-        print(f"✗ {size_kb:.1f} KB - exceeds {limit_kb} KB limit")
+        log(f"✗ {size_kb:.1f} KB - exceeds {limit_kb} KB limit")
         overage_kb = size_kb - limit_kb
         overage_percent = (overage_kb / limit_kb) * 100
-        print(f"  Over by: {overage_kb:.1f} KB ({overage_percent:.1f}%)")
-        print(f"  Try: fewer frames, fewer colors, or simpler design")
+        log(f"  Over by: {overage_kb:.1f} KB ({overage_percent:.1f}%)")
+        log(f"  Try: fewer frames, fewer colors, or simpler design")
 
     return passes, info
 
 
-def validate_dimensions(width: int, height: int, is_emoji: bool = True) -> tuple[bool, dict]:
+def validate_dimensions(width: int, height: int, is_emoji: bool = True,
+                        verbose: bool = True) -> tuple[bool, dict]:
     """
     Check if dimensions are suitable for Slack.
 
@@ -64,10 +79,13 @@ def validate_dimensions(width: int, height: int, is_emoji: bool = True) -> tuple
         width: Frame width in pixels
         height: Frame height in pixels
         is_emoji: True for emoji GIF, False for message GIF
+        verbose: Print feedback
 
     Returns:
         Tuple of (passes: bool, info: dict with details)
     """
+    log = print if verbose else (lambda *args, **kwargs: None)
+
     info = {
         'width': width,
         'height': height,
@@ -84,13 +102,13 @@ def validate_dimensions(width: int, height: int, is_emoji: bool = True) -> tuple
         info['acceptable'] = acceptable
 
         if optimal:
-            print(f"✓ {width}x{height} - optimal for emoji")
+            log(f"✓ {width}x{height} - optimal for emoji")
             passes = True
         elif acceptable:
-            print(f"⚠ {width}x{height} - acceptable but 128x128 is optimal")
+            log(f"⚠ {width}x{height} - acceptable but 128x128 is optimal")
             passes = True
         else:
-            print(f"✗ {width}x{height} - emoji should be square, 128x128 recommended")
+            log(f"✗ {width}x{height} - emoji should be square, 128x128 recommended")
             passes = False
     else:
         # Message GIFs should be square-ish and reasonable size
@@ -104,105 +122,280 @@ def validate_dimensions(width: int, height: int, is_emoji: bool = True) -> tuple
         is_square_ish = aspect_ratio <= 2.0
 
         if is_square_ish and reasonable_size:
-            print(f"✓ {width}x{height} - good for message GIF")
+            log(f"✓ {width}x{height} - good for message GIF")
             passes = True
         elif is_square_ish:
-            print(f"⚠ {width}x{height} - square-ish but unusual size")
+            log(f"⚠ {width}x{height} - square-ish but unusual size")
             passes = True
         elif reasonable_size:
-            print(f"⚠ {width}x{height} - good size but not square-ish")
+            log(f"⚠ {width}x{height} - good size but not square-ish")
             passes = True
         else:
-            print(f"✗ {width}x{height} - unusual dimensions for Slack")
+            log(f"✗ {width}x{height} - unusual dimensions for Slack")
             passes = False
 
+    info['passes'] = passes
     return passes, info
 
 
-def validate_gif(gif_path: str | Path, is_emoji: bool = True) -> tuple[bool, dict]:
+def validate_gif(gif_path: GIFSource, is_emoji: bool = True, verbose: bool = True) -> tuple[bool, dict]:
     """
     Run all validations on a GIF file.
 
     Args:
-        gif_path: Path to GIF file
+        gif_path: Path to GIF file, or the GIF in memory (bytes, buffer, BytesIO)
         is_emoji: True for emoji GIF, False for message GIF
+        verbose: Print a validation report
 
     Returns:
         Tuple of (all_pass: bool, results: dict)
     """
-    from PIL import Image
+    log = print if verbose else (lambda *args, **kwargs: None)
 
-    gif_path = Path(gif_path)
+    buffer = as_gif_buffer(gif_path)
+    if buffer is None:
+        gif_path = Path(gif_path)
 
-    if not gif_path.exists():
-        return False, {'error': f'File not found: {gif_path}'}
+        if not gif_path.exists():
+            return False, {'error': f'File not found: {gif_path}'}
 
-    print(f"\nValidating {gif_path.name} as {'emoji' if is_emoji else 'message'} GIF:")
-    print("=" * 60)
+    name = gif_path.name if buffer is None else 'in-memory GIF'
+    log(f"\nValidating {name} as {'emoji' if is_emoji else 'message'} GIF:")
+    log("=" * 60)
 
     # Check file size
-    size_pass, size_info = check_slack_size(gif_path, is_emoji)
+    source = gif_path if buffer is None else buffer
+    size_pass, size_info = check_slack_size(source, is_emoji, verbose)
 
-    # Check dimensions
+    # Read dimensions, frame count and delays from the block structure,
+    # without decoding any frames
     try:
-        with Image.open(gif_path) as img:
-            width, height = img.size
-            dim_pass, dim_info = validate_dimensions(width, height, is_emoji)
-
-            # Count frames
-            frame_count = 0
-            try:
-                while True:
-                    img.seek(frame_count)
-                    frame_count += 1
-            except EOFError:
-                pass
-
-            # Get duration if available
-            try:
-                duration_ms = img.info.get('duration', 100)
-                total_duration = (duration_ms * frame_count) / 1000
-                fps = frame_count / total_duration if total_duration > 0 else 0
-            except:
-                duration_ms = None
-                total_duration = None
-                fps = None
-
+        gif_info = inspect_gif(source)
     except Exception as e:
         return False, {'error': f'Failed to read GIF: {e}'}
+    if gif_info['truncated']:
+        return False, {'error': 'Failed to read GIF: file is truncated'}
+    if not gif_info['frame_count']:
+        return False, {'error': 'Failed to read GIF: no frames'}
+
+    width, height = gif_info['width'], gif_info['height']
+    dim_pass, dim_info = validate_dimensions(width, height, is_emoji, verbose)
 
-    print(f"\nFrames: {frame_count}")
+    frame_count = gif_info['frame_count']
+    frame_delays_ms = [frame['delay_ms'] for frame in gif_info['frames']]
+    total_duration = gif_info['duration_ms'] / 1000 if gif_info['duration_ms'] else None
+    fps = frame_count / total_duration if total_duration else None
+
+    log(f"\nFrames: {frame_count}")
     if total_duration:
-        print(f"Duration: {total_duration:.1f}s @ {fps:.1f} fps")
+        log(f"Duration: {total_duration:.1f}s @ {fps:.1f} fps")
 
     all_pass = size_pass and dim_pass
 
     results = {
-        'file': str(gif_path),
+        'file': str(gif_path) if buffer is None else None,
         'passes': all_pass,
         'size': size_info,
         'dimensions': dim_info,
         'frame_count': frame_count,
         'duration_seconds': total_duration,
-        'fps': fps
+        'fps': fps,
+        'frame_delays_ms': frame_delays_ms
     }
 
-    print("=" * 60)
+    log("=" * 60)
     if all_pass:
-        print("✓ All validations passed!")
+        log("✓ All validations passed!")
     else:
-        print("✗ Some validations failed")
-    print()
+        log("✗ Some validations failed")
+    log()
 
     return all_pass, results
 
 
-def get_optimization_suggestions(results: dict) -> list[str]:
+def _detect_dithering(frame, tile_size: int = 16) -> tuple[float, Optional[tuple[int, int, int, int]]]:
+    """
+    Find dithered areas in a decoded frame.
+
+    Dithering shows up as pixels that change color almost everywhere, but only
+    by small steps. Flat areas barely change, and real detail (edges, text)
+    changes in big steps.
+
+    Returns:
+        Tuple of (fraction of tiles that look dithered, (x0, y0, x1, y1)
+        bounding box of those tiles or None)
+    """
+    import numpy as np
+
+    pixels = np.asarray(frame.convert('RGB'), dtype=np.int16)
+    # Neighbor differences, summed over channels
+    horizontal = np.abs(np.diff(pixels, axis=1)).sum(axis=2)[:-1, :]
+    vertical = np.abs(np.diff(pixels, axis=0)).sum(axis=2)[:, :-1]
+    diff = np.maximum(horizontal, vertical)
+
+    rows, cols = diff.shape[0] // tile_size, diff.shape[1] // tile_size
+    if rows == 0 or cols == 0:
+        return 0.0, None
+
+    tiles = diff[:rows * tile_size, :cols * tile_size].reshape(rows, tile_size, cols, tile_size)
+    changed = tiles > 0
+    change_rate = changed.mean(axis=(1, 3))
+    mean_step = np.where(changed, tiles, 0).sum(axis=(1, 3)) / np.maximum(changed.sum(axis=(1, 3)), 1)
+    dithered = (change_rate > 0.4) & (mean_step < 60)
+
+    if not dithered.any():
+        return 0.0, None
+
+    tile_rows, tile_cols = np.nonzero(dithered)
+    bbox = (int(tile_cols.min() * tile_size), int(tile_rows.min() * tile_size),
+            int((tile_cols.max() + 1) * tile_size), int((tile_rows.max() + 1) * tile_size))
+    return float(dithered.mean()), bbox
+
+
+def _encoded_size(frame, colors: int, dither: bool = True, size: Optional[tuple[int, int]] = None,
+                  smooth_box: Optional[tuple[int, int, int, int]] = None) -> int:
+    """
+    Encode one frame as a GIF in memory and return its size in bytes.
+
+    smooth_box blurs a region first, to simulate it without dither noise.
+    """
+    import io
+    from PIL import Image, ImageFilter
+
+    frame = frame.convert('RGB')
+    if smooth_box is not None:
+        frame.paste(frame.crop(smooth_box).filter(ImageFilter.BoxBlur(2)), smooth_box[:2])
+    if size is not None and frame.size != size:
+        frame = frame.resize(size, Image.Resampling.LANCZOS)
+    quantized = frame.quantize(colors=colors, method=Image.Quantize.MEDIANCUT)
+    if dither:
+        # PIL only dithers when mapping onto an existing palette
+        quantized = frame.quantize(palette=quantized, dither=Image.Dither.FLOYDSTEINBERG)
+    buffer = io.BytesIO()
+    quantized.save(buffer, format='GIF')
+    return buffer.tell()
+
+
+def analyze_gif_costs(gif_path: GIFSource, is_emoji: bool = True, sample_frames: int = 3) -> dict:
+    """
+    Break a GIF's size down by frame and color table, and estimate savings.
+
+    Byte attribution comes from the block structure (no decoding). The
+    costliest frames are then decoded to look for dithering and re-encoded
+    in memory with different settings; each setting's size ratio on those
+    samples is applied to the whole file's frame data to estimate a saving.
+
+    Args:
+        gif_path: Path to GIF file, or the GIF in memory (bytes, buffer, BytesIO)
+        is_emoji: True for emoji GIF, False for message GIF
+        sample_frames: Number of costliest frames to decode and re-encode
+
+    Returns:
+        Dictionary with file_size, frame_bytes (per frame), palette_bytes
+        (global/local), other_bytes, costliest_frames, dithered_frames and
+        estimates (list of {action, saving_bytes, description}, largest first)
+    """
+    import io
+    from PIL import Image
+
+    buffer = as_gif_buffer(gif_path)
+    gif_info = inspect_gif(gif_path if buffer is None else buffer)
+    frames = gif_info['frames']
+    file_size = gif_info['file_size']
+
+    # Each frame's bytes include its control extension, descriptor and local
+    # color table; color tables are also reported separately
+    frame_bytes = [frame['end'] - frame['offset'] for frame in frames]
+    global_palette_bytes = 3 * gif_info['global_palette_size']
+    local_palette_bytes = sum(3 * frame['local_palette_size'] for frame in frames)
+    total_frame_bytes = sum(frame_bytes)
+
+    ranked = sorted(range(len(frames)), key=lambda i: frame_bytes[i], reverse=True)
+    costliest = [
+        {'index': i, 'bytes': frame_bytes[i], 'share': frame_bytes[i] / file_size if file_size else 0.0}
+        for i in ranked[:sample_frames]
+    ]
+
+    analysis = {
+        'file': str(gif_path) if buffer is None else None,
+        'file_size': file_size,
+        'frame_bytes': frame_bytes,
+        'palette_bytes': {'global': global_palette_bytes, 'local': local_palette_bytes},
+        'other_bytes': file_size - total_frame_bytes - global_palette_bytes,
+        'costliest_frames': costliest,
+        'dithered_frames': [],
+        'estimates': [],
+    }
+
+    if not frames:
+        return analysis
+
+    # Decode the sample frames (GIF frames decode sequentially, so walk in order)
+    sample_indices = sorted(i for i in ranked[:sample_frames])
+    samples = []
+    with Image.open(gif_path if buffer is None else io.BytesIO(buffer)) as img:
+        for i in sample_indices:
+            img.seek(i)
+            samples.append(img.convert('RGB'))
+
+    for i, sample in zip(sample_indices, samples):
+        fraction, bbox = _detect_dithering(sample)
+        if fraction > 0:
+            analysis['dithered_frames'].append({'index': i, 'dithered_fraction': fraction, 'bbox': bbox})
+
+    colors = max([gif_info['global_palette_size']] + [f['local_palette_size'] for f in frames])
+    colors = max(2, min(colors, 256))
+    baseline = sum(_encoded_size(sample, colors) for sample in samples)
+
+    def add_estimate(action, variant_size, description):
+        saving = int(total_frame_bytes * (1 - variant_size / baseline)) if baseline else 0
+        if saving > 0:
+            analysis['estimates'].append({'action': action, 'saving_bytes': saving,
+                                          'description': description})
+
+    if colors > 16:
+        fewer = max(16, colors // 2)
+        add_estimate('reduce_colors',
+                     sum(_encoded_size(sample, fewer) for sample in samples),
+                     f"Use {fewer} colors instead of {colors}")
+
+    if analysis['dithered_frames']:
+        boxes = {frame['index']: frame['bbox'] for frame in analysis['dithered_frames']}
+        add_estimate('disable_dithering',
+                     sum(_encoded_size(sample, colors, dither=False, smooth_box=boxes.get(i))
+                         for i, sample in zip(sample_indices, samples)),
+                     "Disable dithering / flatten gradients in dithered areas")
+
+    width, height = gif_info['width'], gif_info['height']
+    if is_emoji and (width > 128 or height > 128):
+        add_estimate('resize',
+                     sum(_encoded_size(sample, colors, size=(128, 128)) for sample in samples),
+                     f"Resize from {width}x{height} to 128x128")
+
+    if len(frames) > 2:
+        # Dropping frames removes their bytes outright
+        saving = sum(frame_bytes[1::2])
+        analysis['estimates'].append({
+            'action': 'drop_frames', 'saving_bytes': saving,
+            'description': f"Keep every other frame ({len(frames)} -> {len(frames[::2])} frames)"
+        })
+
+    analysis['estimates'].sort(key=lambda e: e['saving_bytes'], reverse=True)
+    return analysis
+
+
+def get_optimization_suggestions(results: dict, analyze: bool = True,
+                                 gif: Optional[GIFSource] = None) -> list[str]:
     """
     Get suggestions for optimizing a GIF based on validation results.
 
+    When the file is over its size limit, the GIF is analyzed with
+    analyze_gif_costs() and suggestions are ranked by estimated saving.
+
     Args:
         results: Results dict from validate_gif()
+        analyze: Analyze the file for targeted suggestions (False = generic advice)
+        gif: The GIF to analyze when it isn't a file (bytes, buffer, BytesIO)
 
     Returns:
         List of suggestion strings
@@ -216,7 +409,32 @@ def get_optimization_suggestions(results: dict) -> list[str]:
         # Size suggestions
         if not size_info.get('passes', True):
             overage = size_info['size_kb'] - size_info['limit_kb']
-            if size_info['type'] == 'emoji':
+            is_emoji = size_info['type'] == 'emoji'
+
+            analysis = None
+            source = gif if gif is not None else results.get('file')
+            if analyze and source is not None:
+                try:
+                    analysis = analyze_gif_costs(source, is_emoji=is_emoji)
+                except Exception:
+                    analysis = None
+
+            if analysis and analysis['estimates']:
+                suggestions.append(f"Reduce file size by {overage:.1f} KB (estimated savings):")
+                for estimate in analysis['estimates']:
+                    suggestions.append(f"  - {estimate['description']}: ~{estimate['saving_bytes'] / 1024:.1f} KB")
+
+                costliest = ', '.join(f"#{f['index']} ({f['bytes'] / 1024:.1f} KB, {f['share']:.0%})"
+                                      for f in analysis['costliest_frames'])
+                suggestions.append(f"  Costliest frames: {costliest}")
+                for frame in analysis['dithered_frames']:
+                    suggestions.append(f"  Frame #{frame['index']} is {frame['dithered_fraction']:.0%} "
+                                       f"dithered around {frame['bbox']} - flatten gradients there")
+                palette_bytes = analysis['palette_bytes']['local']
+                if palette_bytes > analysis['file_size'] * 0.05:
+                    suggestions.append(f"  Local color tables use {palette_bytes / 1024:.1f} KB - "
+                                       "use one global palette")
+            elif is_emoji:
                 suggestions.append(f"Reduce file size by {overage:.1f} KB:")
                 suggestions.append("  - Limit to 10-12 frames")
                 suggestions.append("  - Use 32-40 colors maximum")
@@ -238,12 +456,12 @@ def get_optimization_suggestions(results: dict) -> list[str]:
 
 
 # Convenience function for quick checks
-def is_slack_ready(gif_path: str | Path, is_emoji: bool = True, verbose: bool = True) -> bool:
+def is_slack_ready(gif_path: GIFSource, is_emoji: bool = True, verbose: bool = True) -> bool:
     """
     Quick check if GIF is ready for Slack.
 
     Args:
-        gif_path: Path to GIF file
+        gif_path: Path to GIF file, or the GIF in memory (bytes, buffer, BytesIO)
         is_emoji: True for emoji GIF, False for message GIF
         verbose: Print detailed feedback
 
@@ -253,12 +471,12 @@ def is_slack_ready(gif_path: str | Path, is_emoji: bool = True, verbose: bool =
     if verbose:
         passes, results = validate_gif(gif_path, is_emoji)
         if not passes:
-            suggestions = get_optimization_suggestions(results)
+            suggestions = get_optimization_suggestions(results, gif=gif_path)
             if suggestions:
                 print("\nSuggestions:")
                 for suggestion in suggestions:
                     print(suggestion)
         return passes
     else:
-        size_pass, _ = check_slack_size(gif_path, is_emoji)
+        size_pass, _ = check_slack_size(gif_path, is_emoji, verbose=False)
         return size_pass
@@ -9,8 +9,8 @@ professional and dynamic while keeping file sizes reasonable.
 from PIL import Image, ImageDraw, ImageFilter
 import numpy as np
 import math
-import random
 from typing import Optional
+from core.rng import SeedLike, get_rng
 
 
 class Particle:
@@ -106,9 +106,15 @@ class Particle:
 class ParticleSystem:
     """Manages a collection of particles."""
 
-    def __init__(self):
-        """Initialize particle system."""
+    def __init__(self, seed: SeedLike = None):
+        """
+        Initialize particle system.
+
+        Args:
+            seed: Seed or numpy Generator for emission randomness (None = random)
+        """
         self.particles: list[Particle] = []
+        self.rng = get_rng(seed)
 
     def emit(self, x: int, y: int, count: int = 10,
              spread: float = 2.0, speed: float = 5.0,
@@ -127,16 +133,14 @@ class ParticleSystem:
             size: Particle size
             shape: Particle shape
         """
-        for _ in range(count):
-            # Random angle and speed
-            angle = random.uniform(0, 2 * math.pi)
-            vel_mag = random.uniform(speed * 0.5, speed * 1.5)
-            vx = math.cos(angle) * vel_mag
-            vy = math.sin(angle) * vel_mag
-
-            # Random lifetime variation
-            life = random.uniform(lifetime * 0.7, lifetime * 1.3)
-
+        # Random angle, speed and lifetime variation for the whole burst
+        angles = self.rng.uniform(0, 2 * math.pi, count)
+        vel_mags = self.rng.uniform(speed * 0.5, speed * 1.5, count)
+        lives = self.rng.uniform(lifetime * 0.7, lifetime * 1.3, count)
+        vxs = np.cos(angles) * vel_mags
+        vys = np.sin(angles) * vel_mags
+
+        for vx, vy, life in zip(vxs.tolist(), vys.tolist(), lives.tolist()):
             particle = Particle(x, y, vx, vy, life, color, size, shape)
             self.particles.append(particle)
 
@@ -156,15 +160,17 @@ class ParticleSystem:
                 (107, 185, 240), (162, 155, 254), (255, 182, 193)
             ]
 
-        for _ in range(count):
-            color = random.choice(colors)
-            vx = random.uniform(-3, 3)
-            vy = random.uniform(-8, -2)
-            shape = random.choice(['square', 'circle'])
-            size = random.randint(2, 4)
-            lifetime = random.uniform(40, 60)
-
-            particle = Particle(x, y, vx, vy, lifetime, color, size, shape)
+        color_indices = self.rng.integers(0, len(colors), count)
+        vxs = self.rng.uniform(-3, 3, count)
+        vys = self.rng.uniform(-8, -2, count)
+        shapes = self.rng.choice(['square', 'circle'], count)
+        sizes = self.rng.integers(2, 5, count)
+        lifetimes = self.rng.uniform(40, 60, count)
+
+        for i in range(count):
+            color = colors[color_indices[i]]
+            particle = Particle(x, y, float(vxs[i]), float(vys[i]), float(lifetimes[i]),
+                                color, int(sizes[i]), str(shapes[i]))
             particle.gravity = 0.3  # Lighter gravity for confetti
             self.particles.append(particle)
 
@@ -178,15 +184,17 @@ class ParticleSystem:
         """
         colors = [(255, 255, 200), (255, 255, 255), (255, 255, 150)]
 
-        for _ in range(count):
-            color = random.choice(colors)
-            angle = random.uniform(0, 2 * math.pi)
-            speed = random.uniform(1, 3)
-            vx = math.cos(angle) * speed
-            vy = math.sin(angle) * speed
-            lifetime = random.uniform(15, 30)
-
-            particle = Particle(x, y, vx, vy, lifetime, color, 2, 'star')
+        color_indices = self.rng.integers(0, len(colors), count)
+        angles = self.rng.uniform(0, 2 * math.pi, count)
+        speeds = self.rng.uniform(1, 3, count)
+        vxs = np.cos(angles) * speeds
+        vys = np.sin(angles) * speeds
+        lifetimes = self.rng.uniform(15, 30, count)
+
+        for i in range(count):
+            color = colors[color_indices[i]]
+            particle = Particle(x, y, float(vxs[i]), float(vys[i]), float(lifetimes[i]),
+                                color, 2, 'star')
             particle.gravity = 0
             particle.drag = 0.95
             self.particles.append(particle)
@@ -409,7 +417,8 @@ def add_drop_shadow(frame: Image.Image, object_bounds: tuple[int, int, int, int]
 
 def create_speed_lines(frame: Image.Image, position: tuple[int, int],
                        direction: float, length: int = 50,
-                       count: int = 5, color: tuple[int, int, int] = (200, 200, 200)) -> Image.Image:
+                       count: int = 5, color: tuple[int, int, int] = (200, 200, 200),
+                       seed: SeedLike = None) -> Image.Image:
     """
     Create speed lines for motion effect.
 
@@ -420,58 +429,80 @@ def create_speed_lines(frame: Image.Image, position: tuple[int, int],
         length: Line length
         count: Number of lines
         color: Line color
+        seed: Seed or numpy Generator for line placement (None = random)
 
     Returns:
         Modified frame
     """
     draw = ImageDraw.Draw(frame)
+    rng = get_rng(seed)
     x, y = position
 
     # Opposite direction (lines trail behind)
     trail_angle = direction + math.pi
 
-    for i in range(count):
-        # Offset from center
-        offset_angle = trail_angle + random.uniform(-0.3, 0.3)
-        offset_dist = random.uniform(10, 30)
-        start_x = x + math.cos(offset_angle) * offset_dist
-        start_y = y + math.sin(offset_angle) * offset_dist
+    # Offset from center
+    offset_angles = trail_angle + rng.uniform(-0.3, 0.3, count)
+    offset_dists = rng.uniform(10, 30, count)
+    start_xs = x + np.cos(offset_angles) * offset_dists
+    start_ys = y + np.sin(offset_angles) * offset_dists
 
-        # End point
-        line_length = random.uniform(length * 0.7, length * 1.3)
-        end_x = start_x + math.cos(trail_angle) * line_length
-        end_y = start_y + math.sin(trail_angle) * line_length
+    # End points
+    line_lengths = rng.uniform(length * 0.7, length * 1.3, count)
+    end_xs = start_xs + math.cos(trail_angle) * line_lengths
+    end_ys = start_ys + math.sin(trail_angle) * line_lengths
 
-        # Draw line with varying opacity
-        alpha = random.randint(100, 200)
-        width = random.randint(1, 3)
+    # Varying line widths
+    widths = rng.integers(1, 4, count)
 
+    for i in range(count):
         # Simple line (full opacity simulation)
-        draw.line([(start_x, start_y), (end_x, end_y)], fill=color, width=width)
+        draw.line([(float(start_xs[i]), float(start_ys[i])), (float(end_xs[i]), float(end_ys[i]))],
+                  fill=color, width=int(widths[i]))
 
     return frame
 
 
-def create_screen_shake_offset(intensity: int, frame_index: int) -> tuple[int, int]:
+def create_screen_shake_offsets(intensity: int, num_frames: int,
+                                seed: SeedLike = None) -> np.ndarray:
+    """
+    Precompute screen shake offsets for a whole animation in one draw.
+
+    Args:
+        intensity: Shake intensity in pixels
+        num_frames: Number of frames
+        seed: Seed or numpy Generator (same seed = same shake)
+
+    Returns:
+        int array of shape (num_frames, 2) with (x, y) offsets per frame
+    """
+    rng = get_rng(seed)
+    return rng.integers(-intensity, intensity + 1, size=(num_frames, 2))
+
+
+def create_screen_shake_offset(intensity: int, frame_index: int, seed: int = 0) -> tuple[int, int]:
     """
     Calculate screen shake offset for a frame.
 
+    Prefer create_screen_shake_offsets() when rendering a whole animation.
+
     Args:
         intensity: Shake intensity in pixels
         frame_index: Current frame number
+        seed: Base seed combined with the frame index
 
     Returns:
         (x, y) offset tuple
     """
-    # Use frame index for deterministic but random-looking shake
-    random.seed(frame_index)
-    offset_x = random.randint(-intensity, intensity)
-    offset_y = random.randint(-intensity, intensity)
-    random.seed()  # Reset seed
-    return (offset_x, offset_y)
+    # Use frame index for deterministic but random-looking shake,
+    # without touching any shared generator
+    rng = np.random.default_rng([seed, frame_index])
+    offset_x, offset_y = rng.integers(-intensity, intensity + 1, size=2)
+    return (int(offset_x), int(offset_y))
 
 
-def apply_screen_shake(frame: Image.Image, intensity: int, frame_index: int) -> Image.Image:
+def apply_screen_shake(frame: Image.Image, intensity: int, frame_index: int,
+                       offset: Optional[tuple[int, int]] = None) -> Image.Image:
     """
     Apply screen shake effect to entire frame.
 
@@ -479,11 +510,14 @@ def apply_screen_shake(frame: Image.Image, intensity: int, frame_index: int) ->
         frame: PIL Image
         intensity: Shake intensity
         frame_index: Current frame number
+        offset: Precomputed (x, y) offset, e.g. a row of create_screen_shake_offsets()
 
     Returns:
         Shaken frame
     """
-    offset_x, offset_y = create_screen_shake_offset(intensity, frame_index)
+    if offset is None:
+        offset = create_screen_shake_offset(intensity, frame_index)
+    offset_x, offset_y = int(offset[0]), int(offset[1])
 
     # Create new frame with background
     shaken = Image.new('RGB', frame.size, (0, 0, 0))
@@ -491,4 +525,4 @@ def apply_screen_shake(frame: Image.Image, intensity: int, frame_index: int) ->
     # Paste original frame with offset
     shaken.paste(frame, (offset_x, offset_y))
 
-    return shaken
\ No newline at end of file
+    return shaken
@@ -8,10 +8,10 @@ Use this to make objects bounce up and down or horizontally with realistic physi
 import sys
 from pathlib import Path
 
-# Add parent directory to path
-sys.path.append(str(Path(__file__).parent.parent))
+if not __package__:
+    # Run as a script: add the skill directory to the path
+    sys.path.append(str(Path(__file__).parent.parent))
 
-from core.gif_builder import GIFBuilder
 from core.frame_composer import create_blank_frame, draw_circle, draw_emoji
 from core.easing import ease_out_bounce, interpolate
 
@@ -86,6 +86,8 @@ def create_bounce_animation(
 
 # Example usage
 if __name__ == '__main__':
+    from core.gif_builder import GIFBuilder
+
     print("Creating bouncing ball GIF...")
 
     # Create GIF builder
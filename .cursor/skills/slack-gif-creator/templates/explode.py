@@ -8,16 +8,18 @@ Creates explosion, shatter, and particle burst effects.
 import sys
 from pathlib import Path
 import math
-import random
 
-sys.path.append(str(Path(__file__).parent.parent))
+if not __package__:
+    # Run as a script: add the skill directory to the path
+    sys.path.append(str(Path(__file__).parent.parent))
 
 from PIL import Image, ImageDraw
 import numpy as np
-from core.gif_builder import GIFBuilder
 from core.frame_composer import create_blank_frame, draw_emoji_enhanced
 from core.visual_effects import ParticleSystem
 from core.easing import interpolate
+from core.parallel_render import frame_independent, render_frames
+from core.rng import SeedLike, get_rng
 
 
 def create_explode_animation(
@@ -30,7 +32,9 @@ def create_explode_animation(
     center_pos: tuple[int, int] = (240, 240),
     frame_width: int = 480,
     frame_height: int = 480,
-    bg_color: tuple[int, int, int] = (255, 255, 255)
+    bg_color: tuple[int, int, int] = (255, 255, 255),
+    seed: SeedLike = None,
+    workers: int = 1
 ) -> list[Image.Image]:
     """
     Create explosion animation.
@@ -46,195 +50,239 @@ def create_explode_animation(
         frame_width: Frame width
         frame_height: Frame height
         bg_color: Background color
+        seed: Seed or numpy Generator for the pieces (same seed = same GIF)
+        workers: Worker processes for rendering frames in parallel (None = all cores)
 
     Returns:
         List of frames
     """
-    frames = []
+    rng = get_rng(seed)
 
     # Default object data
     if object_data is None:
         if object_type == 'emoji':
             object_data = {'emoji': '💣', 'size': 100}
 
-    # Generate pieces/particles
-    pieces = []
-    for _ in range(num_pieces):
-        angle = random.uniform(0, 2 * math.pi)
-        speed = random.uniform(explosion_speed * 0.5, explosion_speed * 1.5)
-        vx = math.cos(angle) * speed
-        vy = math.sin(angle) * speed
-        size = random.randint(3, 12)
-        color = (
-            random.randint(100, 255),
-            random.randint(100, 255),
-            random.randint(100, 255)
-        )
-        rotation_speed = random.uniform(-20, 20)
+    # Generate pieces/particles once so every frame (and worker) shares them
+    angles = rng.uniform(0, 2 * math.pi, num_pieces)
+    speeds = rng.uniform(explosion_speed * 0.5, explosion_speed * 1.5, num_pieces)
+    vxs = np.cos(angles) * speeds
+    vys = np.sin(angles) * speeds
+    sizes = rng.integers(3, 13, num_pieces)
+    colors = rng.integers(100, 256, (num_pieces, 3))
+    rotation_speeds = rng.uniform(-20, 20, num_pieces)
 
+    pieces = []
+    for i in range(num_pieces):
         pieces.append({
-            'vx': vx,
-            'vy': vy,
-            'size': size,
-            'color': color,
+            'vx': float(vxs[i]),
+            'vy': float(vys[i]),
+            'size': int(sizes[i]),
+            'color': tuple(int(c) for c in colors[i]),
             'rotation': 0,
-            'rotation_speed': rotation_speed
+            'rotation_speed': float(rotation_speeds[i])
         })
 
-    for i in range(num_frames):
-        t = i / (num_frames - 1) if num_frames > 1 else 0
-        frame = create_blank_frame(frame_width, frame_height, bg_color)
-        draw = ImageDraw.Draw(frame)
-
-        if explode_type == 'burst':
-            # Show object at start, then explode
-            if t < 0.2:
-                # Object still intact
-                scale = interpolate(1.0, 1.2, t / 0.2, 'ease_out')
-                if object_type == 'emoji':
-                    size = int(object_data['size'] * scale)
-                    draw_emoji_enhanced(
-                        frame,
-                        emoji=object_data['emoji'],
-                        position=(center_pos[0] - size // 2, center_pos[1] - size // 2),
-                        size=size,
-                        shadow=False
-                    )
-            else:
-                # Exploded - draw pieces
-                explosion_t = (t - 0.2) / 0.8
-                for piece in pieces:
-                    # Update position
-                    x = center_pos[0] + piece['vx'] * explosion_t * 50
-                    y = center_pos[1] + piece['vy'] * explosion_t * 50 + 0.5 * 300 * explosion_t ** 2  # Gravity
-
-                    # Fade out
-                    alpha = 1.0 - explosion_t
-                    if alpha > 0:
-                        color = tuple(int(c * alpha) for c in piece['color'])
-                        size = int(piece['size'] * (1 - explosion_t * 0.5))
-
-                        draw.ellipse(
-                            [x - size, y - size, x + size, y + size],
-                            fill=color
-                        )
-
-        elif explode_type == 'shatter':
-            # Break into geometric pieces
-            if t < 0.15:
-                # Object intact
-                if object_type == 'emoji':
-                    draw_emoji_enhanced(
-                        frame,
-                        emoji=object_data['emoji'],
-                        position=(center_pos[0] - object_data['size'] // 2,
-                                center_pos[1] - object_data['size'] // 2),
-                        size=object_data['size'],
-                        shadow=False
-                    )
-            else:
-                # Shattered
-                shatter_t = (t - 0.15) / 0.85
-
-                # Draw triangular shards
-                for piece in pieces[:min(10, len(pieces))]:
-                    x = center_pos[0] + piece['vx'] * shatter_t * 30
-                    y = center_pos[1] + piece['vy'] * shatter_t * 30 + 0.5 * 200 * shatter_t ** 2
-
-                    # Update rotation
-                    rotation = piece['rotation_speed'] * shatter_t * 100
-
-                    # Draw triangle shard
-                    shard_size = piece['size'] * 2
-                    points = []
-                    for j in range(3):
-                        angle = (rotation + j * 120) * math.pi / 180
-                        px = x + shard_size * math.cos(angle)
-                        py = y + shard_size * math.sin(angle)
-                        points.append((px, py))
-
-                    alpha = 1.0 - shatter_t
-                    if alpha > 0:
-                        color = tuple(int(c * alpha) for c in piece['color'])
-                        draw.polygon(points, fill=color)
-
-        elif explode_type == 'dissolve':
-            # Dissolve into particles
-            dissolve_scale = interpolate(1.0, 0.0, t, 'ease_in')
-
-            if dissolve_scale > 0.1:
-                # Draw fading object
-                if object_type == 'emoji':
-                    size = int(object_data['size'] * dissolve_scale)
-                    size = max(12, size)
-
-                    emoji_canvas = Image.new('RGBA', (frame_width, frame_height), (0, 0, 0, 0))
-                    draw_emoji_enhanced(
-                        emoji_canvas,
-                        emoji=object_data['emoji'],
-                        position=(center_pos[0] - size // 2, center_pos[1] - size // 2),
-                        size=size,
-                        shadow=False
-                    )
+    return render_frames(
+        render_explode_frame,
+        num_frames,
+        workers=workers,
+        seed=rng,
+        pieces=pieces,
+        object_type=object_type,
+        object_data=object_data,
+        explode_type=explode_type,
+        center_pos=center_pos,
+        frame_width=frame_width,
+        frame_height=frame_height,
+        bg_color=bg_color
+    )
+
 
-                    # Apply opacity
-                    from templates.fade import apply_opacity
-                    emoji_canvas = apply_opacity(emoji_canvas, dissolve_scale)
+@frame_independent
+def render_explode_frame(
+    frame_index: int,
+    num_frames: int,
+    frame_seed: int,
+    pieces: list[dict],
+    object_type: str = 'emoji',
+    object_data: dict | None = None,
+    explode_type: str = 'burst',
+    center_pos: tuple[int, int] = (240, 240),
+    frame_width: int = 480,
+    frame_height: int = 480,
+    bg_color: tuple[int, int, int] = (255, 255, 255)
+) -> Image.Image:
+    """
+    Render a single frame of create_explode_animation().
 
-                    frame_rgba = frame.convert('RGBA')
-                    frame = Image.alpha_composite(frame_rgba, emoji_canvas)
-                    frame = frame.convert('RGB')
-                    draw = ImageDraw.Draw(frame)
+    Args:
+        frame_index: Index of the frame to render
+        num_frames: Total number of frames
+        frame_seed: Per-frame seed (unused - randomness lives in pieces)
+        pieces: Piece velocities, sizes and colors shared by all frames
+        object_type: 'emoji', 'circle', 'text'
+        object_data: Object configuration
+        explode_type: Type of explosion
+        center_pos: Center position
+        frame_width: Frame width
+        frame_height: Frame height
+        bg_color: Background color
 
-            # Draw outward-moving particles
+    Returns:
+        Rendered frame
+    """
+    t = frame_index / (num_frames - 1) if num_frames > 1 else 0
+    frame = create_blank_frame(frame_width, frame_height, bg_color)
+    draw = ImageDraw.Draw(frame)
+
+    if explode_type == 'burst':
+        # Show object at start, then explode
+        if t < 0.2:
+            # Object still intact
+            scale = interpolate(1.0, 1.2, t / 0.2, 'ease_out')
+            if object_type == 'emoji':
+                size = int(object_data['size'] * scale)
+                draw_emoji_enhanced(
+                    frame,
+                    emoji=object_data['emoji'],
+                    position=(center_pos[0] - size // 2, center_pos[1] - size // 2),
+                    size=size,
+                    shadow=False
+                )
+        else:
+            # Exploded - draw pieces
+            explosion_t = (t - 0.2) / 0.8
             for piece in pieces:
-                x = center_pos[0] + piece['vx'] * t * 40
-                y = center_pos[1] + piece['vy'] * t * 40
+                # Update position
+                x = center_pos[0] + piece['vx'] * explosion_t * 50
+                y = center_pos[1] + piece['vy'] * explosion_t * 50 + 0.5 * 300 * explosion_t ** 2  # Gravity
 
-                alpha = 1.0 - t
+                # Fade out
+                alpha = 1.0 - explosion_t
                 if alpha > 0:
                     color = tuple(int(c * alpha) for c in piece['color'])
-                    size = int(piece['size'] * (1 - t * 0.5))
-                    draw.ellipse(
-                        [x - size, y - size, x + size, y + size],
-                        fill=color
-                    )
-
-        elif explode_type == 'implode':
-            # Reverse explosion - pieces fly inward
-            if t < 0.7:
-                # Pieces converging
-                implode_t = 1.0 - (t / 0.7)
-                for piece in pieces:
-                    x = center_pos[0] + piece['vx'] * implode_t * 50
-                    y = center_pos[1] + piece['vy'] * implode_t * 50
-
-                    alpha = 1.0 - (1.0 - implode_t) * 0.5
-                    color = tuple(int(c * alpha) for c in piece['color'])
-                    size = int(piece['size'] * alpha)
+                    size = int(piece['size'] * (1 - explosion_t * 0.5))
 
                     draw.ellipse(
                         [x - size, y - size, x + size, y + size],
                         fill=color
                     )
-            else:
-                # Object reforms
-                reform_t = (t - 0.7) / 0.3
-                scale = interpolate(0.5, 1.0, reform_t, 'elastic_out')
-
-                if object_type == 'emoji':
-                    size = int(object_data['size'] * scale)
-                    draw_emoji_enhanced(
-                        frame,
-                        emoji=object_data['emoji'],
-                        position=(center_pos[0] - size // 2, center_pos[1] - size // 2),
-                        size=size,
-                        shadow=False
-                    )
 
-        frames.append(frame)
-
-    return frames
+    elif explode_type == 'shatter':
+        # Break into geometric pieces
+        if t < 0.15:
+            # Object intact
+            if object_type == 'emoji':
+                draw_emoji_enhanced(
+                    frame,
+                    emoji=object_data['emoji'],
+                    position=(center_pos[0] - object_data['size'] // 2,
+                            center_pos[1] - object_data['size'] // 2),
+                    size=object_data['size'],
+                    shadow=False
+                )
+        else:
+            # Shattered
+            shatter_t = (t - 0.15) / 0.85
+
+            # Draw triangular shards
+            for piece in pieces[:min(10, len(pieces))]:
+                x = center_pos[0] + piece['vx'] * shatter_t * 30
+                y = center_pos[1] + piece['vy'] * shatter_t * 30 + 0.5 * 200 * shatter_t ** 2
+
+                # Update rotation
+                rotation = piece['rotation_speed'] * shatter_t * 100
+
+                # Draw triangle shard
+                shard_size = piece['size'] * 2
+                points = []
+                for j in range(3):
+                    angle = (rotation + j * 120) * math.pi / 180
+                    px = x + shard_size * math.cos(angle)
+                    py = y + shard_size * math.sin(angle)
+                    points.append((px, py))
+
+                alpha = 1.0 - shatter_t
+                if alpha > 0:
+                    color = tuple(int(c * alpha) for c in piece['color'])
+                    draw.polygon(points, fill=color)
+
+    elif explode_type == 'dissolve':
+        # Dissolve into particles
+        dissolve_scale = interpolate(1.0, 0.0, t, 'ease_in')
+
+        if dissolve_scale > 0.1:
+            # Draw fading object
+            if object_type == 'emoji':
+                size = int(object_data['size'] * dissolve_scale)
+                size = max(12, size)
+
+                emoji_canvas = Image.new('RGBA', (frame_width, frame_height), (0, 0, 0, 0))
+                draw_emoji_enhanced(
+                    emoji_canvas,
+                    emoji=object_data['emoji'],
+                    position=(center_pos[0] - size // 2, center_pos[1] - size // 2),
+                    size=size,
+                    shadow=False
+                )
+
+                # Apply opacity
+                from templates.fade import apply_opacity
+                emoji_canvas = apply_opacity(emoji_canvas, dissolve_scale)
+
+                frame_rgba = frame.convert('RGBA')
+                frame = Image.alpha_composite(frame_rgba, emoji_canvas)
+                frame = frame.convert('RGB')
+                draw = ImageDraw.Draw(frame)
+
+        # Draw outward-moving particles
+        for piece in pieces:
+            x = center_pos[0] + piece['vx'] * t * 40
+            y = center_pos[1] + piece['vy'] * t * 40
+
+            alpha = 1.0 - t
+            if alpha > 0:
+                color = tuple(int(c * alpha) for c in piece['color'])
+                size = int(piece['size'] * (1 - t * 0.5))
+                draw.ellipse(
+                    [x - size, y - size, x + size, y + size],
+                    fill=color
+                )
+
+    elif explode_type == 'implode':
+        # Reverse explosion - pieces fly inward
+        if t < 0.7:
+            # Pieces converging
+            implode_t = 1.0 - (t / 0.7)
+            for piece in pieces:
+                x = center_pos[0] + piece['vx'] * implode_t * 50
+                y = center_pos[1] + piece['vy'] * implode_t * 50
+
+                alpha = 1.0 - (1.0 - implode_t) * 0.5
+                color = tuple(int(c * alpha) for c in piece['color'])
+                size = int(piece['size'] * alpha)
+
+                draw.ellipse(
+                    [x - size, y - size, x + size, y + size],
+                    fill=color
+                )
+        else:
+            # Object reforms
+            reform_t = (t - 0.7) / 0.3
+            scale = interpolate(0.5, 1.0, reform_t, 'elastic_out')
+
+            if object_type == 'emoji':
+                size = int(object_data['size'] * scale)
+                draw_emoji_enhanced(
+                    frame,
+                    emoji=object_data['emoji'],
+                    position=(center_pos[0] - size // 2, center_pos[1] - size // 2),
+                    size=size,
+                    shadow=False
+                )
+
+    return frame
 
 
 def create_particle_burst(
@@ -244,7 +292,8 @@ def create_particle_burst(
     colors: list[tuple[int, int, int]] | None = None,
     frame_width: int = 480,
     frame_height: int = 480,
-    bg_color: tuple[int, int, int] = (255, 255, 255)
+    bg_color: tuple[int, int, int] = (255, 255, 255),
+    seed: SeedLike = None
 ) -> list[Image.Image]:
     """
     Create simple particle burst effect.
@@ -257,11 +306,13 @@ def create_particle_burst(
         frame_width: Frame width
         frame_height: Frame height
         bg_color: Background color
+        seed: Seed or numpy Generator for the particles (same seed = same GIF)
 
     Returns:
         List of frames
     """
-    particles = ParticleSystem()
+    rng = get_rng(seed)
+    particles = ParticleSystem(seed=rng)
 
     # Emit particles
     if colors is None:
@@ -270,14 +321,14 @@ def create_particle_burst(
         colors = [palette['primary'], palette['secondary'], palette['accent']]
 
     for _ in range(particle_count):
-        color = random.choice(colors)
+        color = colors[rng.integers(len(colors))]
         particles.emit(
             center_pos[0], center_pos[1],
             count=1,
-            speed=random.uniform(3, 8),
+            speed=rng.uniform(3, 8),
             color=color,
-            lifetime=random.uniform(20, 30),
-            size=random.randint(3, 8),
+            lifetime=rng.uniform(20, 30),
+            size=int(rng.integers(3, 9)),
             shape='star'
         )
 
@@ -295,6 +346,8 @@ def create_particle_burst(
 
 # Example usage
 if __name__ == '__main__':
+    from core.gif_builder import GIFBuilder
+
     print("Creating explode animations...")
 
     builder = GIFBuilder(width=480, height=480, fps=20)
@@ -8,13 +8,15 @@ Creates smooth opacity transitions for appearing, disappearing, and transitionin
 import sys
 from pathlib import Path
 
-sys.path.append(str(Path(__file__).parent.parent))
+if not __package__:
+    # Run as a script: add the skill directory to the path
+    sys.path.append(str(Path(__file__).parent.parent))
 
 from PIL import Image, ImageDraw
 import numpy as np
-from core.gif_builder import GIFBuilder
-from core.frame_composer import create_blank_frame, draw_emoji_enhanced
+from core.frame_composer import create_blank_frame, draw_emoji_enhanced, apply_color_key
 from core.easing import interpolate
+from core.timeline import Timeline, changed_frames, render_changed_frames
 
 
 def create_fade_animation(
@@ -45,105 +47,71 @@ def create_fade_animation(
     Returns:
         List of frames
     """
-    frames = []
-
     # Default object data
     if object_data is None:
         if object_type == 'emoji':
             object_data = {'emoji': '✨', 'size': 100}
 
-    for i in range(num_frames):
-        t = i / (num_frames - 1) if num_frames > 1 else 0
-
-        # Calculate opacity based on fade type
-        if fade_type == 'in':
-            opacity = interpolate(0, 1, t, easing)
-        elif fade_type == 'out':
-            opacity = interpolate(1, 0, t, easing)
-        elif fade_type == 'in_out':
-            if t < 0.5:
-                opacity = interpolate(0, 1, t * 2, easing)
-            else:
-                opacity = interpolate(1, 0, (t - 0.5) * 2, easing)
-        elif fade_type == 'blink':
-            # Quick fade out and back in
-            if t < 0.2:
-                opacity = interpolate(1, 0, t / 0.2, 'ease_in')
-            elif t < 0.4:
-                opacity = interpolate(0, 1, (t - 0.2) / 0.2, 'ease_out')
-            else:
-                opacity = 1.0
-        else:
-            opacity = interpolate(0, 1, t, easing)
-
+    # Opacity keyframes for the fade type
+    timeline = Timeline(num_frames)
+    if fade_type == 'out':
+        timeline.add_track('opacity', [(0.0, 1.0), (1.0, 0.0, easing)])
+    elif fade_type == 'in_out':
+        timeline.add_track('opacity', [(0.0, 0.0), (0.5, 1.0, easing), (1.0, 0.0, easing)])
+    elif fade_type == 'blink':
+        # Quick fade out and back in
+        timeline.add_track('opacity', [(0.0, 1.0), (0.2, 0.0, 'ease_in'), (0.4, 1.0, 'ease_out'), (1.0, 1.0)])
+    else:
+        timeline.add_track('opacity', [(0.0, 0.0), (1.0, 1.0, easing)])
+    opacities = timeline.evaluate()['opacity']
+
+    # The object layer is identical every frame - only the opacity changes,
+    # so draw it once and reuse it
+    layer = None
+    if object_type == 'emoji':
+        # Create RGBA canvas for emoji
+        layer = Image.new('RGBA', (frame_width, frame_height), (0, 0, 0, 0))
+        emoji_size = object_data['size']
+        draw_emoji_enhanced(
+            layer,
+            emoji=object_data['emoji'],
+            position=(center_pos[0] - emoji_size // 2, center_pos[1] - emoji_size // 2),
+            size=emoji_size,
+            shadow=object_data.get('shadow', False)
+        )
+
+    elif object_type == 'text':
+        from core.typography import draw_text_with_outline
+
+        text_canvas = Image.new('RGB', (frame_width, frame_height), bg_color)
+        draw_text_with_outline(
+            text_canvas,
+            text=object_data.get('text', 'FADE'),
+            position=center_pos,
+            font_size=object_data.get('font_size', 60),
+            text_color=object_data.get('text_color', (0, 0, 0)),
+            outline_color=object_data.get('outline_color', (255, 255, 255)),
+            outline_width=3,
+            centered=True
+        )
+
+        # Make background transparent
+        layer = apply_color_key(text_canvas, bg_color)
+
+    def render_frame(i: int) -> Image.Image:
         # Create background
-        frame_bg = create_blank_frame(frame_width, frame_height, bg_color)
-
-        # Create object layer with transparency
-        if object_type == 'emoji':
-            # Create RGBA canvas for emoji
-            emoji_canvas = Image.new('RGBA', (frame_width, frame_height), (0, 0, 0, 0))
-            emoji_size = object_data['size']
-            draw_emoji_enhanced(
-                emoji_canvas,
-                emoji=object_data['emoji'],
-                position=(center_pos[0] - emoji_size // 2, center_pos[1] - emoji_size // 2),
-                size=emoji_size,
-                shadow=object_data.get('shadow', False)
-            )
-
-            # Apply opacity
-            emoji_canvas = apply_opacity(emoji_canvas, opacity)
-
-            # Composite onto background
-            frame_bg_rgba = frame_bg.convert('RGBA')
-            frame = Image.alpha_composite(frame_bg_rgba, emoji_canvas)
-            frame = frame.convert('RGB')
-
-        elif object_type == 'text':
-            from core.typography import draw_text_with_outline
-
-            # Create text on separate layer
-            text_canvas = Image.new('RGBA', (frame_width, frame_height), (0, 0, 0, 0))
-            text_canvas_rgb = text_canvas.convert('RGB')
-            text_canvas_rgb.paste(bg_color, (0, 0, frame_width, frame_height))
-
-            draw_text_with_outline(
-                text_canvas_rgb,
-                text=object_data.get('text', 'FADE'),
-                position=center_pos,
-                font_size=object_data.get('font_size', 60),
-                text_color=object_data.get('text_color', (0, 0, 0)),
-                outline_color=object_data.get('outline_color', (255, 255, 255)),
-                outline_width=3,
-                centered=True
-            )
-
-            # Convert to RGBA and make background transparent
-            text_canvas = text_canvas_rgb.convert('RGBA')
-            data = text_canvas.getdata()
-            new_data = []
-            for item in data:
-                if item[:3] == bg_color:
-                    new_data.append((255, 255, 255, 0))
-                else:
-                    new_data.append(item)
-            text_canvas.putdata(new_data)
-
-            # Apply opacity
-            text_canvas = apply_opacity(text_canvas, opacity)
-
-            # Composite
-            frame_bg_rgba = frame_bg.convert('RGBA')
-            frame = Image.alpha_composite(frame_bg_rgba, text_canvas)
-            frame = frame.convert('RGB')
+        frame = create_blank_frame(frame_width, frame_height, bg_color)
+        if layer is None:
+            return frame
 
-        else:
-            frame = frame_bg
+        # Apply opacity and composite onto background
+        faded = apply_opacity(layer, float(opacities[i]))
+        frame_rgba = frame.convert('RGBA')
+        frame = Image.alpha_composite(frame_rgba, faded)
+        return frame.convert('RGB')
 
-        frames.append(frame)
-
-    return frames
+    # Frames holding the same opacity (e.g. the end of a blink) are not redrawn
+    return render_changed_frames(changed_frames(opacities), render_frame)
 
 
 def apply_opacity(image: Image.Image, opacity: float) -> Image.Image:
@@ -289,6 +257,8 @@ def create_fade_to_color(
 
 # Example usage
 if __name__ == '__main__':
+    from core.gif_builder import GIFBuilder
+
     print("Creating fade animations...")
 
     builder = GIFBuilder(width=480, height=480, fps=20)
@@ -9,11 +9,12 @@ import sys
 from pathlib import Path
 import math
 
-sys.path.append(str(Path(__file__).parent.parent))
+if not __package__:
+    # Run as a script: add the skill directory to the path
+    sys.path.append(str(Path(__file__).parent.parent))
 
 from PIL import Image
-from core.gif_builder import GIFBuilder
-from core.frame_composer import create_blank_frame, draw_emoji_enhanced
+from core.frame_composer import create_blank_frame, draw_emoji_enhanced, apply_color_key
 from core.easing import interpolate
 
 
@@ -119,14 +120,10 @@ def create_flip_animation(
             font_size = current_object.get('font_size', 50)
 
             canvas_size = max(frame_width, frame_height)
-            text_canvas = Image.new('RGBA', (canvas_size, canvas_size), (0, 0, 0, 0))
-
-            # Draw on RGB for text rendering
-            text_canvas_rgb = text_canvas.convert('RGB')
-            text_canvas_rgb.paste(bg_color, (0, 0, canvas_size, canvas_size))
+            text_canvas = Image.new('RGB', (canvas_size, canvas_size), bg_color)
 
             draw_text_with_outline(
-                text_canvas_rgb,
+                text_canvas,
                 text=text,
                 position=(canvas_size // 2, canvas_size // 2),
                 font_size=font_size,
@@ -137,15 +134,7 @@ def create_flip_animation(
             )
 
             # Make background transparent
-            text_canvas = text_canvas_rgb.convert('RGBA')
-            data = text_canvas.getdata()
-            new_data = []
-            for item in data:
-                if item[:3] == bg_color:
-                    new_data.append((255, 255, 255, 0))
-                else:
-                    new_data.append(item)
-            text_canvas.putdata(new_data)
+            text_canvas = apply_color_key(text_canvas, bg_color)
 
             # Apply flip scaling
             if flip_axis == 'horizontal':
@@ -255,6 +244,8 @@ def create_nope_flip(
 
 # Example usage
 if __name__ == '__main__':
+    from core.gif_builder import GIFBuilder
+
     print("Creating flip animations...")
 
     builder = GIFBuilder(width=480, height=480, fps=20)
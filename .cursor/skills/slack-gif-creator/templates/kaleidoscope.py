@@ -9,10 +9,13 @@ import sys
 from pathlib import Path
 import math
 
-sys.path.append(str(Path(__file__).parent.parent))
+if not __package__:
+    # Run as a script: add the skill directory to the path
+    sys.path.append(str(Path(__file__).parent.parent))
 
 from PIL import Image, ImageOps, ImageDraw
 import numpy as np
+from core.parallel_render import frame_independent, render_frames
 
 
 def apply_kaleidoscope(frame: Image.Image, segments: int = 8,
@@ -143,7 +146,8 @@ def create_kaleidoscope_animation(
     segments: int = 8,
     rotation_speed: float = 1.0,
     width: int = 480,
-    height: int = 480
+    height: int = 480,
+    workers: int = 1
 ) -> list[Image.Image]:
     """
     Create animated kaleidoscope effect.
@@ -155,12 +159,11 @@ def create_kaleidoscope_animation(
         rotation_speed: How fast pattern rotates (0.5-2.0)
         width: Frame width if generating demo
         height: Frame height if generating demo
+        workers: Worker processes for rendering frames in parallel (None = all cores)
 
     Returns:
         List of frames with kaleidoscope effect
     """
-    frames = []
-
     # Create demo pattern if no base frame
     if base_frame is None:
         base_frame = Image.new('RGB', (width, height), (255, 255, 255))
@@ -177,19 +180,46 @@ def create_kaleidoscope_animation(
             y = height // 2 + int(100 * math.sin(i * 2 * math.pi / 3))
             draw.ellipse([x - 40, y - 40, x + 40, y + 40], fill=color)
 
-    # Rotate base frame and apply kaleidoscope
-    for i in range(num_frames):
-        angle = (i / num_frames) * 360 * rotation_speed
+    return render_frames(
+        render_kaleidoscope_frame,
+        num_frames,
+        workers=workers,
+        base_frame=base_frame,
+        segments=segments,
+        rotation_speed=rotation_speed
+    )
+
+
+@frame_independent
+def render_kaleidoscope_frame(
+    frame_index: int,
+    num_frames: int,
+    frame_seed: int,
+    base_frame: Image.Image,
+    segments: int = 8,
+    rotation_speed: float = 1.0
+) -> Image.Image:
+    """
+    Render a single frame of create_kaleidoscope_animation().
 
-        # Rotate base frame
-        rotated = base_frame.rotate(angle, resample=Image.BICUBIC)
+    Args:
+        frame_index: Index of the frame to render
+        num_frames: Total number of frames
+        frame_seed: Per-frame seed (unused - the effect is deterministic)
+        base_frame: Frame to apply effect to
+        segments: Kaleidoscope segments
+        rotation_speed: How fast pattern rotates (0.5-2.0)
 
-        # Apply kaleidoscope
-        kaleido_frame = apply_kaleidoscope(rotated, segments=segments)
+    Returns:
+        Frame with kaleidoscope effect
+    """
+    angle = (frame_index / num_frames) * 360 * rotation_speed
 
-        frames.append(kaleido_frame)
+    # Rotate base frame
+    rotated = base_frame.rotate(angle, resample=Image.BICUBIC)
 
-    return frames
+    # Apply kaleidoscope
+    return apply_kaleidoscope(rotated, segments=segments)
 
 
 # Example usage
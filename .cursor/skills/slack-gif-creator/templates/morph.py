@@ -8,11 +8,12 @@ Creates smooth transitions and transformations.
 import sys
 from pathlib import Path
 
-sys.path.append(str(Path(__file__).parent.parent))
+if not __package__:
+    # Run as a script: add the skill directory to the path
+    sys.path.append(str(Path(__file__).parent.parent))
 
 from PIL import Image
 import numpy as np
-from core.gif_builder import GIFBuilder
 from core.frame_composer import create_blank_frame, draw_emoji_enhanced, draw_circle
 from core.easing import interpolate
 
@@ -284,6 +285,8 @@ def create_shape_morph(
 
 # Example usage
 if __name__ == '__main__':
+    from core.gif_builder import GIFBuilder
+
     print("Creating morph animations...")
 
     builder = GIFBuilder(width=480, height=480, fps=20)
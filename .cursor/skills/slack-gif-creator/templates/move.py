@@ -9,11 +9,13 @@ import sys
 from pathlib import Path
 import math
 
-sys.path.append(str(Path(__file__).parent.parent))
+if not __package__:
+    # Run as a script: add the skill directory to the path
+    sys.path.append(str(Path(__file__).parent.parent))
 
-from core.gif_builder import GIFBuilder
 from core.frame_composer import create_blank_frame, draw_circle, draw_emoji_enhanced
 from core.easing import interpolate, calculate_arc_motion
+from core.paths import sample_path
 
 
 def create_move_animation(
@@ -159,14 +161,20 @@ def create_move_animation(
 
 def create_path_from_points(points: list[tuple[int, int]],
                             num_frames: int = 60,
-                            easing: str = 'ease_in_out') -> list[tuple[int, int]]:
+                            easing: str = 'ease_in_out',
+                            curve: str = 'catmull_rom') -> list[tuple[int, int]]:
     """
     Create a smooth path through multiple points.
 
+    The object moves at constant speed along the whole path (long and short
+    segments alike), with the easing applied from the first point to the last.
+
     Args:
         points: List of (x, y) waypoints
         num_frames: Total number of frames
-        easing: Easing between points
+        easing: Easing over the whole path
+        curve: 'catmull_rom' (smooth curve through the points) or 'linear'
+               (straight segments)
 
     Returns:
         List of (x, y) positions for each frame
@@ -174,26 +182,8 @@ def create_path_from_points(points: list[tuple[int, int]],
     if len(points) < 2:
         return points * num_frames
 
-    path = []
-    frames_per_segment = num_frames // (len(points) - 1)
-
-    for i in range(len(points) - 1):
-        start = points[i]
-        end = points[i + 1]
-
-        # Last segment gets remaining frames
-        if i == len(points) - 2:
-            segment_frames = num_frames - len(path)
-        else:
-            segment_frames = frames_per_segment
-
-        for j in range(segment_frames):
-            t = j / segment_frames if segment_frames > 0 else 0
-            x = interpolate(start[0], end[0], t, easing)
-            y = interpolate(start[1], end[1], t, easing)
-            path.append((int(x), int(y)))
-
-    return path
+    positions = sample_path(points, num_frames, easing, kind=curve)
+    return [(int(x), int(y)) for x, y in positions]
 
 
 def apply_trail_effect(frames: list, trail_length: int = 5,
@@ -239,6 +229,8 @@ def apply_trail_effect(frames: list, trail_length: int = 5,
 
 # Example usage
 if __name__ == '__main__':
+    from core.gif_builder import GIFBuilder
+
     print("Creating movement examples...")
 
     # Example 1: Linear movement
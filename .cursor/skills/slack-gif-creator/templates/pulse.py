@@ -9,10 +9,11 @@ import sys
 from pathlib import Path
 import math
 
-sys.path.append(str(Path(__file__).parent.parent))
+if not __package__:
+    # Run as a script: add the skill directory to the path
+    sys.path.append(str(Path(__file__).parent.parent))
 
 from PIL import Image
-from core.gif_builder import GIFBuilder
 from core.frame_composer import create_blank_frame, draw_emoji_enhanced, draw_circle
 from core.easing import interpolate
 
@@ -230,6 +231,8 @@ def create_breathing_animation(
 
 # Example usage
 if __name__ == '__main__':
+    from core.gif_builder import GIFBuilder
+
     print("Creating pulse animations...")
 
     builder = GIFBuilder(width=480, height=480, fps=20)
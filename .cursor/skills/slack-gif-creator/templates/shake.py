@@ -9,9 +9,10 @@ import sys
 import math
 from pathlib import Path
 
-sys.path.append(str(Path(__file__).parent.parent))
+if not __package__:
+    # Run as a script: add the skill directory to the path
+    sys.path.append(str(Path(__file__).parent.parent))
 
-from core.gif_builder import GIFBuilder
 from core.frame_composer import create_blank_frame, draw_circle, draw_emoji, draw_text
 from core.easing import ease_out_quad
 
@@ -111,6 +112,8 @@ def create_shake_animation(
 
 # Example usage
 if __name__ == '__main__':
+    from core.gif_builder import GIFBuilder
+
     print("Creating shake GIF...")
 
     builder = GIFBuilder(width=480, height=480, fps=24)
@@ -8,12 +8,14 @@ Creates smooth entrance and exit animations.
 import sys
 from pathlib import Path
 
-sys.path.append(str(Path(__file__).parent.parent))
+if not __package__:
+    # Run as a script: add the skill directory to the path
+    sys.path.append(str(Path(__file__).parent.parent))
 
 from PIL import Image
-from core.gif_builder import GIFBuilder
 from core.frame_composer import create_blank_frame, draw_emoji_enhanced
 from core.easing import interpolate
+from core.scene import EmojiNode, Scene, SceneRenderer
 
 
 def create_slide_animation(
@@ -159,80 +161,59 @@ def create_multi_slide(
     Returns:
         List of frames
     """
-    frames = []
-
-    for i in range(num_frames):
-        frame = create_blank_frame(frame_width, frame_height, bg_color)
-
+    # Retained scene: each frame only redraws the objects that moved, so
+    # objects that have finished sliding cost nothing
+    scene = Scene(frame_width, frame_height, bg_color)
+    nodes = []
+    for idx, obj in enumerate(objects):
+        obj_data = obj.get('data', {'emoji': '➡️', 'size': 80})
+        if obj.get('type', 'emoji') == 'emoji':
+            nodes.append(scene.add(EmojiNode(obj_data['emoji'], obj_data.get('size', 80), z=idx, visible=False)))
+        else:
+            nodes.append(None)  # Only emoji objects are drawn
+
+    def update(i: int):
         for idx, obj in enumerate(objects):
+            node = nodes[idx]
+            if node is None:
+                continue
+
             # Calculate when this object starts moving
             start_frame = idx * stagger_delay
-            if i < start_frame:
+            obj_duration = num_frames - start_frame
+            if i < start_frame or obj_duration <= 0:
                 continue  # Object hasn't started yet
 
             # Calculate progress for this object
-            obj_frame = i - start_frame
-            obj_duration = num_frames - start_frame
-            if obj_duration <= 0:
-                continue
-
-            t = obj_frame / obj_duration
+            t = (i - start_frame) / obj_duration
 
             # Get object properties
-            obj_type = obj.get('type', 'emoji')
-            obj_data = obj.get('data', {'emoji': '➡️', 'size': 80})
             direction = obj.get('direction', 'left')
             final_pos = obj.get('final_pos', (frame_width // 2, frame_height // 2))
             easing = obj.get('easing', 'back_out')
 
             # Calculate position
-            size = obj_data.get('size', 80)
-            margin = size
-
-            if direction == 'left':
-                start_x = -margin
-                end_x = final_pos[0]
-                y = final_pos[1]
-            elif direction == 'right':
-                start_x = frame_width + margin
-                end_x = final_pos[0]
-                y = final_pos[1]
+            margin = node.size
+            x, y = final_pos
+            if direction == 'right':
+                x = int(interpolate(frame_width + margin, final_pos[0], t, easing))
             elif direction == 'top':
-                x = final_pos[0]
-                start_y = -margin
-                end_y = final_pos[1]
+                y = int(interpolate(-margin, final_pos[1], t, easing))
             elif direction == 'bottom':
-                x = final_pos[0]
-                start_y = frame_height + margin
-                end_y = final_pos[1]
-            else:
-                start_x = -margin
-                end_x = final_pos[0]
-                y = final_pos[1]
-
-            # Interpolate position
-            if direction in ['left', 'right']:
-                x = int(interpolate(start_x, end_x, t, easing))
+                y = int(interpolate(frame_height + margin, final_pos[1], t, easing))
             else:
-                y = int(interpolate(start_y, end_y, t, easing))
-
-            # Draw object
-            if obj_type == 'emoji':
-                draw_emoji_enhanced(
-                    frame,
-                    emoji=obj_data['emoji'],
-                    position=(x - size // 2, y - size // 2),
-                    size=size,
-                    shadow=False
-                )
+                x = int(interpolate(-margin, final_pos[0], t, easing))
 
-        frames.append(frame)
+            node.position = (x, y)
+            node.visible = True
 
-    return frames
+    return SceneRenderer(scene).render_sequence(num_frames, update)
 
 
 # Example usage
 if __name__ == '__main__':
+    from core.gif_builder import GIFBuilder
+
     print("Creating slide animations...")
 
     builder = GIFBuilder(width=480, height=480, fps=20)
@@ -9,11 +9,12 @@ import sys
 from pathlib import Path
 import math
 
-sys.path.append(str(Path(__file__).parent.parent))
+if not __package__:
+    # Run as a script: add the skill directory to the path
+    sys.path.append(str(Path(__file__).parent.parent))
 
 from PIL import Image
-from core.gif_builder import GIFBuilder
-from core.frame_composer import create_blank_frame, draw_emoji_enhanced, draw_circle
+from core.frame_composer import create_blank_frame, draw_emoji_enhanced, draw_circle, apply_color_key
 from core.easing import interpolate
 
 
@@ -54,6 +55,8 @@ def create_spin_animation(
         if object_type == 'emoji':
             object_data = {'emoji': '🔄', 'size': 100}
 
+    text_layer = None
+
     for i in range(num_frames):
         frame = create_blank_frame(frame_width, frame_height, bg_color)
         t = i / (num_frames - 1) if num_frames > 1 else 0
@@ -98,43 +101,29 @@ def create_spin_animation(
             frame.paste(rotated, (paste_x, paste_y), rotated)
 
         elif object_type == 'text':
-            from core.typography import draw_text_with_outline
-            # Similar approach - create canvas, draw text, rotate
-            text = object_data.get('text', 'SPIN!')
-            font_size = object_data.get('font_size', 50)
-
-            canvas_size = max(frame_width, frame_height)
-            text_canvas = Image.new('RGBA', (canvas_size, canvas_size), (0, 0, 0, 0))
-
-            # Draw text
-            text_canvas_rgb = text_canvas.convert('RGB')
-            text_canvas_rgb.paste(bg_color, (0, 0, canvas_size, canvas_size))
-            draw_text_with_outline(
-                text_canvas_rgb,
-                text,
-                position=(canvas_size // 2, canvas_size // 2),
-                font_size=font_size,
-                text_color=object_data.get('text_color', (0, 0, 0)),
-                outline_color=object_data.get('outline_color', (255, 255, 255)),
-                outline_width=3,
-                centered=True
-            )
-
-            # Convert back to RGBA for rotation
-            text_canvas = text_canvas_rgb.convert('RGBA')
+            # Text layer is identical every frame - only the angle changes,
+            # so draw it once and reuse it
+            if text_layer is None:
+                from core.typography import draw_text_with_outline
+
+                canvas_size = max(frame_width, frame_height)
+                text_canvas = Image.new('RGB', (canvas_size, canvas_size), bg_color)
+                draw_text_with_outline(
+                    text_canvas,
+                    object_data.get('text', 'SPIN!'),
+                    position=(canvas_size // 2, canvas_size // 2),
+                    font_size=object_data.get('font_size', 50),
+                    text_color=object_data.get('text_color', (0, 0, 0)),
+                    outline_color=object_data.get('outline_color', (255, 255, 255)),
+                    outline_width=3,
+                    centered=True
+                )
 
-            # Make background transparent
-            data = text_canvas.getdata()
-            new_data = []
-            for item in data:
-                if item[:3] == bg_color:
-                    new_data.append((255, 255, 255, 0))
-                else:
-                    new_data.append(item)
-            text_canvas.putdata(new_data)
+                # Make background transparent
+                text_layer = apply_color_key(text_canvas, bg_color)
 
             # Rotate
-            rotated = text_canvas.rotate(angle, resample=Image.BICUBIC, expand=False)
+            rotated = text_layer.rotate(angle, resample=Image.BICUBIC, expand=False)
 
             # Composite onto frame
             frame_rgba = frame.convert('RGBA')
@@ -233,6 +222,8 @@ def create_loading_spinner(
 
 # Example usage
 if __name__ == '__main__':
+    from core.gif_builder import GIFBuilder
+
     print("Creating spin animations...")
 
     builder = GIFBuilder(width=480, height=480, fps=20)
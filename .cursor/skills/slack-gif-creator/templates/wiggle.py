@@ -9,11 +9,12 @@ import sys
 from pathlib import Path
 import math
 
-sys.path.append(str(Path(__file__).parent.parent))
+if not __package__:
+    # Run as a script: add the skill directory to the path
+    sys.path.append(str(Path(__file__).parent.parent))
 
 from PIL import Image
-from core.gif_builder import GIFBuilder
-from core.frame_composer import create_blank_frame, draw_emoji_enhanced
+from core.frame_composer import create_blank_frame, draw_emoji_enhanced, apply_color_key
 from core.easing import interpolate
 
 
@@ -54,6 +55,8 @@ def create_wiggle_animation(
         if object_type == 'emoji':
             object_data = {'emoji': '🎈', 'size': 100}
 
+    text_layer = None
+
     for i in range(num_frames):
         t = i / (num_frames - 1) if num_frames > 1 else 0
         frame = create_blank_frame(frame_width, frame_height, bg_color)
@@ -180,37 +183,29 @@ def create_wiggle_animation(
                 )
 
         elif object_type == 'text':
-            from core.typography import draw_text_with_outline
-
-            # Create text on canvas for transformation
             canvas_size = max(frame_width, frame_height)
-            text_canvas = Image.new('RGBA', (canvas_size, canvas_size), (0, 0, 0, 0))
-
-            # Convert to RGB for drawing
-            text_canvas_rgb = text_canvas.convert('RGB')
-            text_canvas_rgb.paste(bg_color, (0, 0, canvas_size, canvas_size))
-
-            draw_text_with_outline(
-                text_canvas_rgb,
-                text=object_data.get('text', 'WIGGLE'),
-                position=(canvas_size // 2, canvas_size // 2),
-                font_size=object_data.get('font_size', 50),
-                text_color=object_data.get('text_color', (0, 0, 0)),
-                outline_color=object_data.get('outline_color', (255, 255, 255)),
-                outline_width=3,
-                centered=True
-            )
-
-            # Make transparent
-            text_canvas = text_canvas_rgb.convert('RGBA')
-            data = text_canvas.getdata()
-            new_data = []
-            for item in data:
-                if item[:3] == bg_color:
-                    new_data.append((255, 255, 255, 0))
-                else:
-                    new_data.append(item)
-            text_canvas.putdata(new_data)
+
+            # Text layer is identical every frame - only the transform changes,
+            # so draw it once and reuse it
+            if text_layer is None:
+                from core.typography import draw_text_with_outline
+
+                text_canvas = Image.new('RGB', (canvas_size, canvas_size), bg_color)
+                draw_text_with_outline(
+                    text_canvas,
+                    text=object_data.get('text', 'WIGGLE'),
+                    position=(canvas_size // 2, canvas_size // 2),
+                    font_size=object_data.get('font_size', 50),
+                    text_color=object_data.get('text_color', (0, 0, 0)),
+                    outline_color=object_data.get('outline_color', (255, 255, 255)),
+                    outline_width=3,
+                    centered=True
+                )
+
+                # Make transparent
+                text_layer = apply_color_key(text_canvas, bg_color)
+
+            text_canvas = text_layer
 
             # Apply rotation
             if abs(rotation) > 0.1:
@@ -262,6 +257,8 @@ def create_excited_wiggle(
 
 # Example usage
 if __name__ == '__main__':
+    from core.gif_builder import GIFBuilder
+
     print("Creating wiggle animations...")
 
     builder = GIFBuilder(width=480, height=480, fps=20)
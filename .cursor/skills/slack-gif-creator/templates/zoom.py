@@ -9,12 +9,15 @@ import sys
 from pathlib import Path
 import math
 
-sys.path.append(str(Path(__file__).parent.parent))
+if not __package__:
+    # Run as a script: add the skill directory to the path
+    sys.path.append(str(Path(__file__).parent.parent))
 
 from PIL import Image, ImageFilter
-from core.gif_builder import GIFBuilder
-from core.frame_composer import create_blank_frame, draw_emoji_enhanced
+import numpy as np
+from core.frame_composer import create_blank_frame, draw_emoji_enhanced, apply_color_key
 from core.easing import interpolate
+from core.timeline import Timeline, changed_frames, render_changed_frames
 
 
 def create_zoom_animation(
@@ -49,8 +52,6 @@ def create_zoom_animation(
     Returns:
         List of frames
     """
-    frames = []
-
     # Default object data
     if object_data is None:
         if object_type == 'emoji':
@@ -59,37 +60,36 @@ def create_zoom_animation(
     base_size = object_data.get('size', 100) if object_type == 'emoji' else object_data.get('font_size', 60)
     start_scale, end_scale = scale_range
 
-    for i in range(num_frames):
-        t = i / (num_frames - 1) if num_frames > 1 else 0
-
-        # Calculate scale based on zoom type
-        if zoom_type == 'in':
-            scale = interpolate(start_scale, end_scale, t, easing)
-        elif zoom_type == 'out':
-            scale = interpolate(end_scale, start_scale, t, easing)
-        elif zoom_type == 'in_out':
-            if t < 0.5:
-                scale = interpolate(start_scale, end_scale, t * 2, easing)
-            else:
-                scale = interpolate(end_scale, start_scale, (t - 0.5) * 2, easing)
-        elif zoom_type == 'punch':
-            # Quick zoom in with overshoot then settle
-            if t < 0.3:
-                scale = interpolate(start_scale, end_scale * 1.2, t / 0.3, 'ease_out')
-            else:
-                scale = interpolate(end_scale * 1.2, end_scale, (t - 0.3) / 0.7, 'elastic_out')
-        else:
-            scale = interpolate(start_scale, end_scale, t, easing)
+    # Scale keyframes for the zoom type
+    timeline = Timeline(num_frames)
+    if zoom_type == 'out':
+        timeline.add_track('scale', [(0.0, end_scale), (1.0, start_scale, easing)])
+    elif zoom_type == 'in_out':
+        timeline.add_track('scale', [(0.0, start_scale), (0.5, end_scale, easing), (1.0, start_scale, easing)])
+    elif zoom_type == 'punch':
+        # Quick zoom in with overshoot then settle
+        timeline.add_track('scale', [(0.0, start_scale), (0.3, end_scale * 1.2, 'ease_out'),
+                                     (1.0, end_scale, 'elastic_out')])
+    else:
+        timeline.add_track('scale', [(0.0, start_scale), (1.0, end_scale, easing)])
+    scales = timeline.evaluate()['scale']
+
+    # What each frame draws: clamped size and blur radius (-1 = no blur).
+    # Frames where both match the previous frame are not redrawn.
+    if object_type == 'emoji':
+        sizes = np.clip((base_size * scales).astype(int), 12, frame_width * 2)
+    else:
+        sizes = np.clip((base_size * scales).astype(int), 10, 500)
+    blurs = np.where(add_motion_blur & (np.abs(scales - 1.0) > 0.5),
+                     np.minimum(5, (np.abs(scales - 1.0) * 3).astype(int)), -1)
+
+    def render_frame(i: int) -> Image.Image:
+        current_size, blur_amount = int(sizes[i]), int(blurs[i])
 
         # Create frame
         frame = create_blank_frame(frame_width, frame_height, bg_color)
 
         if object_type == 'emoji':
-            current_size = int(base_size * scale)
-
-            # Clamp size to reasonable bounds
-            current_size = max(12, min(current_size, frame_width * 2))
-
             # Create emoji on transparent background
             canvas_size = max(frame_width, frame_height, current_size) * 2
             emoji_canvas = Image.new('RGBA', (canvas_size, canvas_size), (0, 0, 0, 0))
@@ -103,8 +103,7 @@ def create_zoom_animation(
             )
 
             # Optional motion blur for fast zooms
-            if add_motion_blur and abs(scale - 1.0) > 0.5:
-                blur_amount = min(5, int(abs(scale - 1.0) * 3))
+            if blur_amount >= 0:
                 emoji_canvas = emoji_canvas.filter(ImageFilter.GaussianBlur(blur_amount))
 
             # Crop to frame size centered
@@ -120,17 +119,13 @@ def create_zoom_animation(
         elif object_type == 'text':
             from core.typography import draw_text_with_outline
 
-            current_size = int(base_size * scale)
-            current_size = max(10, min(current_size, 500))
-
-            # Create oversized canvas for large text
-            canvas_size = max(frame_width, frame_height, current_size * 10)
-            text_canvas = Image.new('RGB', (canvas_size, canvas_size), bg_color)
+            # Draw on a frame-sized canvas - anything outside the frame is clipped anyway
+            text_canvas = Image.new('RGB', (frame_width, frame_height), bg_color)
 
             draw_text_with_outline(
                 text_canvas,
                 text=object_data.get('text', 'ZOOM'),
-                position=(canvas_size // 2, canvas_size // 2),
+                position=(frame_width // 2, frame_height // 2),
                 font_size=current_size,
                 text_color=object_data.get('text_color', (0, 0, 0)),
                 outline_color=object_data.get('outline_color', (255, 255, 255)),
@@ -138,14 +133,20 @@ def create_zoom_animation(
                 centered=True
             )
 
-            # Crop to frame
-            left = (canvas_size - frame_width) // 2
-            top = (canvas_size - frame_height) // 2
-            frame = text_canvas.crop((left, top, left + frame_width, top + frame_height))
+            # Make background transparent so the text layer can be blurred and composited
+            text_layer = apply_color_key(text_canvas, bg_color)
 
-        frames.append(frame)
+            # Optional motion blur for fast zooms
+            if blur_amount >= 0:
+                text_layer = text_layer.filter(ImageFilter.GaussianBlur(blur_amount))
 
-    return frames
+            frame_rgba = frame.convert('RGBA')
+            frame = Image.alpha_composite(frame_rgba, text_layer)
+            frame = frame.convert('RGB')
+
+        return frame
+
+    return render_changed_frames(changed_frames(sizes, blurs), render_frame)
 
 
 def create_explosion_zoom(
@@ -281,6 +282,8 @@ def create_mind_blown_zoom(
 
 # Example usage
 if __name__ == '__main__':
+    from core.gif_builder import GIFBuilder
+
     print("Creating zoom animations...")
 
     builder = GIFBuilder(width=480, height=480, fps=20)